@@ -1,14 +1,24 @@
 from flask import Flask, request, jsonify, render_template, Response
-import requests
+import http_client  # keep-alive 커넥션 풀 공용 HTTP 클라이언트
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import os
 from flask_cors import CORS
 import time
-from signaturehelper import Signature  # 추가
-from topic_generator import generate_all_topics  # 글감 생성 모듈 추가
-from draft_writer import generate_full_article, regenerate_article, generate_article_stream  # 전체글 완성 모듈 추가
-from openai import OpenAI  # 롱테일 키워드용 OpenAI 추가
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait, FIRST_COMPLETED
+from naver_searchad import fetch_keyword_list, fetch_main_keyword_data_batch, normalize_keyword  # 검색광고 keywordList 공유 조회
+from result_cache import keyword_cache  # 키워드별 업스트림 결과 캐시
+from rate_limiter import rate_limiter, raise_for_rate_limit, submit_with_priority, BackpressureError, PRIORITY_BULK  # 네이버 API 호출량 제한
+from topic_generator import generate_all_topics, generate_content_plan, content_plan_cache_key  # 글감 생성 모듈 추가
+from prewarm import popularity_tracker, cache_prewarmer, PREWARM_ENABLED  # 인기 키워드 캐시 미리 갱신
+from draft_writer import generate_full_article, regenerate_article, regenerate_sections, generate_article_stream  # 전체글 완성 모듈 추가
+from article_sections import parse_sections, find_sections  # 글 섹션 앵커
+from hedged_llm import hedged_chat_completion, hedged_llm  # 롱테일 키워드용 헤징 OpenAI 호출
+from stream_buffer import article_streams, format_sse_event, parse_last_event_id, accepts_gzip, gzip_stream, StreamExpired, TooManyStreams, HEARTBEAT_EVENT, STREAM_HEARTBEAT_INTERVAL, STREAM_RETRY_AFTER  # 재개 가능한 글 스트림
+from job_queue import article_jobs, QueueFull, JOB_FINISHED_STATES  # 비스트리밍 글 생성 작업 큐
+from llm_cache import llm_cache_key, get_cached_response, store_response, cached_response_expires_at, llm_response_cache  # LLM 응답 캐시
+from resilience import resilience, resilient_call, ProviderUnavailable  # 업스트림 재시도/서킷 브레이커
+from keyword_extractor import keyword_extractor  # 관련 키워드 TF-IDF 색인
 import json
 
 app = Flask(__name__, static_folder='static')
@@ -23,6 +33,27 @@ load_dotenv()
 NAVER_CLIENT_ID = os.getenv('NAVER_CLIENT_ID')
 NAVER_CLIENT_SECRET = os.getenv('NAVER_CLIENT_SECRET')
 
+# 키워드 분석용 업스트림 병렬 호출 설정 (요청 간 공유되는 제한된 스레드 풀)
+SEARCH_MAX_WORKERS = int(os.getenv('SEARCH_MAX_WORKERS', 12))
+search_executor = ThreadPoolExecutor(max_workers=SEARCH_MAX_WORKERS, thread_name_prefix='search')
+
+# 소스별 응답 마감 시간 (요청 시작 시점 기준, 초)
+SOURCE_DEADLINES = {
+    'searchVolume': float(os.getenv('DEADLINE_SEARCH_VOLUME', 8)),
+    'searchTrend': float(os.getenv('DEADLINE_SEARCH_TREND', 8)),
+    'blog': float(os.getenv('DEADLINE_BLOG', 6)),
+    'cafe': float(os.getenv('DEADLINE_CAFE', 6)),
+    'relatedKeywords': float(os.getenv('DEADLINE_RELATED_KEYWORDS', 8)),
+    'longtailKeywords': float(os.getenv('DEADLINE_LONGTAIL_KEYWORDS', 20))
+}
+
+# 일괄 키워드 분석 설정 (대화형 요청과 풀을 나눠서 서로 밀리지 않도록 함)
+BATCH_MAX_KEYWORDS = int(os.getenv('BATCH_MAX_KEYWORDS', 1000))
+BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', 4))
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix='batch')
+
+DATALAB_MAX_GROUPS = 5  # 데이터랩 API 한 번에 보낼 수 있는 keywordGroups 수
+
 @app.route('/')
 def index():
     return "<h1>Flask App is Working!</h1><p>This is the real Flask application</p>"
@@ -45,13 +76,16 @@ def generate_topics():
         data = request.json
         keyword = data.get('keyword')
         tone = data.get('tone', 'informative')  # 기본값은 정보형
-        print(f"[글감 생성] 키워드: '{keyword}', 톤: '{tone}'")
+        fresh = bool(data.get('fresh', False))  # True면 캐시 대신 새 결과(변형) 생성
+        print(f"[글감 생성] 키워드: '{keyword}', 톤: '{tone}', 새로 생성: {fresh}")
         
         if not keyword:
             return jsonify({'error': '키워드가 필요합니다'}), 400
 
+        popularity_tracker.record('topics', keyword)
+
         # topic_generator 모듈 사용 (톤 포함)
-        result = generate_all_topics(keyword, tone)
+        result = generate_all_topics(keyword, tone, refresh=fresh)
         
         return jsonify(result)
     
@@ -59,25 +93,68 @@ def generate_topics():
         print(f"글감 생성 중 오류: {str(e)}")
         return jsonify({'error': f'서버 오류: {str(e)}'}), 500
 
+# 작업 상태 조회 시 끝날 때까지 기다릴 수 있는 최대 시간 (초)
+JOB_POLL_MAX_WAIT = float(os.getenv('JOB_POLL_MAX_WAIT', 30))
+JOB_RETRY_AFTER = 30  # 작업 큐가 가득 찼을 때 재시도 권장 시간 (초)
+
+def job_to_json(job):
+    """작업 정보 응답 (요청 파라미터는 제외)"""
+    body = {
+        'jobId': job['id'],
+        'kind': job['kind'],
+        'status': job['status'],
+        'createdAt': job['createdAt'],
+        'updatedAt': job['updatedAt'],
+        'statusUrl': f"/api/jobs/{job['id']}"
+    }
+    if job['result'] is not None:
+        body['result'] = job['result']
+    if job['error']:
+        body['error'] = job['error']
+    return body
+
+def submit_article_job(kind, log_prefix, **options):
+    """글 생성 요청을 작업 큐에 등록하고 202 응답 반환 (options는 작업 함수에 그대로 전달)"""
+    data = request.json or {}
+    keyword = data.get('keyword')
+    title = data.get('title')
+    content_plan = data.get('contentPlan')  # outline 대신 contentPlan 사용
+    tone = data.get('tone', 'informative')
+    thumbnails = data.get('thumbnails', [])
+    
+    print(f"[{log_prefix}] 키워드: '{keyword}', 제목: '{title}', 톤: '{tone}'")
+    
+    if not all([keyword, title, content_plan]):
+        return jsonify({'error': '키워드, 제목, 콘텐츠 기획이 필요합니다'}), 400
+
+    return enqueue_job(kind, {
+        'keyword': keyword,
+        'title': title,
+        'content_plan': content_plan,
+        'tone': tone,
+        'thumbnails': thumbnails,
+        **options
+    })
+
+def enqueue_job(kind, params):
+    """작업 큐에 등록하고 202 응답 반환 (큐가 가득 차면 503)"""
+    try:
+        job = article_jobs.submit(kind, params)
+    except QueueFull as e:
+        response = jsonify({'error': str(e), 'retryAfter': JOB_RETRY_AFTER})
+        response.headers['Retry-After'] = str(JOB_RETRY_AFTER)
+        return response, 503
+
+    response = jsonify(job_to_json(job))
+    response.headers['Location'] = f"/api/jobs/{job['id']}"
+    return response, 202
+
 @app.route('/api/generate-article', methods=['POST'])
 def generate_article():
+    """전체글 생성 작업 등록 (결과는 /api/jobs/<jobId>에서 조회)"""
     try:
-        data = request.json
-        keyword = data.get('keyword')
-        title = data.get('title')
-        content_plan = data.get('contentPlan')  # outline 대신 contentPlan 사용
-        tone = data.get('tone', 'informative')
-        thumbnails = data.get('thumbnails', [])
-        
-        print(f"[전체글 API] 키워드: '{keyword}', 제목: '{title}', 톤: '{tone}'")
-        
-        if not all([keyword, title, content_plan]):
-            return jsonify({'error': '키워드, 제목, 콘텐츠 기획이 필요합니다'}), 400
-
-        # draft_writer 모듈 사용 (Claude API)
-        result = generate_full_article(keyword, title, content_plan, tone, thumbnails)
-        
-        return jsonify(result)
+        # parallel: 섹션별 동시 생성 여부 (없으면 서버 기본 설정)
+        return submit_article_job('generateArticle', '전체글 API', parallel=(request.json or {}).get('parallel'))
     
     except Exception as e:
         print(f"전체글 생성 중 오류: {str(e)}")
@@ -85,28 +162,157 @@ def generate_article():
 
 @app.route('/api/regenerate-article', methods=['POST'])
 def regenerate_article_api():
+    """글 재생성 작업 등록 (결과는 /api/jobs/<jobId>에서 조회)"""
     try:
-        data = request.json
+        return submit_article_job('regenerateArticle', '글 재생성 API')
+    
+    except Exception as e:
+        print(f"글 재생성 중 오류: {str(e)}")
+        return jsonify({'error': f'서버 오류: {str(e)}'}), 500
+
+@app.route('/api/regenerate-sections', methods=['POST'])
+def regenerate_sections_api():
+    """기존 글의 일부 H2/H3 섹션만 재생성하는 작업 등록 (결과는 /api/jobs/<jobId>에서 조회)
+
+    본문: article(마크다운), sections(앵커 목록), keyword, title, tone, instructions(선택)
+    """
+    try:
+        data = request.json or {}
+        article = data.get('article')
+        anchors = data.get('sections')
         keyword = data.get('keyword')
         title = data.get('title')
-        content_plan = data.get('contentPlan')  # outline 대신 contentPlan 사용
-        tone = data.get('tone', 'informative')
-        thumbnails = data.get('thumbnails', [])
         
-        print(f"[글 재생성 API] 키워드: '{keyword}', 제목: '{title}'")
+        print(f"[섹션 재생성 API] 키워드: '{keyword}', 섹션: {anchors}")
         
-        if not all([keyword, title, content_plan]):
-            return jsonify({'error': '키워드, 제목, 콘텐츠 기획이 필요합니다'}), 400
-
-        # draft_writer 모듈 사용 (재생성)
-        result = regenerate_article(keyword, title, content_plan, tone, thumbnails)
+        if not all([article, keyword, title]) or not isinstance(anchors, list) or not anchors:
+            return jsonify({'error': '글, 키워드, 제목, 재생성할 섹션 목록이 필요합니다'}), 400
         
-        return jsonify(result)
+        available = parse_sections(article)
+        _, missing = find_sections(available, anchors)
+        if missing:
+            return jsonify({
+                'error': f"글에 없는 섹션: {', '.join(map(str, missing))}",
+                'sections': [{'anchor': s['anchor'], 'level': s['level'], 'heading': s['heading']} for s in available]
+            }), 400
+        
+        return enqueue_job('regenerateSections', {
+            'keyword': keyword,
+            'title': title,
+            'article': article,
+            'sections': anchors,
+            'tone': data.get('tone', 'informative'),
+            'instructions': data.get('instructions')
+        })
     
     except Exception as e:
-        print(f"글 재생성 중 오류: {str(e)}")
+        print(f"섹션 재생성 중 오류: {str(e)}")
         return jsonify({'error': f'서버 오류: {str(e)}'}), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """작업 상태/결과 조회 (?wait=초 를 주면 작업이 끝날 때까지 최대 그만큼 대기)"""
+    try:
+        wait = min(max(float(request.args.get('wait', 0)), 0), JOB_POLL_MAX_WAIT)
+    except ValueError:
+        wait = 0
+
+    job = article_jobs.get(job_id, wait=wait)
+    if job is None:
+        return jsonify({'error': '작업이 없거나 만료되었습니다'}), 404
+    return jsonify(job_to_json(job))
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """작업 상태 변화를 SSE로 구독 (작업이 끝나면 결과와 함께 종료)"""
+    job = article_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업이 없거나 만료되었습니다'}), 404
+
+    def generate(job):
+        yield format_sse_event(job_to_json(job))
+        while job['status'] not in JOB_FINISHED_STATES:
+            changed = article_jobs.wait_for_change(job_id, job['status'], STREAM_HEARTBEAT_INTERVAL)
+            if changed is None:
+                return
+            if changed['status'] == job['status']:
+                yield HEARTBEAT_EVENT
+                continue
+            job = changed
+            yield format_sse_event(job_to_json(job))
+
+    return Response(generate(job), content_type='text/event-stream', headers=ARTICLE_STREAM_HEADERS)
+
+# 글 스트리밍 응답 공통 헤더/시작 이벤트 (Flask 라우트와 ASGI 라우트 공용)
+ARTICLE_STREAM_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'Connection': 'keep-alive',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type, Last-Event-ID'
+}
+ARTICLE_STREAM_GZIP_HEADERS = {
+    'Content-Encoding': 'gzip',
+    'Vary': 'Accept-Encoding'
+}
+
+def stream_status_event(stream, status):
+    """구독 시작 시 보내는 상태 이벤트 (순번 없음 - 재개 지점에 영향 없음)"""
+    return format_sse_event({'content': '', 'status': status, 'streamId': stream.id})
+
+def article_stream_events(stream, last_seq, status):
+    """글 스트림 버퍼를 last_seq 이후부터 SSE로 전달"""
+    yield stream_status_event(stream, status)
+    try:
+        for chunk in stream.subscribe(last_seq):
+            yield chunk
+    except StreamExpired as e:
+        print(f"[스트리밍 API] 재개 불가: {e}")
+        yield format_sse_event({'content': '', 'error': str(e), 'expired': True, 'done': True})
+
+def article_stream_response(stream, last_seq, status):
+    """글 스트림 SSE 응답 (클라이언트가 지원하면 gzip 압축)"""
+    chunks = article_stream_events(stream, last_seq, status)
+    headers = dict(ARTICLE_STREAM_HEADERS)
+    if accepts_gzip(request.headers.get('Accept-Encoding')):
+        chunks = gzip_stream(chunks)
+        headers.update(ARTICLE_STREAM_GZIP_HEADERS)
+    return Response(chunks, content_type='text/event-stream', headers=headers)
+
+def parse_article_stream_request(data):
+    """글 스트리밍 요청 본문 검증. ((keyword, title, content_plan, tone, thumbnails, parallel), 오류 메시지) 반환"""
+    data = data or {}
+    keyword = data.get('keyword')
+    title = data.get('title')
+    content_plan = data.get('contentPlan')  # outline 대신 contentPlan 사용
+    tone = data.get('tone', 'informative')
+    thumbnails = data.get('thumbnails', [])
+    parallel = data.get('parallel')  # 섹션별 동시 생성 여부 (없으면 서버 기본 설정)
+    
+    print(f"[스트리밍 API] 키워드: '{keyword}', 제목: '{title}', 톤: '{tone}'")
+    print(f"[스트리밍 API] content_plan 타입: {type(content_plan)}")
+    print(f"[스트리밍 API] content_plan 존재: {content_plan is not None}")
+    
+    # outline 키로도 확인해보기
+    outline = data.get('outline')
+    print(f"[스트리밍 API] outline 키 존재: {outline is not None}")
+    print(f"[스트리밍 API] outline 타입: {type(outline)}")
+    
+    # 실제로 outline으로 데이터가 온다면 contentPlan으로 설정
+    if content_plan is None and outline is not None:
+        content_plan = outline
+        print("[스트리밍 API] outline을 contentPlan으로 변환함")
+    
+    if not all([keyword, title, content_plan]):
+        missing = []
+        if not keyword: missing.append('keyword')
+        if not title: missing.append('title') 
+        if not content_plan: missing.append('contentPlan')
+        error_msg = f'누락된 데이터: {", ".join(missing)}'
+        print(f"[스트리밍 API] 오류: {error_msg}")
+        return None, error_msg
+
+    return (keyword, title, content_plan, tone, thumbnails, parallel), None
+
 @app.route('/api/generate-article-stream', methods=['POST'])
 def generate_article_stream_api():
     try:
@@ -115,66 +321,88 @@ def generate_article_stream_api():
         print(f"[스트리밍 API] 받은 데이터: {data}")
         print(f"[스트리밍 API] 받은 데이터 키들: {list(data.keys()) if data else 'None'}")
         
-        keyword = data.get('keyword')
-        title = data.get('title')
-        content_plan = data.get('contentPlan')  # outline 대신 contentPlan 사용
-        tone = data.get('tone', 'informative')
-        thumbnails = data.get('thumbnails', [])
-        
-        print(f"[스트리밍 API] 키워드: '{keyword}', 제목: '{title}', 톤: '{tone}'")
-        print(f"[스트리밍 API] content_plan 타입: {type(content_plan)}")
-        print(f"[스트리밍 API] content_plan 존재: {content_plan is not None}")
-        
-        # outline 키로도 확인해보기
-        outline = data.get('outline')
-        print(f"[스트리밍 API] outline 키 존재: {outline is not None}")
-        print(f"[스트리밍 API] outline 타입: {type(outline)}")
-        
-        # 실제로 outline으로 데이터가 온다면 contentPlan으로 설정
-        if content_plan is None and outline is not None:
-            content_plan = outline
-            print("[스트리밍 API] outline을 contentPlan으로 변환함")
-        
-        if not all([keyword, title, content_plan]):
-            missing = []
-            if not keyword: missing.append('keyword')
-            if not title: missing.append('title') 
-            if not content_plan: missing.append('contentPlan')
-            error_msg = f'누락된 데이터: {", ".join(missing)}'
-            print(f"[스트리밍 API] 오류: {error_msg}")
+        article, error_msg = parse_article_stream_request(data)
+        if error_msg:
             return jsonify({'error': error_msg}), 400
+        keyword, title, content_plan, tone, thumbnails, parallel = article
 
         print("[스트리밍 API] 데이터 검증 완료, draft_writer 호출 시작")
         
-        # 스트리밍 응답 반환
-        def generate():
-            try:
-                print("[스트리밍 API] 제너레이터 시작")
-                yield "data: " + json.dumps({'content': '', 'status': 'starting'}) + "\n\n"
-                for chunk in generate_article_stream(keyword, title, content_plan, tone, thumbnails):
-                    yield chunk
-                print("[스트리밍 API] 제너레이터 완료")
-            except Exception as gen_error:
-                print(f"[스트리밍 API] 제너레이터 오류: {gen_error}")
-                yield "data: " + json.dumps({'content': f'오류: {str(gen_error)}', 'error': True}) + "\n\n"
+        # 생성은 백그라운드에서 끝까지 진행하고, 응답은 버퍼를 구독 (연결이 끊겨도 재개 가능)
+        stream = article_streams.start(generate_article_stream(keyword, title, content_plan, tone, thumbnails, parallel))
+        print(f"[스트리밍 API] 스트림 {stream.id} 시작")
         
-        return Response(
-            generate(),
-            content_type='text/event-stream',
-            headers={
-                'Cache-Control': 'no-cache',
-                'Connection': 'keep-alive',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type'
-            }
-        )
+        return article_stream_response(stream, 0, 'starting')
     
+    except TooManyStreams as e:
+        print(f"[스트리밍 API] 스트림 시작 거절: {e}")
+        response = jsonify({'error': str(e), 'retryAfter': STREAM_RETRY_AFTER})
+        response.headers['Retry-After'] = str(STREAM_RETRY_AFTER)
+        return response, 503
     except Exception as e:
         print(f"[스트리밍 API] 메인 오류: {str(e)}")
         import traceback
         print(f"[스트리밍 API] 트레이스백: {traceback.format_exc()}")
         return jsonify({'error': f'서버 오류: {str(e)}'}), 500
 
+@app.route('/api/generate-article-stream/<stream_id>', methods=['GET'])
+def resume_article_stream_api(stream_id):
+    """끊긴 글 스트림 이어받기 (Last-Event-ID 헤더 또는 lastEventId 쿼리 이후부터)"""
+    stream = article_streams.get(stream_id)
+    if stream is None:
+        return jsonify({'error': '스트림이 없거나 만료되었습니다'}), 404
+
+    last_seq = parse_last_event_id(request.headers.get('Last-Event-ID', request.args.get('lastEventId')))
+    print(f"[스트리밍 API] 스트림 {stream_id} {last_seq}번 이후부터 재개")
+    return article_stream_response(stream, last_seq, 'resuming')
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """키워드 결과 캐시와 LLM 응답 캐시의 적중/실패 횟수와 사용량, 관련 키워드 색인 크기 조회"""
+    return jsonify({**keyword_cache.stats(), 'llm': llm_response_cache.stats(), 'keywordIndex': keyword_extractor.index.stats()})
+
+@app.route('/api/rate-limit/stats', methods=['GET'])
+def rate_limit_stats():
+    """네이버 API 계열별 호출 한도와 오늘 쿼터 사용량 조회"""
+    return jsonify(rate_limiter.stats())
+
+@app.route('/api/resilience/stats', methods=['GET'])
+def resilience_stats():
+    """업스트림 공급자별 서킷 상태, 재시도 횟수, 남은 재시도 예산과 짧은 LLM 호출 헤징 현황 조회"""
+    return jsonify({**resilience.stats(), 'hedging': hedged_llm.stats()})
+
+@app.route('/api/prewarm/stats', methods=['GET'])
+def prewarm_stats():
+    """인기 키워드 순위와 캐시 미리 갱신 실행 현황 조회"""
+    return jsonify(cache_prewarmer.stats())
+
+def backpressure_response(error):
+    """호출량 제한 오류를 429 응답으로 변환 (가짜 0건 결과 대신)"""
+    response = jsonify({
+        'error': f'요청이 많아 잠시 후 다시 시도해주세요 ({error})',
+        'source': error.family,
+        'retryAfter': error.retry_after
+    })
+    response.status_code = 429
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def unavailable_response(error):
+    """서킷이 열린 업스트림 오류를 503 응답으로 변환 (가짜 0건 결과 대신)"""
+    response = jsonify({
+        'error': f'외부 서비스 장애로 잠시 후 다시 시도해주세요 ({error})',
+        'source': error.provider,
+        'retryAfter': error.retry_after
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def upstream_error_event(error):
+    """호출량 제한/업스트림 장애 오류의 스트리밍 이벤트 필드"""
+    source = error.family if isinstance(error, BackpressureError) else error.provider
+    return {'error': str(error), 'source': source, 'retryAfter': error.retry_after}
+
 @app.route('/api/search', methods=['POST'])
 def search_keyword():
     print(f"[API 요청] 받음!")
@@ -186,72 +414,359 @@ def search_keyword():
         if not keyword:
             return jsonify({'error': '키워드가 필요합니다'}), 400
 
-        # 1. 실제 검색량 데이터 시도 (네이버 검색광고 API)
-        search_volume_data = get_keyword_search_volume(keyword)
-        
-        # 2. 검색 트렌드 데이터 가져오기 (3개월)
-        today = datetime.now()
-        start_date = (today - timedelta(days=90)).strftime('%Y-%m-%d')
-        end_date = today.strftime('%Y-%m-%d')
-        search_trend = get_search_trend_data(keyword, start_date, end_date)
-
-        # 3. 블로그 데이터 가져오기
-        blog_total, blog_items = get_blog_data(keyword)
-        
-        # 4. 카페 데이터 가져오기
-        cafe_total, cafe_items = get_cafe_data(keyword)
-
-        # 전체 콘텐츠 수
-        total_content_count = blog_total + cafe_total
+        popularity_tracker.record('search', keyword)
 
-        # 5. 연관 키워드 데이터 가져오기
-        related_keywords_data = get_related_keywords_with_volume(keyword)
+        # 1~6. 서로 독립적인 업스트림 호출을 동시에 시작
+        started_at = time.monotonic()
+        futures = submit_keyword_sources(keyword)
 
-        # 6. 롱테일 키워드 생성 (초보자용)
-        longtail_keywords = generate_longtail_keywords(keyword)
+        # 추정/분석에 필요한 데이터부터 기다림
+        search_volume_data = wait_for_source(futures, 'searchVolume', started_at, None)
+        search_trend = wait_for_source(futures, 'searchTrend', started_at, get_empty_trend_data())
+        blog_result = wait_for_source(futures, 'blog', started_at, (0, []))
+        cafe_result = wait_for_source(futures, 'cafe', started_at, (0, []))
 
-        # 7. 월간 발행량 추정 (새로 추가)
-        monthly_estimates = calculate_all_estimations(search_volume_data, total_content_count, search_trend)
-        final_monthly_estimate = get_final_monthly_estimate(search_volume_data, total_content_count, search_trend)
-
-        # 분석 결과 계산 (실제 검색량 우선, 없으면 트렌드 기반)
-        if search_volume_data:
-            analysis = calculate_real_search_analysis(search_volume_data, total_content_count, search_trend, final_monthly_estimate)
-            search_volume_info = search_volume_data
-        else:
-            analysis = calculate_trend_analysis(search_trend, total_content_count, final_monthly_estimate)
-            search_volume_info = None
+        related_keywords_data = wait_for_source(futures, 'relatedKeywords', started_at, None)
+        longtail_keywords = wait_for_source(futures, 'longtailKeywords', started_at, get_fallback_longtail_keywords(keyword))
 
-        # 응답 데이터 구성
-        response_data = {
-            'keyword': keyword,
-            'searchTrend': search_trend,
-            'searchVolume': search_volume_info,  # 실제 검색량 (있는 경우)
-            'blog': {
-                'total': blog_total,
-                'recentPosts': blog_items,
-                'monthlyEstimate': final_monthly_estimate * 0.6 if final_monthly_estimate else 0  # 블로그 비중 60%
-            },
-            'cafe': {
-                'total': cafe_total,
-                'recentPosts': cafe_items,
-                'monthlyEstimate': final_monthly_estimate * 0.4 if final_monthly_estimate else 0  # 카페 비중 40%
-            },
-            'totalContentCount': total_content_count,
-            'monthlyEstimates': monthly_estimates,  # 각 추정 방식별 결과
-            'finalMonthlyEstimate': final_monthly_estimate,  # 최종 월간 추정치
-            'analysis': analysis,
-            'relatedKeywords': related_keywords_data['related_keywords'] if related_keywords_data else [],
-            'longtailKeywords': longtail_keywords,  # 롱테일 키워드 추가
-            'dataType': 'realSearch' if search_volume_data else 'trendOnly'  # 데이터 타입 표시
-        }
+        # 7. 월간 발행량 추정 및 분석 후 응답 데이터 구성
+        response_data = build_keyword_analysis(
+            keyword, search_volume_data, search_trend, blog_result, cafe_result,
+            related_keywords_data['related_keywords'] if related_keywords_data else [],
+            longtail_keywords
+        )
 
         return jsonify(response_data)
     
+    except BackpressureError as e:
+        print(f"[API 요청] 호출량 제한: {e}")
+        return backpressure_response(e)
+    except ProviderUnavailable as e:
+        print(f"[API 요청] 업스트림 장애: {e}")
+        return unavailable_response(e)
     except Exception as e:
         print(f"API 처리 중 오류: {str(e)}")
         return jsonify({'error': f'서버 오류: {str(e)}'}), 500
 
+@app.route('/api/search-stream', methods=['POST'])
+def search_keyword_stream():
+    """키워드 분석을 섹션별로 준비되는 즉시 SSE로 전송 (/api/search의 스트리밍 버전)"""
+    try:
+        data = request.json or {}
+        keyword = data.get('keyword')
+        print(f"[스트리밍 분석 API] 키워드: '{keyword}'")
+
+        if not keyword:
+            return jsonify({'error': '키워드가 필요합니다'}), 400
+
+        popularity_tracker.record('search', keyword)
+
+        def generate():
+            yield "data: " + json.dumps({'section': 'start', 'keyword': keyword, 'done': False}) + "\n\n"
+            for event in iter_keyword_sections(keyword):
+                yield "data: " + json.dumps({**event, 'done': False}) + "\n\n"
+            yield "data: " + json.dumps({'section': 'end', 'done': True}) + "\n\n"
+            print(f"[스트리밍 분석 API] '{keyword}' 완료")
+
+        return Response(
+            generate(),
+            content_type='text/event-stream',
+            headers=ARTICLE_STREAM_HEADERS
+        )
+
+    except Exception as e:
+        print(f"[스트리밍 분석 API] 오류: {str(e)}")
+        return jsonify({'error': f'서버 오류: {str(e)}'}), 500
+
+def iter_keyword_sections(keyword):
+    """소스별 결과가 도착하는 순서대로 섹션 이벤트를 yield하고, 필요한 데이터가 모이면 추정/분석 이벤트를 yield"""
+    started_at = time.monotonic()
+    futures = submit_keyword_sources(keyword)
+    names = {future: name for name, future in futures.items()}
+    fallbacks = {
+        'searchVolume': None,
+        'searchTrend': get_empty_trend_data(),
+        'blog': (0, []),
+        'cafe': (0, []),
+        'relatedKeywords': None,
+        'longtailKeywords': get_fallback_longtail_keywords(keyword)
+    }
+    analysis_sources = ('searchVolume', 'searchTrend', 'blog', 'cafe')  # 추정/분석에 필요한 소스
+    results = {}
+    errors = {}
+    analysis_sent = False
+
+    not_done = set(futures.values())
+    try:
+        while not_done:
+            # 남은 소스 중 가장 빠른 마감 시간까지만 대기
+            elapsed = time.monotonic() - started_at
+            timeout = max(min(SOURCE_DEADLINES[names[f]] for f in not_done) - elapsed, 0)
+            done, not_done = wait(not_done, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            elapsed = time.monotonic() - started_at
+            expired = {f for f in not_done if SOURCE_DEADLINES[names[f]] <= elapsed}
+            not_done -= expired
+
+            for future in done | expired:
+                name = names[future]
+                try:
+                    # 마감 시간이 지난 소스는 wait_for_source가 기본값을 돌려줌
+                    value = wait_for_source(futures, name, started_at, fallbacks[name])
+                except (BackpressureError, ProviderUnavailable) as e:
+                    errors[name] = e
+                    yield {'section': name, **upstream_error_event(e)}
+                    continue
+
+                results[name] = value
+                if name in ('blog', 'cafe'):
+                    payload = {'total': value[0], 'recentPosts': value[1]}
+                elif name == 'relatedKeywords':
+                    payload = value['related_keywords'] if value else []
+                else:
+                    payload = value
+                yield {'section': name, 'data': payload}
+
+            if not analysis_sent and all(name in results or name in errors for name in analysis_sources):
+                analysis_sent = True
+                limited = [name for name in analysis_sources if name in errors]
+                if limited:
+                    # 일부 소스가 호출량 제한/장애에 걸리면 0건 기준의 잘못된 분석 대신 오류를 알림
+                    yield {'section': 'analysis', **upstream_error_event(errors[limited[0]])}
+                    continue
+
+                total_content_count = results['blog'][0] + results['cafe'][0]
+                monthly_estimates, final_monthly_estimate, analysis = analyze_keyword_data(
+                    results['searchVolume'], results['searchTrend'], total_content_count
+                )
+                yield {'section': 'monthlyEstimates', 'data': {
+                    'monthlyEstimates': monthly_estimates,
+                    'finalMonthlyEstimate': final_monthly_estimate,
+                    'blogMonthlyEstimate': final_monthly_estimate * 0.6 if final_monthly_estimate else 0,  # 블로그 비중 60%
+                    'cafeMonthlyEstimate': final_monthly_estimate * 0.4 if final_monthly_estimate else 0,  # 카페 비중 40%
+                    'totalContentCount': total_content_count
+                }}
+                yield {'section': 'analysis', 'data': {
+                    'analysis': analysis,
+                    'dataType': 'realSearch' if results['searchVolume'] else 'trendOnly'
+                }}
+    finally:
+        # 클라이언트 연결이 끊긴 경우 아직 시작하지 않은 호출은 취소
+        for future in not_done:
+            future.cancel()
+
+@app.route('/api/search/batch', methods=['POST'])
+def search_keyword_batch():
+    """여러 키워드를 한 번에 분석하고, 끝나는 순서대로 키워드별 결과를 스트리밍"""
+    try:
+        data = request.json or {}
+        keywords = data.get('keywords')
+        include_related = bool(data.get('includeRelated', False))
+        include_longtail = bool(data.get('includeLongtail', False))  # LLM 호출은 요청한 경우에만
+
+        if not isinstance(keywords, list):
+            return jsonify({'error': '키워드 목록(keywords)이 필요합니다'}), 400
+
+        # 빈 값과 중복 제거 (입력 순서 유지)
+        keywords = list(dict.fromkeys(str(k).strip() for k in keywords if k and str(k).strip()))
+        if not keywords:
+            return jsonify({'error': '키워드 목록(keywords)이 필요합니다'}), 400
+        if len(keywords) > BATCH_MAX_KEYWORDS:
+            return jsonify({'error': f'키워드는 최대 {BATCH_MAX_KEYWORDS}개까지 분석할 수 있습니다'}), 400
+
+        print(f"[일괄 분석 API] 키워드 {len(keywords)}개, 연관키워드: {include_related}, 롱테일: {include_longtail}")
+
+        def generate():
+            count = 0
+            for result in run_keyword_batch(keywords, include_related, include_longtail):
+                count += 1
+                yield "data: " + json.dumps({'result': result, 'done': False}) + "\n\n"
+            yield "data: " + json.dumps({'count': count, 'done': True}) + "\n\n"
+            print(f"[일괄 분석 API] 완료 - {count}개")
+
+        return Response(
+            generate(),
+            content_type='text/event-stream',
+            headers=ARTICLE_STREAM_HEADERS
+        )
+
+    except Exception as e:
+        print(f"[일괄 분석 API] 오류: {str(e)}")
+        return jsonify({'error': f'서버 오류: {str(e)}'}), 500
+
+def run_keyword_batch(keywords, include_related=False, include_longtail=False):
+    """키워드 목록을 묶음 호출로 분석하고, 모든 소스가 모인 키워드부터 분석 결과를 yield"""
+    start_date, end_date = get_trend_period()
+    futures = {}  # Future -> (소스 이름, 해당 키워드 목록)
+    pending = {keyword: set() for keyword in keywords}
+    sources = {keyword: {} for keyword in keywords}
+    errors = {}  # 호출량 제한/업스트림 장애에 걸린 키워드 → BackpressureError 또는 ProviderUnavailable
+
+    def register(future, name, chunk):
+        futures[future] = (name, chunk)
+        for keyword in chunk:
+            pending[keyword].add(future)
+
+    # 앞쪽 키워드부터 결과가 나오도록 5개 묶음 단위로 모든 소스를 제출
+    for i in range(0, len(keywords), DATALAB_MAX_GROUPS):
+        chunk = keywords[i:i + DATALAB_MAX_GROUPS]
+        register(submit_with_priority(batch_executor, PRIORITY_BULK, get_search_trend_data_batch, chunk, start_date, end_date), 'searchTrend', chunk)
+        register(submit_with_priority(batch_executor, PRIORITY_BULK, fetch_main_keyword_data_batch, chunk), 'searchVolume', chunk)
+        for keyword in chunk:
+            register(submit_with_priority(batch_executor, PRIORITY_BULK, get_blog_data, keyword), 'blog', [keyword])
+            register(submit_with_priority(batch_executor, PRIORITY_BULK, get_cafe_data, keyword), 'cafe', [keyword])
+            if include_related:
+                register(submit_with_priority(batch_executor, PRIORITY_BULK, get_related_keywords_with_volume, keyword), 'relatedKeywords', [keyword])
+            if include_longtail:
+                register(submit_with_priority(batch_executor, PRIORITY_BULK, generate_longtail_keywords, keyword), 'longtailKeywords', [keyword])
+
+    not_done = set(futures)
+    try:
+        while not_done:
+            done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, chunk = futures[future]
+                error = None
+                try:
+                    value = future.result()
+                except BackpressureError as e:
+                    print(f"[일괄 분석] {name} 호출량 제한: {e}")
+                    value, error = None, e
+                except ProviderUnavailable as e:
+                    print(f"[일괄 분석] {name} 업스트림 장애: {e}")
+                    value, error = None, e
+                except Exception as e:
+                    print(f"[일괄 분석] {name} 조회 오류: {e}")
+                    value = None
+
+                for keyword in chunk:
+                    sources[keyword][name] = extract_batch_source(name, value, keyword)
+                    if error is not None:
+                        errors.setdefault(keyword, error)
+                    pending[keyword].discard(future)
+                    if not pending[keyword]:
+                        collected = sources.pop(keyword)
+                        if keyword in errors:
+                            # 0건 결과 대신 호출량 제한/장애 사실과 재시도 시점을 알림
+                            yield {'keyword': keyword, **upstream_error_event(errors.pop(keyword))}
+                            continue
+                        yield build_keyword_analysis(
+                            keyword,
+                            collected['searchVolume'],
+                            collected['searchTrend'],
+                            collected['blog'],
+                            collected['cafe'],
+                            collected.get('relatedKeywords', []),
+                            collected.get('longtailKeywords', [])
+                        )
+    finally:
+        # 클라이언트 연결이 끊긴 경우 아직 시작하지 않은 호출은 취소
+        for future in not_done:
+            future.cancel()
+
+def extract_batch_source(name, value, keyword):
+    """일괄 조회 결과에서 해당 키워드의 소스 데이터 추출 (실패 시 기본값)"""
+    api_keyword = keyword.replace(' ', '').strip()
+    if name == 'searchTrend':
+        return (value or {}).get(api_keyword) or get_empty_trend_data()
+    if name == 'searchVolume':
+        item = (value or {}).get(api_keyword)
+        return parse_search_volume(item) if item else None
+    if name in ('blog', 'cafe'):
+        return value or (0, [])
+    if name == 'relatedKeywords':
+        return value['related_keywords'] if value else []
+    return value or []
+
+def analyze_keyword_data(search_volume_data, search_trend, total_content_count):
+    """월간 발행량 추정과 기회 분석 (실제 검색량 우선, 없으면 트렌드 기반)"""
+    monthly_estimates = calculate_all_estimations(search_volume_data, total_content_count, search_trend)
+    final_monthly_estimate = get_final_monthly_estimate(search_volume_data, total_content_count, search_trend)
+
+    if search_volume_data:
+        analysis = calculate_real_search_analysis(search_volume_data, total_content_count, search_trend, final_monthly_estimate)
+    else:
+        analysis = calculate_trend_analysis(search_trend, total_content_count, final_monthly_estimate)
+
+    return monthly_estimates, final_monthly_estimate, analysis
+
+def build_keyword_analysis(keyword, search_volume_data, search_trend, blog_result, cafe_result, related_keywords, longtail_keywords):
+    """수집한 소스 데이터로 키워드 분석 응답 데이터 구성"""
+    blog_total, blog_items = blog_result
+    cafe_total, cafe_items = cafe_result
+
+    # 전체 콘텐츠 수
+    total_content_count = blog_total + cafe_total
+
+    monthly_estimates, final_monthly_estimate, analysis = analyze_keyword_data(search_volume_data, search_trend, total_content_count)
+
+    return {
+        'keyword': keyword,
+        'searchTrend': search_trend,
+        'searchVolume': search_volume_data or None,  # 실제 검색량 (있는 경우)
+        'blog': {
+            'total': blog_total,
+            'recentPosts': blog_items,
+            'monthlyEstimate': final_monthly_estimate * 0.6 if final_monthly_estimate else 0  # 블로그 비중 60%
+        },
+        'cafe': {
+            'total': cafe_total,
+            'recentPosts': cafe_items,
+            'monthlyEstimate': final_monthly_estimate * 0.4 if final_monthly_estimate else 0  # 카페 비중 40%
+        },
+        'totalContentCount': total_content_count,
+        'monthlyEstimates': monthly_estimates,  # 각 추정 방식별 결과
+        'finalMonthlyEstimate': final_monthly_estimate,  # 최종 월간 추정치
+        'analysis': analysis,
+        'relatedKeywords': related_keywords,
+        'longtailKeywords': longtail_keywords,  # 롱테일 키워드
+        'dataType': 'realSearch' if search_volume_data else 'trendOnly'  # 데이터 타입 표시
+    }
+
+def get_trend_period():
+    """검색 트렌드 조회 기간 (최근 3개월)"""
+    today = datetime.now()
+    start_date = (today - timedelta(days=90)).strftime('%Y-%m-%d')
+    end_date = today.strftime('%Y-%m-%d')
+    return start_date, end_date
+
+def submit_keyword_sources(keyword):
+    """키워드 분석에 필요한 업스트림 호출을 병렬로 시작하고 소스별 Future 반환"""
+    start_date, end_date = get_trend_period()
+
+    return {
+        'searchVolume': search_executor.submit(get_keyword_search_volume, keyword),  # 네이버 검색광고 API
+        'searchTrend': search_executor.submit(get_search_trend_data, keyword, start_date, end_date),
+        'blog': search_executor.submit(get_blog_data, keyword),
+        'cafe': search_executor.submit(get_cafe_data, keyword),
+        'relatedKeywords': search_executor.submit(get_related_keywords_with_volume, keyword),
+        'longtailKeywords': search_executor.submit(generate_longtail_keywords, keyword)  # 초보자용 (OpenAI)
+    }
+
+def wait_for_source(futures, name, started_at, fallback):
+    """소스별 마감 시간까지 결과를 기다리고, 초과하거나 실패하면 기본값 반환"""
+    remaining = max(SOURCE_DEADLINES[name] - (time.monotonic() - started_at), 0)
+    try:
+        return futures[name].result(timeout=remaining)
+    except FutureTimeoutError:
+        print(f"[병렬 조회] {name} 마감 시간 초과 ({SOURCE_DEADLINES[name]}초), 기본값 사용")
+        futures[name].cancel()
+        return fallback
+    except (BackpressureError, ProviderUnavailable):
+        # 호출량 제한/업스트림 장애는 기본값으로 숨기지 않고 그대로 알림
+        raise
+    except Exception as e:
+        print(f"[병렬 조회] {name} 조회 오류: {e}")
+        return fallback
+
+def get_empty_trend_data():
+    """트렌드 데이터를 가져오지 못했을 때의 기본값"""
+    return {
+        'graphData': {'dates': [], 'ratios': []},
+        'latestRatio': 0,
+        'period': 'N/A'
+    }
+
 def get_final_monthly_estimate(search_volume_data, total_content_count, search_trend_data):
     """여러 추정 방식을 가중 평균하여 최종 월간 발행량 계산"""
     try:
@@ -290,11 +805,24 @@ def get_final_monthly_estimate(search_volume_data, total_content_count, search_t
         print(f"[get_final_monthly_estimate] 오류: {e}")
         return total_content_count / 60  # 기본값
 
-def get_search_trend_data(keyword, start_date, end_date):
-    """네이버 데이터랩 API로 검색 트렌드 조회"""
+def naver_request(family, method, url, **kwargs):
+    """네이버 API 호출 - 시도마다 호출량 제한을 통과한 뒤 요청하고, 일시적 오류는 복원력 계층에서 재시도"""
+    def attempt():
+        rate_limiter.acquire(family, NAVER_CLIENT_ID)
+        return method(url, **kwargs)
+    return resilient_call(family, attempt)
+
+def get_search_trend_data(keyword, start_date, end_date, refresh=False):
+    """네이버 데이터랩 API로 검색 트렌드 조회 (refresh=True면 캐시를 건너뛰고 새로 조회)"""
     # 네이버 API용 키워드 전처리 (띄어쓰기 제거)
     api_keyword = keyword.replace(' ', '').strip()
     print(f"[트렌드 API] 원본: '{keyword}' → 처리됨: '{api_keyword}'")
+
+    cache_key = f"{api_keyword}:{start_date}:{end_date}"
+    cached = None if refresh else keyword_cache.get('searchTrend', cache_key)
+    if cached is not None:
+        print(f"[트렌드 API] 캐시 사용: '{api_keyword}'")
+        return cached
     
     url = 'https://openapi.naver.com/v1/datalab/search'
     headers = {
@@ -312,41 +840,106 @@ def get_search_trend_data(keyword, start_date, end_date):
     }
     
     try:
-        response = requests.post(url, headers=headers, json=body)
+        response = naver_request('naver_datalab', http_client.post, url, headers=headers, json=body)
         print(f"데이터랩 API 응답: {response.status_code}")
+        raise_for_rate_limit(response, 'naver_datalab')
         
         if response.status_code == 200:
             data = response.json()
             trend_data = data['results'][0]['data']
             
-            return {
-                'graphData': {
-                    'dates': [item['period'][:7] for item in trend_data],
-                    'ratios': [item['ratio'] for item in trend_data]
-                },
-                'latestRatio': trend_data[-1]['ratio'] if trend_data else 0,
-                'period': trend_data[-1]['period'] if trend_data else 'N/A'
-            }
+            result = format_trend_data(trend_data)
+            keyword_cache.set('searchTrend', cache_key, result)
+            return result
         else:
             print(f"데이터랩 API 오류: {response.status_code}, {response.text}")
-            return {
-                'graphData': {'dates': [], 'ratios': []},
-                'latestRatio': 0,
-                'period': 'N/A'
-            }
+            return get_empty_trend_data()
+    except (BackpressureError, ProviderUnavailable):
+        raise
     except Exception as e:
         print(f"데이터랩 API 호출 오류: {str(e)}")
-        return {
-            'graphData': {'dates': [], 'ratios': []},
-            'latestRatio': 0,
-            'period': 'N/A'
+        return get_empty_trend_data()
+
+def format_trend_data(trend_data):
+    """데이터랩 응답의 기간별 데이터를 트렌드 응답 형식으로 변환"""
+    return {
+        'graphData': {
+            'dates': [item['period'][:7] for item in trend_data],
+            'ratios': [item['ratio'] for item in trend_data]
+        },
+        'latestRatio': trend_data[-1]['ratio'] if trend_data else 0,
+        'period': trend_data[-1]['period'] if trend_data else 'N/A'
+    }
+
+def get_search_trend_data_batch(keywords, start_date, end_date):
+    """데이터랩 API 한 번에 최대 5개 키워드 그룹씩 묶어서 트렌드 조회 (api_keyword → 트렌드 dict)"""
+    results = {}
+    missing = []
+    for keyword in keywords:
+        api_keyword = keyword.replace(' ', '').strip()
+        cached = keyword_cache.get('searchTrend', f"{api_keyword}:{start_date}:{end_date}")
+        if cached is not None:
+            results[api_keyword] = cached
+        elif api_keyword not in missing:
+            missing.append(api_keyword)
+
+    url = 'https://openapi.naver.com/v1/datalab/search'
+    headers = {
+        'X-Naver-Client-Id': NAVER_CLIENT_ID,
+        'X-Naver-Client-Secret': NAVER_CLIENT_SECRET,
+        'Content-Type': 'application/json'
+    }
+
+    for i in range(0, len(missing), DATALAB_MAX_GROUPS):
+        chunk = missing[i:i + DATALAB_MAX_GROUPS]
+        body = {
+            "startDate": start_date,
+            "endDate": end_date,
+            "timeUnit": "month",
+            "keywordGroups": [
+                {"groupName": api_keyword, "keywords": [api_keyword]} for api_keyword in chunk
+            ]
         }
 
-def get_blog_data(keyword):
-    """네이버 블로그 검색 API"""
+        try:
+            response = naver_request('naver_datalab', http_client.post, url, headers=headers, json=body)
+            print(f"[트렌드 일괄 API] {len(chunk)}개 그룹 응답: {response.status_code}")
+            raise_for_rate_limit(response, 'naver_datalab')
+
+            if response.status_code != 200:
+                print(f"데이터랩 API 오류: {response.status_code}, {response.text}")
+                continue
+
+            for group in response.json().get('results', []):
+                api_keyword = group.get('title')
+                trend_data = group.get('data', [])
+
+                # 여러 그룹을 한 번에 조회하면 비율이 전체 그룹 최대값 기준이 되므로,
+                # 단건 조회와 같도록 그룹별 최대값을 100으로 다시 맞춤
+                peak = max((item['ratio'] for item in trend_data), default=0)
+                if peak > 0:
+                    trend_data = [{**item, 'ratio': round(item['ratio'] * 100 / peak, 5)} for item in trend_data]
+
+                result = format_trend_data(trend_data)
+                keyword_cache.set('searchTrend', f"{api_keyword}:{start_date}:{end_date}", result)
+                results[api_keyword] = result
+        except (BackpressureError, ProviderUnavailable):
+            raise
+        except Exception as e:
+            print(f"[트렌드 일괄 API] 호출 오류: {str(e)}")
+
+    return results
+
+def get_blog_data(keyword, refresh=False):
+    """네이버 블로그 검색 API (refresh=True면 캐시를 건너뛰고 새로 조회)"""
     # 네이버 API용 키워드 전처리 (띄어쓰기 제거)
     api_keyword = keyword.replace(' ', '').strip()
     print(f"[블로그 API] 원본: '{keyword}' → 처리됨: '{api_keyword}'")
+
+    cached = None if refresh else keyword_cache.get('blog', api_keyword)
+    if cached is not None:
+        print(f"[블로그 API] 캐시 사용: '{api_keyword}'")
+        return cached
     
     url = 'https://openapi.naver.com/v1/search/blog.json'
     headers = {
@@ -360,8 +953,9 @@ def get_blog_data(keyword):
     }
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = naver_request('naver_search', http_client.get, url, headers=headers, params=params)
         print(f"블로그 API 응답: {response.status_code}")
+        raise_for_rate_limit(response, 'naver_search')
         
         if response.status_code == 200:
             data = response.json()
@@ -387,19 +981,28 @@ def get_blog_data(keyword):
                     print(f"블로그 아이템 처리 오류: {e}")
                     continue
                     
-            return data.get('total', 0), formatted_items
+            result = (data.get('total', 0), formatted_items)
+            keyword_cache.set('blog', api_keyword, result)
+            return result
         else:
             print(f"블로그 API 오류: {response.status_code}, {response.text}")
             return 0, []
+    except (BackpressureError, ProviderUnavailable):
+        raise
     except Exception as e:
         print(f"블로그 API 호출 오류: {str(e)}")
         return 0, []
 
-def get_cafe_data(keyword):
-    """네이버 카페 검색 API"""
+def get_cafe_data(keyword, refresh=False):
+    """네이버 카페 검색 API (refresh=True면 캐시를 건너뛰고 새로 조회)"""
     # 네이버 API용 키워드 전처리 (띄어쓰기 제거)
     api_keyword = keyword.replace(' ', '').strip()
     print(f"[카페 API] 원본: '{keyword}' → 처리됨: '{api_keyword}'")
+
+    cached = None if refresh else keyword_cache.get('cafe', api_keyword)
+    if cached is not None:
+        print(f"[카페 API] 캐시 사용: '{api_keyword}'")
+        return cached
     
     url = 'https://openapi.naver.com/v1/search/cafearticle.json'
     headers = {
@@ -413,8 +1016,9 @@ def get_cafe_data(keyword):
     }
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = naver_request('naver_search', http_client.get, url, headers=headers, params=params)
         print(f"카페 API 응답: {response.status_code}")
+        raise_for_rate_limit(response, 'naver_search')
         
         if response.status_code == 200:
             data = response.json()
@@ -459,10 +1063,14 @@ def get_cafe_data(keyword):
                     print(f"카페 아이템 처리 오류: {e}, 아이템: {item}")
                     continue
                     
-            return data.get('total', 0), formatted_items
+            result = (data.get('total', 0), formatted_items)
+            keyword_cache.set('cafe', api_keyword, result)
+            return result
         else:
             print(f"카페 API 오류: {response.status_code}, {response.text}")
             return 0, []
+    except (BackpressureError, ProviderUnavailable):
+        raise
     except Exception as e:
         print(f"카페 API 호출 오류: {str(e)}")
         return 0, []
@@ -472,85 +1080,34 @@ def get_keyword_search_volume(keyword):
     # 네이버 API용 키워드 전처리 (띄어쓰기 제거)
     api_keyword = keyword.replace(' ', '').strip()
     print(f"[검색량 API] 원본: '{keyword}' → 처리됨: '{api_keyword}'")
-    
-    # 환경 변수 확인 (실제 .env 파일의 변수명 사용)
-    NAVER_AD_API_KEY = os.getenv('NAVER_AD_API_KEY')
-    NAVER_AD_SECRET_KEY = os.getenv('NAVER_AD_SECRET_KEY') 
-    NAVER_AD_CUSTOMER_ID = os.getenv('NAVER_AD_CUSTOMER_ID')
-    
-    print(f"API 키 확인: API_KEY={NAVER_AD_API_KEY[:10] if NAVER_AD_API_KEY else 'None'}..., SECRET_KEY={'설정됨' if NAVER_AD_SECRET_KEY else 'None'}, CUSTOMER_ID={NAVER_AD_CUSTOMER_ID}")
-    
-    if not all([NAVER_AD_API_KEY, NAVER_AD_SECRET_KEY, NAVER_AD_CUSTOMER_ID]):
-        print("검색광고 API 키가 설정되지 않음. 트렌드 데이터만 사용합니다.")
+
+    # 연관 키워드 조회와 같은 keywordList를 공유 (naver_searchad 모듈)
+    keyword_list = fetch_keyword_list(api_keyword)
+    if keyword_list is None:
+        print("[검색량 API] 검색광고 데이터 없음. 트렌드 데이터만 사용합니다.")
         return None
-    
+
     try:
-        # 네이버 검색광고 API 호출 (시그니처 방식)
-        timestamp = str(int(time.time() * 1000))
-        method = 'GET'
-        uri = '/keywordstool'
-        
-        print(f"시그니처 생성 전: timestamp={timestamp}, method={method}, uri={uri}")
-        print(f"SECRET_KEY 길이: {len(NAVER_AD_SECRET_KEY)}")
-        
-        try:
-            # signaturehelper.py의 Signature 클래스 사용
-            signature = Signature.generate(timestamp, method, uri, NAVER_AD_SECRET_KEY)
-            print(f"시그니처 생성 성공: {signature[:20]}...")
-        except Exception as sig_error:
-            print(f"시그니처 생성 오류: {sig_error}")
-            # 직접 시그니처 생성으로 fallback
-            import hashlib
-            import hmac
-            import base64
-            message = f"{timestamp}.{method}.{uri}"
-            hash_obj = hmac.new(bytes(NAVER_AD_SECRET_KEY, "utf-8"), bytes(message, "utf-8"), hashlib.sha256)
-            signature = base64.b64encode(hash_obj.digest()).decode("utf-8")
-            print(f"직접 시그니처 생성: {signature[:20]}...")
-        
-        url = 'https://api.searchad.naver.com/keywordstool'
-        headers = {
-            'X-Timestamp': timestamp,
-            'X-API-KEY': NAVER_AD_API_KEY,
-            'X-Customer': NAVER_AD_CUSTOMER_ID,
-            'X-Signature': signature,
-            'Content-Type': 'application/json'
-        }
-        
-        print(f"전송할 헤더: {headers}")
-        
-        params = {
-            'hintKeywords': api_keyword,
-            'showDetail': '1'
-        }
-        
-        response = requests.get(url, headers=headers, params=params)
-        print(f"검색광고 API 응답: {response.status_code}")
-        print(f"응답 헤더: {response.headers}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            print(f"검색광고 API 응답 데이터: {result}")
-            if 'keywordList' in result and result['keywordList']:
-                keyword_data = result['keywordList'][0]
-                return {
-                    'monthlyPcQcCnt': keyword_data.get('monthlyPcQcCnt', 0),
-                    'monthlyMobileQcCnt': keyword_data.get('monthlyMobileQcCnt', 0),
-                    'monthlyAvePcClkCnt': keyword_data.get('monthlyAvePcClkCnt', 0),
-                    'monthlyAveMobileClkCnt': keyword_data.get('monthlyAveMobileClkCnt', 0),
-                    'compIdx': keyword_data.get('compIdx', 'N/A')
-                }
-            else:
-                print("검색광고 API: 키워드 데이터가 없습니다.")
-                return None
+        if keyword_list:
+            return parse_search_volume(keyword_list[0])
         else:
-            print(f"검색광고 API 오류: {response.status_code}, {response.text}")
+            print("검색광고 API: 키워드 데이터가 없습니다.")
             return None
-            
+
     except Exception as e:
-        print(f"검색광고 API 호출 오류: {str(e)}")
+        print(f"검색광고 API 처리 오류: {str(e)}")
         return None
 
+def parse_search_volume(keyword_data):
+    """keywordList 항목에서 검색량 응답 데이터 추출"""
+    return {
+        'monthlyPcQcCnt': keyword_data.get('monthlyPcQcCnt', 0),
+        'monthlyMobileQcCnt': keyword_data.get('monthlyMobileQcCnt', 0),
+        'monthlyAvePcClkCnt': keyword_data.get('monthlyAvePcClkCnt', 0),
+        'monthlyAveMobileClkCnt': keyword_data.get('monthlyAveMobileClkCnt', 0),
+        'compIdx': keyword_data.get('compIdx', 'N/A')
+    }
+
 def calculate_real_search_analysis(search_volume_data, content_count, search_trend_data=None, monthly_estimate=None):
     """실제 검색량 기반 분석 (월간 추정치 사용)"""
     pc_volume = search_volume_data.get('monthlyPcQcCnt', 0) or 0
@@ -872,140 +1429,85 @@ def get_related_keywords_with_volume(keyword):
     """네이버 검색광고 API를 통해 연관 키워드들과 검색량을 일괄 조회"""
     # 네이버 API용 키워드 전처리 (띄어쓰기 제거)
     api_keyword = keyword.replace(' ', '').strip()
-    print("=" * 50)
-    print(f"[연관키워드] 함수 호출됨!!! 원본: '{keyword}' → 처리됨: '{api_keyword}'")
-    print("=" * 50)
-    # 환경 변수 확인
-    NAVER_AD_API_KEY = os.getenv('NAVER_AD_API_KEY')
-    NAVER_AD_SECRET_KEY = os.getenv('NAVER_AD_SECRET_KEY') 
-    NAVER_AD_CUSTOMER_ID = os.getenv('NAVER_AD_CUSTOMER_ID')
-    
-    print(f"[연관키워드] API 키 확인: API_KEY={NAVER_AD_API_KEY[:10] if NAVER_AD_API_KEY else 'None'}...")
-    
-    if not all([NAVER_AD_API_KEY, NAVER_AD_SECRET_KEY, NAVER_AD_CUSTOMER_ID]):
-        print("[연관키워드] 검색광고 API 키가 설정되지 않음")
+    print(f"[연관키워드] 원본: '{keyword}' → 처리됨: '{api_keyword}'")
+
+    # 검색량 조회와 같은 keywordList를 공유 (naver_searchad 모듈)
+    keywords_data = fetch_keyword_list(api_keyword)
+    if keywords_data is None:
+        print("[연관키워드] 검색광고 데이터 없음")
         return None
-    
+
     try:
-        # 네이버 검색광고 API 호출 (키워드 툴)
-        timestamp = str(int(time.time() * 1000))
-        method = 'GET'
-        uri = '/keywordstool'
-        
-        # 시그니처 생성
-        try:
-            signature = Signature.generate(timestamp, method, uri, NAVER_AD_SECRET_KEY)
-            print(f"[연관키워드] 시그니처 생성 성공")
-        except Exception as sig_error:
-            print(f"[연관키워드] 시그니처 생성 오류: {sig_error}")
-            # fallback 시그니처 생성
-            import hashlib
-            import hmac
-            import base64
-            message = f"{timestamp}.{method}.{uri}"
-            hash_obj = hmac.new(bytes(NAVER_AD_SECRET_KEY, "utf-8"), bytes(message, "utf-8"), hashlib.sha256)
-            signature = base64.b64encode(hash_obj.digest()).decode("utf-8")
-        
-        url = 'https://api.searchad.naver.com/keywordstool'
-        headers = {
-            'X-Timestamp': timestamp,
-            'X-API-KEY': NAVER_AD_API_KEY,
-            'X-Customer': NAVER_AD_CUSTOMER_ID,
-            'X-Signature': signature,
-            'Content-Type': 'application/json'
-        }
-        
-        # 연관 키워드 조회를 위한 파라미터 (showDetail=1로 상세 정보 포함)
-        params = {
-            'hintKeywords': api_keyword,
-            'showDetail': '1'
-        }
-        
-        response = requests.get(url, headers=headers, params=params)
-        print(f"[연관키워드] API 응답: {response.status_code}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            print(f"[연관키워드] 응답 데이터 키: {result.keys()}")
+        if keywords_data:
+            print(f"[연관키워드] 총 {len(keywords_data)}개 키워드 발견")
+            
+            main_keyword_data = None
+            related_keywords = []
             
-            if 'keywordList' in result and result['keywordList']:
-                keywords_data = result['keywordList']
-                print(f"[연관키워드] 총 {len(keywords_data)}개 키워드 발견")
-                
-                main_keyword_data = None
-                related_keywords = []
-                
-                for i, keyword_data in enumerate(keywords_data):
+            for i, keyword_data in enumerate(keywords_data):
+                try:
+                    print(f"[연관키워드] 처리 중 {i+1}/{len(keywords_data)}")
+                    keyword_name = keyword_data.get('relKeyword', '')
+                    pc_volume = keyword_data.get('monthlyPcQcCnt', 0) or 0
+                    mobile_volume = keyword_data.get('monthlyMobileQcCnt', 0) or 0
+                    total_volume = pc_volume + mobile_volume
+                    competition = keyword_data.get('compIdx', 'N/A')
+                    
+                    # 타입 안전성 확보
                     try:
-                        print(f"[연관키워드] 처리 중 {i+1}/{len(keywords_data)}")
-                        keyword_name = keyword_data.get('relKeyword', '')
-                        pc_volume = keyword_data.get('monthlyPcQcCnt', 0) or 0
-                        mobile_volume = keyword_data.get('monthlyMobileQcCnt', 0) or 0
+                        pc_volume = int(pc_volume) if pc_volume else 0
+                        mobile_volume = int(mobile_volume) if mobile_volume else 0
                         total_volume = pc_volume + mobile_volume
-                        competition = keyword_data.get('compIdx', 'N/A')
-                        
-                        # 타입 안전성 확보
-                        try:
-                            pc_volume = int(pc_volume) if pc_volume else 0
-                            mobile_volume = int(mobile_volume) if mobile_volume else 0
-                            total_volume = pc_volume + mobile_volume
-                        except (ValueError, TypeError):
-                            pc_volume = 0
-                            mobile_volume = 0
-                            total_volume = 0
-                        
-                        keyword_info = {
-                            'keyword': str(keyword_name),
-                            'monthlySearchVolume': total_volume,
-                            'monthlyPcQcCnt': pc_volume,
-                            'monthlyMobileQcCnt': mobile_volume,
-                            'compIdx': str(competition) if competition else 'N/A'
-                        }
+                    except (ValueError, TypeError):
+                        pc_volume = 0
+                        mobile_volume = 0
+                        total_volume = 0
+                    
+                    keyword_info = {
+                        'keyword': str(keyword_name),
+                        'monthlySearchVolume': total_volume,
+                        'monthlyPcQcCnt': pc_volume,
+                        'monthlyMobileQcCnt': mobile_volume,
+                        'compIdx': str(competition) if competition else 'N/A'
+                    }
+                    
+                    # 메인 키워드와 정확히 일치하는지 확인 (띄어쓰기 제거된 버전과 비교)
+                    if keyword_name.lower() == api_keyword.lower():
+                        main_keyword_data = keyword_info
+                        print(f"[연관키워드] 메인 키워드 발견: {keyword_name}")
+                    else:
+                        related_keywords.append(keyword_info)
                         
-                        # 메인 키워드와 정확히 일치하는지 확인 (띄어쓰기 제거된 버전과 비교)
-                        if keyword_name.lower() == api_keyword.lower():
-                            main_keyword_data = keyword_info
-                            print(f"[연관키워드] 메인 키워드 발견: {keyword_name}")
-                        else:
-                            related_keywords.append(keyword_info)
-                            
-                    except Exception as keyword_error:
-                        print(f"[연관키워드] 키워드 처리 오류 {i+1}: {keyword_error}")
-                        continue
-                
-                print(f"[연관키워드] 연관 키워드 {len(related_keywords)}개 처리 완료")
-                
-                return {
-                    'main_keyword': main_keyword_data,
-                    'related_keywords': related_keywords[:20]  # 상위 20개만 반환
-                }
-            else:
-                print("[연관키워드] 키워드 데이터가 없습니다.")
-                return None
+                except Exception as keyword_error:
+                    print(f"[연관키워드] 키워드 처리 오류 {i+1}: {keyword_error}")
+                    continue
+            
+            print(f"[연관키워드] 연관 키워드 {len(related_keywords)}개 처리 완료")
+            
+            return {
+                'main_keyword': main_keyword_data,
+                'related_keywords': related_keywords[:20]  # 상위 20개만 반환
+            }
         else:
-            print(f"[연관키워드] API 오류: {response.status_code}, {response.text}")
+            print("[연관키워드] 키워드 데이터가 없습니다.")
             return None
             
     except Exception as e:
-        print(f"[연관키워드] API 호출 오류: {str(e)}")
+        print(f"[연관키워드] 처리 오류: {str(e)}")
         return None
 
-def generate_longtail_keywords(keyword):
-    """초보자를 위한 롱테일 키워드 10개 생성"""
-    try:
-        print(f"[롱테일 키워드] '{keyword}' 기반 생성 시작")
-        
-        openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        response = openai_client.chat.completions.create(
-            model="gpt-4.1-nano",  # 정확한 GPT-4.1 Nano 모델명
-            messages=[
-                {
-                    "role": "system",
-                    "content": "당신은 SEO 전문가입니다. 블로그 초보자가 상위 노출을 노릴 수 있는 실용적인 롱테일 키워드를 추천해주세요."
-                },
-                {
-                    "role": "user",
-                    "content": f"""'{keyword}'이라는 키워드를 기반으로 블로그 초보자가 상위 노출을 노릴 수 있는 롱테일 키워드 10개만 추천해줘.
+LONGTAIL_MODEL = "gpt-4.1-nano"
+
+def build_longtail_messages(keyword):
+    """롱테일 키워드 생성 프롬프트 메시지"""
+    return [
+        {
+            "role": "system",
+            "content": "당신은 SEO 전문가입니다. 블로그 초보자가 상위 노출을 노릴 수 있는 실용적인 롱테일 키워드를 추천해주세요."
+        },
+        {
+            "role": "user",
+            "content": f"""'{keyword}'이라는 키워드를 기반으로 블로그 초보자가 상위 노출을 노릴 수 있는 롱테일 키워드 10개만 추천해줘.
 
 조건:
 1. 문장이 아니라 검색 키워드처럼 짧고 구체적으로
@@ -1016,39 +1518,43 @@ def generate_longtail_keywords(keyword):
 
 JSON 형식으로 응답해주세요:
 {{"longtail_keywords": ["키워드1", "키워드2", "키워드3", ...]}}"""
-                }
-            ],
-            temperature=0.7,
-            max_tokens=400
-        )
-        
-        print(f"[롱테일 키워드] API 응답 받음: {response.choices[0].message.content}")
+        }
+    ]
+
+def longtail_cache_key(keyword):
+    """롱테일 키워드 응답의 캐시 키"""
+    return llm_cache_key('openai', LONGTAIL_MODEL, build_longtail_messages(keyword), 0.7, 400)
+
+def generate_longtail_keywords(keyword, refresh=False):
+    """초보자를 위한 롱테일 키워드 10개 생성 (refresh=True면 캐시를 건너뛰고 새로 생성)"""
+    try:
+        print(f"[롱테일 키워드] '{keyword}' 기반 생성 시작")
+
+        cache_key = longtail_cache_key(keyword)
+        content = None if refresh else get_cached_response('generate_longtail_keywords', cache_key)
+        from_cache = content is not None
+        if from_cache:
+            print(f"[롱테일 키워드] 캐시 사용: '{keyword}'")
+        else:
+            content = hedged_chat_completion('generate_longtail_keywords', LONGTAIL_MODEL, build_longtail_messages(keyword), 0.7, 400)
+            print(f"[롱테일 키워드] API 응답 받음: {content}")
         
         try:
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
             longtail_keywords = result.get('longtail_keywords', [])
             print(f"[롱테일 키워드] JSON 파싱 성공: {longtail_keywords}")
+            if longtail_keywords and not from_cache:
+                store_response('generate_longtail_keywords', cache_key, content)
         except json.JSONDecodeError as e:
             # JSON 파싱 실패 시 기본값
             print(f"[롱테일 키워드] JSON 파싱 실패: {e}")
-            print(f"[롱테일 키워드] 원본 응답: {response.choices[0].message.content}")
+            print(f"[롱테일 키워드] 원본 응답: {content}")
             longtail_keywords = []
         
         if not longtail_keywords:
             print("[롱테일 키워드] 빈 배열이므로 fallback 사용")
             # 기본 롱테일 키워드 생성
-            longtail_keywords = [
-                f"{keyword} 추천",
-                f"{keyword} 비교",
-                f"{keyword} 후기",
-                f"{keyword} 장단점",
-                f"{keyword} 선택법",
-                f"초보자 {keyword}",
-                f"{keyword} 가격",
-                f"{keyword} 사용법",
-                f"{keyword} 종류",
-                f"{keyword} 활용팁"
-            ]
+            longtail_keywords = get_fallback_longtail_keywords(keyword)
         
         print(f"[롱테일 키워드] {len(longtail_keywords)}개 생성 완료")
         return longtail_keywords
@@ -1057,22 +1563,68 @@ JSON 형식으로 응답해주세요:
         print(f"[롱테일 키워드] 생성 오류: {e}")
         print(f"[롱테일 키워드] 오류 타입: {type(e)}")
         # 에러 시 기본 키워드 반환
-        return [
-            f"{keyword} 추천",
-            f"{keyword} 비교",
-            f"{keyword} 후기",
-            f"{keyword} 장단점",
-            f"{keyword} 선택법",
-            f"초보자 {keyword}",
-            f"{keyword} 가격",
-            f"{keyword} 사용법",
-            f"{keyword} 종류",
-            f"{keyword} 활용팁"
-        ]
+        return get_fallback_longtail_keywords(keyword)
+
+def get_fallback_longtail_keywords(keyword):
+    """롱테일 키워드 생성 실패 시 사용할 기본 키워드 10개"""
+    return [
+        f"{keyword} 추천",
+        f"{keyword} 비교",
+        f"{keyword} 후기",
+        f"{keyword} 장단점",
+        f"{keyword} 선택법",
+        f"초보자 {keyword}",
+        f"{keyword} 가격",
+        f"{keyword} 사용법",
+        f"{keyword} 종류",
+        f"{keyword} 활용팁"
+    ]
+
+def register_prewarm_sources():
+    """인기 키워드 미리 갱신 대상 캐시 소스 등록 (캐시 키는 각 조회 함수와 동일)"""
+    def trend_expires_at(keyword):
+        start_date, end_date = get_trend_period()
+        return keyword_cache.expires_at('searchTrend', f"{normalize_keyword(keyword)}:{start_date}:{end_date}")
+
+    cache_prewarmer.register('search', 'searchTrend', trend_expires_at,
+                             lambda keyword: get_search_trend_data(keyword, *get_trend_period(), refresh=True))
+    for source, fetch in (('keywordList', fetch_keyword_list), ('blog', get_blog_data), ('cafe', get_cafe_data)):
+        cache_prewarmer.register('search', source,
+                                 lambda keyword, source=source: keyword_cache.expires_at(source, normalize_keyword(keyword)),
+                                 lambda keyword, fetch=fetch: fetch(keyword, refresh=True))
+    cache_prewarmer.register('search', 'longtailKeywords',
+                             lambda keyword: cached_response_expires_at('generate_longtail_keywords', longtail_cache_key(keyword)),
+                             lambda keyword: generate_longtail_keywords(keyword, refresh=True))
+    cache_prewarmer.register('topics', 'contentPlan',
+                             lambda keyword: cached_response_expires_at('generate_content_plan', content_plan_cache_key(keyword)),
+                             lambda keyword: generate_content_plan(keyword, refresh=True))
+
+register_prewarm_sources()
+
+# 비스트리밍 글 생성 작업
+article_jobs.register('generateArticle', generate_full_article)
+article_jobs.register('regenerateArticle', regenerate_article)
+article_jobs.register('regenerateSections', regenerate_sections)
+
+def start_background_services():
+    """서버 시작 시 한 번 실행할 백그라운드 작업 (WSGI/ASGI 모드 공용)"""
+    # 이전 프로세스에서 끝나지 않은 글 생성 작업 다시 실행
+    article_jobs.resume_pending()
+
+    # 업스트림 연결 미리 준비 (HTTP_PREWARM=false로 끌 수 있음)
+    if os.getenv('HTTP_PREWARM', 'true').lower() == 'true':
+        http_client.prewarm_connections()
+
+    # 인기 키워드 캐시 미리 갱신 (PREWARM_ENABLED=false로 끌 수 있음)
+    if PREWARM_ENABLED:
+        cache_prewarmer.start()
 
 if __name__ == '__main__':
     # Railway가 자동으로 제공하는 PORT 환경변수 사용
     port = int(os.environ.get('PORT', 3000))  # Railway 기본값은 보통 3000
     print(f"Railway auto-provided PORT: '{os.environ.get('PORT', 'NOT_SET')}'")
     print(f"Using port: {port}")
+
+    start_background_services()
+
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,76 @@
+"""
+스트리밍 글 메타 정보 모듈
+글 스트림 조각이 지나갈 때마다 글자 수, 제목 구조, 키워드 등장 횟수, 태그를 누적해서
+스트림이 끝나면 전체 글을 다시 읽지 않고 generate_full_article 결과와 같은 형식의 메타 정보를 만듭니다.
+"""
+
+import re
+from guardrail import PhraseMatcher
+
+HEADING_LINE_PATTERN = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t]*#*[ \t]*$')
+TAG_PATTERN = re.compile(r'(?<![#\w&])#([^\s#.,!?()\[\]]+)')
+PREVIEW_CHARS = 200  # 메타 디스크립션용 앞부분 길이
+
+class ArticleMetadataTracker:
+    """글 스트림의 메타 정보를 조각 단위로 누적"""
+
+    def __init__(self, keyword, related_keywords=None):
+        self.keywords = [k for k in dict.fromkeys([keyword] + list(related_keywords or [])) if k]
+        self._matcher = PhraseMatcher(self.keywords) if self.keywords else None
+        self._match_state = 0
+        self.keyword_counts = {k: 0 for k in self.keywords}
+        self.word_count = 0  # 공백(' ')을 제외한 글자 수 (generate_full_article의 wordCount와 같은 기준)
+        self.char_count = 0
+        self.preview = ''
+        self.headings = []
+        self.tags = []
+        self._line = ''  # 아직 끝나지 않은 현재 줄
+        self._in_code = False
+
+    def feed(self, chunk):
+        self.char_count += len(chunk)
+        self.word_count += len(chunk) - chunk.count(' ')
+        if len(self.preview) < PREVIEW_CHARS:
+            self.preview += chunk[:PREVIEW_CHARS - len(self.preview)]
+
+        if self._matcher is not None:
+            for char in chunk:
+                self._match_state = self._matcher.step(self._match_state, char)
+                for phrase in self._matcher.outputs(self._match_state):
+                    self.keyword_counts[phrase] += 1
+
+        # 완성된 줄만 제목/태그 검사 (마지막 줄은 다음 조각과 이어질 수 있음)
+        lines = (self._line + chunk).split('\n')
+        self._line = lines.pop()
+        for line in lines:
+            self._scan_line(line)
+
+    def _scan_line(self, line):
+        if line.lstrip().startswith('```'):
+            self._in_code = not self._in_code
+            return
+        if self._in_code:
+            return
+
+        heading = HEADING_LINE_PATTERN.match(line)
+        if heading:
+            self.headings.append({'level': len(heading.group(1)), 'text': heading.group(2)})
+            return
+        for tag in TAG_PATTERN.findall(line):
+            if tag not in self.tags:
+                self.tags.append(tag)
+
+    def finish(self):
+        """스트림 끝 - 마지막 줄까지 검사"""
+        if self._line:
+            self._scan_line(self._line)
+            self._line = ''
+
+    def to_dict(self):
+        return {
+            'wordCount': self.word_count,
+            'charCount': self.char_count,
+            'headings': self.headings,
+            'keywordCounts': self.keyword_counts,
+            'tags': self.tags
+        }
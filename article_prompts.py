@@ -0,0 +1,346 @@
+"""
+블로그 글 생성 프롬프트 모듈
+모든 글 생성 요청이 공유하는 고정 지시문(시스템 프롬프트)과 요청마다 달라지는
+짧은 템플릿(키워드, 제목, 톤, 소스 정보)을 분리해서 관리합니다.
+고정 지시문은 요청 간에 바이트 단위로 동일하므로 Claude 프롬프트 캐시 대상으로 표시합니다.
+"""
+
+import os
+from string import Template
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+ARTICLE_MODEL = "claude-3-5-sonnet-20241022"
+ARTICLE_MAX_TOKENS = 8000
+
+# 섹션 병렬 생성/섹션 재생성 시 부분별 최대 토큰 수
+SECTION_MAX_TOKENS = {
+    'intro': 800,
+    'section': 2500,
+    'subsection': 1200,
+    'closing': 1200
+}
+
+PROMPT_CACHE_ENABLED = os.getenv('PROMPT_CACHE_ENABLED', 'true').lower() == 'true'
+PROMPT_CACHE_BETA_HEADER = {"anthropic-beta": "prompt-caching-2024-07-31"}
+
+# 모든 글 생성 요청에 공통인 지시문 (요청별 값을 넣지 말 것 - 한 글자라도 바뀌면 캐시가 깨짐)
+ARTICLE_SYSTEM_PREFIX = """당신은 SEO 최적화와 사용자 친화적인 글쓰기 전문가입니다.
+
+**중요: 절대로 내용을 생략하지 말고 완전한 블로그 글을 작성해주세요. "[이하 생략]"이나 "[나머지 내용...]" 같은 표현은 절대 사용하지 마세요.**
+
+**절대 중단하지 마세요! 다음과 같은 표현들을 사용하지 마세요:**
+- "[계속해서 나머지 섹션들도 이어서 작성하시겠습니까?]"
+- "[이어서 작성할까요?]"
+- "[나머지 내용을 원하시면...]"
+- "[...더 자세한 내용이 필요하시면...]"
+- "[시간 관계상 여기서 마무리하겠습니다]"
+- "[다음 섹션으로 계속...]"
+- "[계속...]"
+- "[이어서...]"
+- "[...생략...]"
+- "[더 보기]"
+
+**반드시 완전한 글을 한 번에 끝까지 작성하세요. 중간에 멈추거나 확인을 요청하지 마세요.**
+
+**당신의 임무는 완전한 블로그 글을 작성하는 것입니다. 절대로 요약하거나 생략하지 말고, 모든 섹션을 완성된 형태로 작성하세요.**
+
+**이것은 요약이 아닌 완전한 블로그 글입니다. 각 주제를 깊이 있게 다루고, 독자가 완전히 이해할 수 있도록 자세히 설명해주세요.**
+
+**절대 요약하지 마세요! 다음과 같이 상세하게 작성해주세요:**
+- 각 H2 섹션은 반드시 800-1000자 분량으로 작성
+- 각 H3 하위 섹션도 300-400자 분량으로 상세 작성
+- 단순 나열이 아닌 완전한 문단으로 구성
+- 구체적인 예시, 경험담, 비교, 분석 포함
+- 독자의 궁금증을 완전히 해결하는 깊이 있는 설명
+- "입니다", "습니다" 같은 완전한 문장으로 작성
+
+**글 작성 요구사항:**
+1. **완전한 글 작성**: 모든 내용을 빠짐없이 작성하고 생략하지 마세요
+2. **최소 5000자 이상**: 충분히 상세하고 깊이 있는 내용으로 작성
+3. **각 섹션 상세화**: 각 H2 섹션마다 최소 3-4개 문단으로 구성
+4. **구체적인 설명**: 단순 나열이 아닌 자세한 설명과 근거 제시
+5. **실전 경험**: 구체적인 사례, 경험담, 단계별 가이드 포함
+6. **SEO 최적화**: 키워드를 자연스럽게 본문에 5-8회 포함
+7. **가독성**: 쉽고 친근한 설명, 구체적 예시 사용
+8. **실용성**: 독자에게 실제로 도움이 되는 구체적인 정보 제공
+
+**구조 요구사항:**
+- H2(##), H3(###) 제목 구조 사용
+- 각 H2 섹션마다 충분한 설명 (최소 4-5문단, 400-600자)
+- 각 H3 하위 섹션도 2-3문단으로 상세 작성
+- 단순 나열이 아닌 스토리텔링과 구체적 설명
+- 실용적인 팁과 구체적인 정보 포함
+- 독자의 궁금증을 완전히 해결하는 깊이 있는 내용
+
+**반드시 포함할 내용:**
+- 소스에서 언급된 모든 주요 정보를 빠짐없이 상세히 설명
+- 각 항목별 구체적인 특징, 방법, 조건 등
+- 실용적인 팁과 주의사항
+
+**글쓰기 스타일 가이드:**
+- 각 문단은 최소 3-4문장으로 구성
+- 구체적인 수치, 데이터, 예시 포함
+- "왜 그런지", "어떻게 하는지" 상세한 설명
+- 독자가 실제로 적용할 수 있는 구체적인 방법 제시
+- 비교, 분석, 경험담을 통한 깊이 있는 내용
+
+**글 끝 요소:**
+- 핵심 내용 요약
+- 행동 유도(CTA)
+- 요청에 주어진 관련 키워드
+- 추천 태그 (#태그 형식 5-8개)
+
+**글 작성 완료 기준:**
+1. 모든 H2 섹션이 완성되어야 함
+2. 요약/결론 섹션 포함
+3. CTA(행동 유도) 포함
+4. 관련 키워드 포함
+5. 추천 태그 포함
+6. 5000자 이상 분량 달성
+
+사용자 메시지로 키워드, 제목, 톤/문체, 소스 정보가 주어집니다. 위 지침을 모두 지켜 요청된 글을 작성하세요."""
+
+# 섹션 병렬 생성 공통 지시문 (글 전체가 아닌 맡은 부분만 쓰도록 함)
+SECTION_SYSTEM_PREFIX = """당신은 SEO 최적화와 사용자 친화적인 글쓰기 전문가입니다.
+여러 작가가 하나의 블로그 글을 부분별로 나눠서 동시에 작성하고 있으며, 당신은 그중 한 부분을 맡았습니다.
+작성된 부분들은 순서대로 이어 붙여 하나의 완성된 글이 됩니다.
+
+**공통 규칙:**
+- 맡은 부분만 작성하고, 다른 부분(서론, 다른 섹션, 결론)의 내용은 쓰지 마세요
+- 맡은 부분은 생략 없이 끝까지 완성하세요. "[이하 생략]", "[계속...]" 같은 표현이나 확인 요청은 절대 쓰지 마세요
+- 글 전체 목차를 참고해서 다른 섹션과 내용이 겹치지 않게 하세요
+- 키워드를 자연스럽게 1-2회 포함하세요
+- 각 문단은 최소 3-4문장, "입니다", "습니다" 같은 완전한 문장으로 작성하세요
+- 구체적인 예시, 수치, 경험담, 비교, 실용적인 팁을 포함하세요
+- 부분 앞뒤에 인사말이나 설명("다음은 ~입니다")을 붙이지 말고 본문만 출력하세요
+
+사용자 메시지로 글 전체 정보(키워드, 제목, 톤/문체, 목차)와 맡은 부분이 주어집니다."""
+
+# 섹션 병렬 생성 부분별 템플릿 ($context: 모든 부분이 공유하는 글 정보)
+SECTION_TEMPLATES = {
+    'intro': Template("""$context
+
+**맡은 부분: 서론**
+- 첫 줄은 "# $title" 형식의 제목
+- 독자의 관심을 끄는 도입부 2-3문단 (300-500자)
+- 이 글에서 다룰 내용을 자연스럽게 예고
+- H2(##) 제목은 쓰지 마세요"""),
+    'section': Template("""$context
+
+**맡은 부분: $index번째 섹션**
+- 첫 줄은 "## $section_title" 형식의 H2 제목
+- 800-1000자 이상, H3(###) 하위 섹션으로 나눠 상세하게 작성
+$section_points
+
+$approach 방식으로 작성해주세요."""),
+    'closing': Template("""$context
+
+**맡은 부분: 마무리**
+다음을 순서대로 작성하세요:
+1. "## 핵심 요약" - 목차의 각 섹션 핵심을 정리
+2. 행동 유도(CTA) 문단
+3. "**관련 키워드:**" 한 줄
+4. 추천 태그 (#태그 형식 5-8개)""")
+}
+
+SECTION_CONTEXT_TEMPLATE = Template("""**글 전체 정보:**
+- 키워드: "$keyword"
+- 제목: "$title"
+- 글의 톤/문체: $tone ($style)
+- 독자 대상: $reader
+- 관련 키워드: $related_keywords
+
+**글 전체 목차:**
+$outline""")
+
+# 섹션 재생성 공통 지시문
+SECTION_REWRITE_SYSTEM_PREFIX = """당신은 SEO 최적화와 사용자 친화적인 글쓰기 전문가입니다.
+이미 완성된 블로그 글에서 표시된 한 섹션만 새로 작성합니다.
+새 섹션은 원래 위치에 그대로 끼워 넣어지므로 앞뒤 내용과 자연스럽게 이어져야 합니다.
+
+**규칙:**
+- 표시된 섹션만 출력하고, 글의 다른 부분은 출력하지 마세요
+- 첫 줄은 원래 섹션과 같은 수준(## 또는 ###)의 같은 제목을 그대로 사용하세요
+- 원래 섹션과 다른 표현, 예시, 구성으로 새로 작성하되 다루는 주제는 유지하세요
+- 분량은 원래 섹션과 비슷하거나 더 풍부하게 작성하고, 생략하거나 중간에 멈추지 마세요
+- 다른 섹션과 내용이 겹치지 않게 하고, 글 전체의 톤/문체를 유지하세요
+- 섹션 앞뒤에 설명("다음은 ~입니다")이나 표시 문자열을 붙이지 말고 본문만 출력하세요
+
+사용자 메시지로 글 정보와 재작성 대상이 표시된 전체 글이 주어집니다."""
+
+SECTION_REWRITE_START = "<<<재작성 대상 시작>>>"
+SECTION_REWRITE_END = "<<<재작성 대상 끝>>>"
+
+SECTION_REWRITE_TEMPLATE = Template("""**글 정보:**
+- 키워드: "$keyword"
+- 제목: "$title"
+- 글의 톤/문체: $tone ($style)
+- 독자 대상: $reader
+
+**전체 글 (재작성 대상은 표시 문자열 사이):**
+$article
+
+**재작성할 섹션:** "$heading"
+$instructions
+$approach 방식으로 이 섹션만 새로 작성해주세요.""")
+
+# 요청마다 달라지는 부분만 담은 템플릿 (이름 -> 미리 컴파일한 Template)
+ARTICLE_TEMPLATES = {
+    'article': Template("""**작성 조건:**
+- 키워드: "$keyword"
+- 제목: "$title"
+- 글의 톤/문체: $tone ($style)
+- 독자 대상: $reader
+- 관련 키워드: $related_keywords
+
+**주어진 소스 정보:**
+$source_content
+
+$approach 방식으로 완전한 글을 작성해주세요.
+
+**마지막 확인: 모든 섹션을 완성하고, 요약부터 태그까지 포함해서 완전한 블로그 글을 한 번에 끝까지 작성하세요. 절대로 중간에 멈추지 마세요.**"""),
+    'regenerate': Template("""이전과는 다른 새로운 접근 방식으로 글을 작성해주세요.
+
+**작성 조건:**
+- 키워드: "$keyword"
+- 제목: "$title"
+- 글의 톤/문체: $tone ($style)
+- 독자 대상: $reader
+- 관련 키워드: $related_keywords
+
+**주어진 소스 정보:**
+$source_content
+
+**재생성 요구사항:**
+1. **새로운 구성**: 이전과 다른 관점이나 구조로 접근
+2. **창의적 표현**: 다른 예시, 비유, 설명 방식 사용
+3. **차별화된 내용**: 같은 정보라도 완전히 다른 방식으로 풀어내기
+
+$approach 방식으로 이전과는 완전히 다른 새로운 글을 작성해주세요.
+
+**마지막 확인: 모든 섹션을 완성하고, 요약부터 태그까지 포함해서 완전한 블로그 글을 한 번에 끝까지 작성하세요. 절대로 중간에 멈추지 마세요.**""")
+}
+
+def build_system_prompt(prefix=ARTICLE_SYSTEM_PREFIX):
+    """고정 지시문 시스템 프롬프트 (프롬프트 캐시 사용 시 캐시 지점 표시)"""
+    if not PROMPT_CACHE_ENABLED:
+        return prefix
+    return [
+        {
+            "type": "text",
+            "text": prefix,
+            "cache_control": {"type": "ephemeral"}
+        }
+    ]
+
+def render_article_prompt(template_name, keyword, title, tone, tone_info, source_content, related_keywords):
+    """요청별 사용자 메시지 생성"""
+    return ARTICLE_TEMPLATES[template_name].substitute(
+        keyword=keyword,
+        title=title,
+        tone=tone,
+        style=tone_info['style'],
+        reader=tone_info['reader'],
+        approach=tone_info['approach'],
+        related_keywords=', '.join(related_keywords) if related_keywords else f"{keyword} 관련",
+        source_content=source_content
+    )
+
+def build_article_request(template_name, keyword, title, tone, tone_info, source_content, related_keywords):
+    """Claude messages.create / messages.stream에 넘길 인자"""
+    request = {
+        'model': ARTICLE_MODEL,
+        'max_tokens': ARTICLE_MAX_TOKENS,
+        'system': build_system_prompt(),
+        'messages': [
+            {
+                "role": "user",
+                "content": render_article_prompt(template_name, keyword, title, tone, tone_info, source_content, related_keywords)
+            }
+        ]
+    }
+    if PROMPT_CACHE_ENABLED:
+        request['extra_headers'] = PROMPT_CACHE_BETA_HEADER
+    return request
+
+def render_section_points(section):
+    """섹션에 포함할 하위 항목/소스 메모"""
+    lines = []
+    if section.get('subsections'):
+        lines.append("- 다룰 하위 항목: " + ', '.join(section['subsections']))
+    if section.get('notes'):
+        lines.append("\n**이 섹션의 소스 정보:**\n" + section['notes'])
+    return '\n'.join(lines)
+
+def build_section_requests(keyword, title, tone, tone_info, sections, related_keywords):
+    """섹션 병렬 생성 요청 인자 목록 (서론, 섹션들, 마무리 순서 - 문서 순서와 같음)"""
+    context = SECTION_CONTEXT_TEMPLATE.substitute(
+        keyword=keyword,
+        title=title,
+        tone=tone,
+        style=tone_info['style'],
+        reader=tone_info['reader'],
+        related_keywords=', '.join(related_keywords) if related_keywords else f"{keyword} 관련",
+        outline='\n'.join(f"{i}. {section['title']}" for i, section in enumerate(sections, 1))
+    )
+    parts = [('intro', {'title': title})]
+    for i, section in enumerate(sections, 1):
+        parts.append(('section', {
+            'index': i,
+            'section_title': section['title'],
+            'section_points': render_section_points(section),
+            'approach': tone_info['approach']
+        }))
+    parts.append(('closing', {}))
+
+    requests = []
+    for part, values in parts:
+        request = {
+            'model': ARTICLE_MODEL,
+            'max_tokens': SECTION_MAX_TOKENS[part],
+            'system': build_system_prompt(SECTION_SYSTEM_PREFIX),
+            'messages': [
+                {
+                    "role": "user",
+                    "content": SECTION_TEMPLATES[part].substitute(context=context, **values)
+                }
+            ]
+        }
+        if PROMPT_CACHE_ENABLED:
+            request['extra_headers'] = PROMPT_CACHE_BETA_HEADER
+        requests.append(request)
+    return requests
+
+def build_section_rewrite_request(keyword, title, tone, tone_info, article, section, instructions=None):
+    """기존 글에서 한 섹션만 다시 쓰는 요청 인자 (section: article_sections.parse_sections의 항목)"""
+    marked_article = (
+        article[:section['start']] + SECTION_REWRITE_START + "\n" +
+        article[section['start']:section['end']] + "\n" + SECTION_REWRITE_END + article[section['end']:]
+    )
+    request = {
+        'model': ARTICLE_MODEL,
+        'max_tokens': SECTION_MAX_TOKENS['section' if section['level'] == 2 else 'subsection'],
+        'system': build_system_prompt(SECTION_REWRITE_SYSTEM_PREFIX),
+        'messages': [
+            {
+                "role": "user",
+                "content": SECTION_REWRITE_TEMPLATE.substitute(
+                    keyword=keyword,
+                    title=title,
+                    tone=tone,
+                    style=tone_info['style'],
+                    reader=tone_info['reader'],
+                    approach=tone_info['approach'],
+                    article=marked_article,
+                    heading=section['heading'],
+                    instructions=f"- 추가 요청: {instructions}\n" if instructions else ""
+                )
+            }
+        ]
+    }
+    if PROMPT_CACHE_ENABLED:
+        request['extra_headers'] = PROMPT_CACHE_BETA_HEADER
+    return request
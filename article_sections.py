@@ -0,0 +1,132 @@
+"""
+마크다운 글 섹션 모듈
+완성된 글을 H2/H3 제목 기준 섹션으로 나누고(앵커 포함),
+일부 섹션만 새 내용으로 바꿔 끼운 뒤 바뀐 바이트 범위를 계산합니다.
+"""
+
+import re
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t]*#*[ \t]*$', re.MULTILINE)
+SECTION_LEVELS = (2, 3)  # 재생성할 수 있는 섹션 수준 (다른 수준의 제목은 섹션 경계로만 사용)
+# 글 끝의 관련 키워드/태그 블록 줄 (빈 줄, "**관련 키워드:** ...", "#태그 #태그", 구분선)
+FOOTER_LINE_PATTERN = re.compile(
+    r'^[ \t]*(?:\**[ \t]*(?:관련[ \t]*키워드|추천[ \t]*태그|태그)[ \t]*:.*|(?:#[^\s#]+[ \t]*)+|-{3,}|\*{3,})?[ \t]*$'
+)
+CODE_FENCE_PATTERN = re.compile(r'^```.*?^```[ \t]*$', re.MULTILINE | re.DOTALL)
+
+def slugify(text):
+    """제목 텍스트를 앵커로 변환 (GitHub 방식: 소문자, 공백은 '-', 문장부호 제거, 한글 유지)"""
+    text = re.sub(r'[*_`~\[\]()]', '', text).strip().lower()
+    text = re.sub(r'[^\w\s-]', '', text)
+    return re.sub(r'\s', '-', text)
+
+def footer_start(markdown):
+    """글 끝의 관련 키워드/태그 블록 시작 위치 (없으면 글 길이)"""
+    start = len(markdown)
+    for line in reversed(markdown.splitlines(keepends=True)):
+        if not FOOTER_LINE_PATTERN.match(line.rstrip('\r\n')):
+            break
+        start -= len(line)
+    return start
+
+def parse_sections(markdown):
+    """H2/H3 섹션 목록 반환
+
+    각 섹션: {'anchor', 'level', 'heading', 'start', 'end'}
+    start/end는 문자 위치이며, 섹션은 제목 줄부터 같은 수준 이상(H1 포함)의 다음 제목 직전까지
+    (끝의 공백 제외)입니다. 글 끝의 관련 키워드/태그 블록은 어느 섹션에도 넣지 않으며,
+    코드 블록 안의 '#'은 제목으로 보지 않습니다.
+    """
+    fences = [(m.start(), m.end()) for m in CODE_FENCE_PATTERN.finditer(markdown)]
+    headings = [
+        m for m in HEADING_PATTERN.finditer(markdown)
+        if not any(start <= m.start() < end for start, end in fences)
+    ]
+
+    footer = footer_start(markdown)
+
+    sections = []
+    seen = {}
+    for i, match in enumerate(headings):
+        level = len(match.group(1))
+        if level not in SECTION_LEVELS:
+            continue
+        end = max(footer, match.end())
+        for following in headings[i + 1:]:
+            if len(following.group(1)) <= level:
+                end = following.start()
+                break
+        end = match.start() + len(markdown[match.start():end].rstrip())
+
+        anchor = slugify(match.group(2))
+        count = seen.get(anchor, 0)
+        seen[anchor] = count + 1
+        if count:
+            anchor = f"{anchor}-{count}"
+
+        sections.append({
+            'anchor': anchor,
+            'level': level,
+            'heading': match.group(2).strip(),
+            'start': match.start(),
+            'end': end
+        })
+    return sections
+
+def find_sections(sections, anchors):
+    """요청한 앵커(앵커, '#앵커' 또는 제목 텍스트)에 해당하는 섹션 목록과 찾지 못한 앵커 목록
+
+    선택한 섹션 안에 포함된 하위 섹션은 상위 섹션 재생성에 포함되므로 제외합니다.
+    """
+    selected = []
+    missing = []
+    for anchor in anchors:
+        key = str(anchor).strip().lstrip('#').strip()
+        section = next(
+            (s for s in sections if s['anchor'] == key or s['anchor'] == slugify(key) or s['heading'] == key),
+            None
+        )
+        if section is None:
+            missing.append(anchor)
+        elif section not in selected:
+            selected.append(section)
+
+    selected = [
+        section for section in selected
+        if not any(other is not section and other['start'] <= section['start'] and section['end'] <= other['end']
+                   for other in selected)
+    ]
+    return sorted(selected, key=lambda s: s['start']), missing
+
+def byte_offset(text, index):
+    return len(text[:index].encode('utf-8'))
+
+def splice_sections(markdown, replacements):
+    """섹션을 새 내용으로 바꾼 글과 바뀐 범위 목록 반환
+
+    replacements: [(섹션, 새 내용)] (섹션끼리 겹치지 않아야 함)
+    범위는 UTF-8 바이트 기준 [start, end) - original은 원래 글, updated는 새 글에서의 위치입니다.
+    """
+    parts = []
+    changes = []
+    position = 0
+    new_length = 0
+    for section, content in sorted(replacements, key=lambda r: r[0]['start']):
+        unchanged = markdown[position:section['start']]
+        parts.append(unchanged)
+        new_length += len(unchanged.encode('utf-8'))
+
+        content = content.strip()
+        content_bytes = len(content.encode('utf-8'))
+        changes.append({
+            'anchor': section['anchor'],
+            'heading': section['heading'],
+            'original': {'start': byte_offset(markdown, section['start']), 'end': byte_offset(markdown, section['end'])},
+            'updated': {'start': new_length, 'end': new_length + content_bytes}
+        })
+        parts.append(content)
+        new_length += content_bytes
+        position = section['end']
+
+    parts.append(markdown[position:])
+    return ''.join(parts), changes
@@ -0,0 +1,172 @@
+"""
+ASGI 서버 진입점
+긴 글 스트리밍(/api/generate-article-stream)과 스트림 재개(/api/generate-article-stream/<id>)는
+비동기 Claude 클라이언트로 이벤트 루프에서 직접 처리해서, 동시 스트림이 많아도
+스트림마다 스레드를 붙잡지 않습니다.
+나머지 API는 기존 Flask 앱을 그대로 사용합니다 (asgiref 스레드 풀에서 실행).
+
+실행: python asgi.py  또는  uvicorn asgi:application --host 0.0.0.0 --port $PORT
+"""
+
+import os
+import json
+import asyncio
+from urllib.parse import parse_qs
+from asgiref.wsgi import WsgiToAsgi
+from dotenv import load_dotenv
+from app import app, parse_article_stream_request, start_background_services, stream_status_event, ARTICLE_STREAM_HEADERS, ARTICLE_STREAM_GZIP_HEADERS
+from draft_writer import generate_article_stream_async
+from stream_buffer import article_streams, format_sse_event, parse_last_event_id, accepts_gzip, gzip_stream_async, StreamExpired, TooManyStreams, STREAM_RETRY_AFTER
+
+# 환경 변수 로드
+load_dotenv()
+
+# 요청 본문 최대 크기 (바이트) - 콘텐츠 기획 원문이 들어오므로 넉넉하게
+ASGI_MAX_BODY_BYTES = int(os.getenv('ASGI_MAX_BODY_BYTES', 2 * 1024 * 1024))
+
+flask_application = WsgiToAsgi(app)
+
+async def read_body(receive):
+    """요청 본문 전체 읽기 (최대 크기를 넘으면 None)"""
+    body = b''
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body += message.get('body', b'')
+        if len(body) > ASGI_MAX_BODY_BYTES:
+            return None
+        if not message.get('more_body'):
+            return body
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+async def send_json(send, status, payload, headers=()):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            (b'access-control-allow-origin', b'*'),
+            *headers
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def article_stream(scope, receive, send):
+    """글 생성 SSE 스트림 (비동기)"""
+    body = await read_body(receive)
+    if body is None:
+        return await send_json(send, 413, {'error': '요청 본문이 너무 큽니다'})
+
+    try:
+        data = json.loads(body or b'{}')
+    except ValueError:
+        return await send_json(send, 400, {'error': '잘못된 JSON 요청입니다'})
+
+    article, error_msg = parse_article_stream_request(data)
+    if error_msg:
+        return await send_json(send, 400, {'error': error_msg})
+    keyword, title, content_plan, tone, thumbnails, parallel = article
+
+    # 생성은 이벤트 루프 작업으로 끝까지 진행하고, 응답은 버퍼를 구독
+    try:
+        stream = article_streams.start_async(generate_article_stream_async(keyword, title, content_plan, tone, thumbnails, parallel))
+    except TooManyStreams as e:
+        print(f"[비동기 스트리밍 API] 스트림 시작 거절: {e}")
+        return await send_json(send, 503, {'error': str(e), 'retryAfter': STREAM_RETRY_AFTER},
+                               [(b'retry-after', str(STREAM_RETRY_AFTER).encode())])
+    print(f"[비동기 스트리밍 API] 스트림 {stream.id} 시작")
+    await send_stream(stream, 0, 'starting', scope, receive, send)
+
+async def resume_article_stream(scope, receive, send, stream_id):
+    """끊긴 글 스트림 이어받기 (Last-Event-ID 헤더 또는 lastEventId 쿼리 이후부터)"""
+    stream = article_streams.get(stream_id)
+    if stream is None:
+        return await send_json(send, 404, {'error': '스트림이 없거나 만료되었습니다'})
+
+    request_headers = dict(scope.get('headers') or [])
+    query = parse_qs(scope.get('query_string', b'').decode())
+    last_event_id = request_headers.get(b'last-event-id', b'').decode() or (query.get('lastEventId') or [None])[0]
+    last_seq = parse_last_event_id(last_event_id)
+    print(f"[비동기 스트리밍 API] 스트림 {stream_id} {last_seq}번 이후부터 재개")
+    await send_stream(stream, last_seq, 'resuming', scope, receive, send)
+
+async def stream_events(stream, last_seq, status):
+    """상태 이벤트 + 버퍼의 last_seq 이후 이벤트 (재개 불가 시 만료 이벤트로 종료)"""
+    yield stream_status_event(stream, status)
+    try:
+        async for chunk in stream.subscribe_async(last_seq):
+            yield chunk
+    except StreamExpired as e:
+        print(f"[비동기 스트리밍 API] 재개 불가: {e}")
+        yield format_sse_event({'content': '', 'error': str(e), 'expired': True, 'done': True})
+
+async def encode_events(events):
+    async for chunk in events:
+        yield chunk.encode('utf-8')
+
+async def send_stream(stream, last_seq, status, scope, receive, send):
+    """글 스트림 버퍼를 last_seq 이후부터 SSE로 전달 (연결이 끊겨도 생성은 계속됨)"""
+    headers = dict(ARTICLE_STREAM_HEADERS)
+    chunks = stream_events(stream, last_seq, status)
+    request_headers = dict(scope.get('headers') or [])
+    if accepts_gzip(request_headers.get(b'accept-encoding', b'').decode()):
+        body_chunks = gzip_stream_async(chunks)
+        headers.update(ARTICLE_STREAM_GZIP_HEADERS)
+    else:
+        body_chunks = encode_events(chunks)
+
+    response_headers = [(b'content-type', b'text/event-stream')]
+    response_headers += [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    await send({'type': 'http.response.start', 'status': 200, 'headers': response_headers})
+
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        async for body in body_chunks:
+            if disconnected.done():
+                print(f"[비동기 스트리밍 API] 스트림 {stream.id} 클라이언트 연결 종료 (생성은 계속)")
+                return
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+    finally:
+        await body_chunks.aclose()
+        disconnected.cancel()
+    await send({'type': 'http.response.body', 'body': b''})
+
+# 비동기로 직접 처리하는 라우트: (메서드, 경로) -> 핸들러
+ASYNC_ROUTES = {
+    ('POST', '/api/generate-article-stream'): article_stream
+}
+RESUME_PATH_PREFIX = '/api/generate-article-stream/'
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                start_background_services()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    if scope['type'] == 'http':
+        method, path = scope.get('method'), scope.get('path', '')
+        handler = ASYNC_ROUTES.get((method, path))
+        if handler is not None:
+            return await handler(scope, receive, send)
+        if method == 'GET' and path.startswith(RESUME_PATH_PREFIX) and '/' not in path[len(RESUME_PATH_PREFIX):]:
+            return await resume_article_stream(scope, receive, send, path[len(RESUME_PATH_PREFIX):])
+    return await flask_application(scope, receive, send)
+
+if __name__ == '__main__':
+    import uvicorn
+
+    port = int(os.environ.get('PORT', 3000))
+    print(f"[ASGI] Using port: {port}")
+    uvicorn.run(application, host='0.0.0.0', port=port, timeout_keep_alive=75)
@@ -0,0 +1,175 @@
+"""
+영구 캐시 백엔드 모듈
+서버 재시작(Railway 재배포 등) 후에도 업스트림 응답과 LLM 결과를 유지하기 위한
+캐시 저장소입니다. 기본 구현은 로컬 디스크의 SQLite이며, 공유 네트워크 저장소는
+CacheBackend 인터페이스를 구현해서 교체할 수 있습니다.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'sqlite')  # sqlite | none
+CACHE_SQLITE_PATH = os.getenv('CACHE_SQLITE_PATH', os.path.join('data', 'cache.sqlite3'))
+CACHE_SQLITE_MAX_BYTES = int(os.getenv('CACHE_SQLITE_MAX_BYTES', 256 * 1024 * 1024))
+
+def serialize_value(value):
+    """값을 압축된 JSON 바이트로 직렬화"""
+    raw = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return zlib.compress(raw, 6)
+
+def deserialize_value(blob):
+    """serialize_value로 저장한 바이트를 값으로 복원"""
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+class CacheBackend:
+    """영구 캐시 저장소 인터페이스"""
+
+    def get(self, namespace, key):
+        """(값, 만료 시각) 튜플 반환. 없거나 만료되었으면 None"""
+        raise NotImplementedError
+
+    def set(self, namespace, key, value, ttl):
+        raise NotImplementedError
+
+    def delete(self, namespace, key):
+        raise NotImplementedError
+
+    def stats(self):
+        return {}
+
+class NullCacheBackend(CacheBackend):
+    """영구 캐시를 사용하지 않을 때의 백엔드 (아무것도 저장하지 않음)"""
+
+    def get(self, namespace, key):
+        return None
+
+    def set(self, namespace, key, value, ttl):
+        pass
+
+    def delete(self, namespace, key):
+        pass
+
+class SQLiteCacheBackend(CacheBackend):
+    """로컬 디스크 SQLite 캐시 (TTL 만료 + 용량 기준 LRU 제거)"""
+
+    # 이 횟수만큼 저장할 때마다 용량 초과 여부를 확인
+    EVICT_CHECK_INTERVAL = 50
+
+    def __init__(self, path=CACHE_SQLITE_PATH, max_bytes=CACHE_SQLITE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)')
+        self._conn.commit()
+
+    def get(self, namespace, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?',
+                (namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+
+            blob, expires_at = row
+            if expires_at <= now:
+                self._conn.execute('DELETE FROM cache WHERE namespace = ? AND key = ?', (namespace, key))
+                self._conn.commit()
+                return None
+
+            self._conn.execute(
+                'UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?',
+                (now, namespace, key)
+            )
+            self._conn.commit()
+
+        return deserialize_value(blob), expires_at
+
+    def set(self, namespace, key, value, ttl):
+        blob = serialize_value(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (namespace, key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (namespace, key, sqlite3.Binary(blob), len(blob), now + ttl, now)
+            )
+            self._conn.commit()
+
+            self._writes += 1
+            if self._writes % self.EVICT_CHECK_INTERVAL == 0:
+                self._evict(now)
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._conn.execute('DELETE FROM cache WHERE namespace = ? AND key = ?', (namespace, key))
+            self._conn.commit()
+
+    def _evict(self, now):
+        """만료 항목 삭제 후, 용량 초과 시 가장 오래 사용하지 않은 항목부터 삭제"""
+        self._conn.execute('DELETE FROM cache WHERE expires_at <= ?', (now,))
+
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            rows = self._conn.execute('SELECT namespace, key, size FROM cache ORDER BY accessed_at').fetchall()
+            victims = []
+            for namespace, key, size in rows:
+                if excess <= 0:
+                    break
+                victims.append((namespace, key))
+                excess -= size
+            self._conn.executemany('DELETE FROM cache WHERE namespace = ? AND key = ?', victims)
+            print(f"[영구 캐시] 용량 초과로 {len(victims)}개 항목 제거")
+
+        self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            entries, total = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        return {
+            'backend': 'sqlite',
+            'path': self.path,
+            'entries': entries,
+            'bytes': total,
+            'maxBytes': self.max_bytes
+        }
+
+def create_cache_backend():
+    """환경 변수 설정에 맞는 영구 캐시 백엔드 생성"""
+    if CACHE_BACKEND == 'sqlite':
+        try:
+            backend = SQLiteCacheBackend()
+            print(f"[영구 캐시] SQLite 사용: {CACHE_SQLITE_PATH}")
+            return backend
+        except Exception as e:
+            print(f"[영구 캐시] SQLite 초기화 실패, 영구 캐시 없이 동작: {e}")
+    return NullCacheBackend()
@@ -0,0 +1,243 @@
+"""
+긴 글 이어쓰기 모듈
+Claude 응답이 max_tokens에 걸려 중간에 끊기거나(stop_reason == 'max_tokens')
+"[계속...]" 같은 금지 문구를 쓰면(guardrail) 그 지점까지 쓴 글의 끝부분을
+assistant 메시지로 미리 채워서 이어서 생성합니다.
+요청 전에 프롬프트/출력 토큰 수를 추정해서 호출당 max_tokens를 정하고,
+이어쓰기를 포함한 전체 출력 토큰은 설정한 상한 안에서만 사용합니다.
+"""
+
+import os
+import re
+from dotenv import load_dotenv
+from resilience import resilient_call, resilient_call_async
+from guardrail import StreamGuard, GUARDRAIL_ENABLED, GUARDRAIL_MAX_RETRIES
+
+# 환경 변수 로드
+load_dotenv()
+
+MODEL_CONTEXT_TOKENS = int(os.getenv('MODEL_CONTEXT_TOKENS', 200000))  # 입력 + 출력 최대 토큰
+MODEL_OUTPUT_TOKEN_LIMIT = int(os.getenv('MODEL_OUTPUT_TOKEN_LIMIT', 8192))  # 호출 한 번의 최대 출력 토큰
+ARTICLE_MAX_CONTINUATIONS = int(os.getenv('ARTICLE_MAX_CONTINUATIONS', 2))  # 이어쓰기 최대 횟수
+ARTICLE_OUTPUT_TOKEN_CAP = int(os.getenv('ARTICLE_OUTPUT_TOKEN_CAP', 20000))  # 이어쓰기 포함 전체 출력 토큰 상한
+ARTICLE_CONTINUATION_CONTEXT_CHARS = int(os.getenv('ARTICLE_CONTINUATION_CONTEXT_CHARS', 12000))  # 이어쓰기에 넘길 끝부분 길이 (글자)
+
+# 토큰 수 추정 (한글은 대략 글자당 1토큰, 그 외는 3.5글자당 1토큰)
+HANGUL_TOKENS_PER_CHAR = 1.0
+OTHER_CHARS_PER_TOKEN = 3.5
+HANGUL_PATTERN = re.compile(r'[가-힣]')
+
+def estimate_tokens(text):
+    hangul = len(HANGUL_PATTERN.findall(text))
+    return int(hangul * HANGUL_TOKENS_PER_CHAR + (len(text) - hangul) / OTHER_CHARS_PER_TOKEN) + 1
+
+def request_prompt_text(request):
+    """요청의 시스템 프롬프트와 메시지 텍스트"""
+    system = request.get('system') or ''
+    if isinstance(system, list):
+        system = '\n'.join(block.get('text', '') for block in system)
+    return system + '\n'.join(str(message['content']) for message in request['messages'])
+
+def budget_request(request, used_tokens=0):
+    """프롬프트 토큰을 추정해서 호출 max_tokens를 모델 한도/문맥 길이/전체 상한 안으로 맞춘 요청 반환"""
+    prompt_tokens = estimate_tokens(request_prompt_text(request))
+    max_tokens = min(
+        request['max_tokens'],
+        MODEL_OUTPUT_TOKEN_LIMIT,
+        MODEL_CONTEXT_TOKENS - prompt_tokens,
+        ARTICLE_OUTPUT_TOKEN_CAP - used_tokens
+    )
+    return {**request, 'max_tokens': max_tokens}, prompt_tokens
+
+def continuation_request(request, text, reminder=None):
+    """지금까지 쓴 글의 끝부분을 assistant 메시지로 미리 채운 이어쓰기 요청
+
+    assistant 메시지는 끝에 공백이 있으면 안 되므로 잘라내고, 이어지는 공백은 모델이 다시 씁니다.
+    reminder가 있으면 마지막 사용자 메시지 끝에 덧붙입니다.
+    """
+    tail = text[-ARTICLE_CONTINUATION_CONTEXT_CHARS:].rstrip()
+    messages = [message for message in request['messages'] if message['role'] != 'assistant']
+    if reminder:
+        messages[-1] = {**messages[-1], 'content': f"{messages[-1]['content']}\n\n{reminder}"}
+    return {**request, 'messages': messages + [{'role': 'assistant', 'content': tail}]}
+
+def guardrail_reminder(phrase):
+    return f'**주의: 이전 응답이 "{phrase}" 같은 중단 문구를 써서 잘렸습니다. 이런 문구나 확인 요청 없이 이어서 끝까지 작성하세요.**'
+
+class ContinuationState:
+    """이어쓰기 진행 상황 (호출 횟수, 사용한 출력 토큰, 끝까지 못 쓴 채 멈췄는지)
+
+    금지 문구 감시(guard)도 이어쓰기 전체에 하나만 두어서, 이어쓰기 경계에 걸친 문구도 감지합니다.
+    """
+
+    def __init__(self, label, request):
+        self.label = label
+        self.base_request = request
+        self.guard = StreamGuard() if GUARDRAIL_ENABLED else None
+        self.continuations = 0
+        self.guardrail_hits = 0
+        self.output_tokens = 0
+        self.truncated = False
+
+    def next_request(self, request, text, message):
+        """응답(message)이 잘렸으면 이어쓰기 요청, 끝났거나 더 이어쓸 수 없으면 None"""
+        self.output_tokens += message.usage.output_tokens
+        if message.stop_reason != 'max_tokens':
+            self.truncated = False
+            return None
+
+        self.truncated = True
+        if self.continuations >= ARTICLE_MAX_CONTINUATIONS or self.output_tokens >= ARTICLE_OUTPUT_TOKEN_CAP:
+            print(f"[이어쓰기] {self.label} 출력 한도 도달 (이어쓰기 {self.continuations}회, 출력 {self.output_tokens}토큰) - 잘린 채로 종료")
+            return None
+
+        self.continuations += 1
+        next_request, _ = budget_request(continuation_request(request, text), self.output_tokens)
+        print(f"[이어쓰기] {self.label} max_tokens에서 끊김 ({len(text):,}자), 이어쓰기 {self.continuations}/{ARTICLE_MAX_CONTINUATIONS}")
+        return next_request
+
+    def guardrail_request(self, text, phrase, output_tokens):
+        """금지 문구가 나온 지점(text 끝)부터 다시 이어쓰는 요청, 더 이어쓸 수 없으면 None"""
+        self.output_tokens += output_tokens
+        self.guardrail_hits += 1
+        self.truncated = True
+        if self.guardrail_hits > GUARDRAIL_MAX_RETRIES or self.output_tokens >= ARTICLE_OUTPUT_TOKEN_CAP:
+            print(f"[이어쓰기] {self.label} 금지 문구 '{phrase}' 반복 감지 - 그 앞에서 종료")
+            return None
+
+        self.continuations += 1
+        next_request, _ = budget_request(
+            continuation_request(self.base_request, text, guardrail_reminder(phrase)), self.output_tokens
+        )
+        print(f"[이어쓰기] {self.label} 금지 문구 '{phrase}' 감지 ({len(text):,}자 지점), 그 지점부터 이어쓰기")
+        return next_request
+
+    def to_dict(self):
+        return {'continuations': self.continuations, 'guardrailHits': self.guardrail_hits,
+                'outputTokens': self.output_tokens, 'truncated': self.truncated}
+
+def summarize_states(states):
+    """여러 부분(섹션)의 이어쓰기 통계 합계 (결과와 metadata 이벤트의 continuation 항목)"""
+    stats = [state.to_dict() for state in states]
+    return {
+        'continuations': sum(item['continuations'] for item in stats),
+        'guardrailHits': sum(item['guardrailHits'] for item in stats),
+        'outputTokens': sum(item['outputTokens'] for item in stats),
+        'truncated': any(item['truncated'] for item in stats)
+    }
+
+def feed_guard(state, chunk):
+    """금지 문구 검사 후 (지금 내보내도 되는 텍스트, 감지된 문구 또는 None)"""
+    if state.guard is None:
+        return chunk, None
+    return state.guard.feed(chunk)
+
+def written_text(state, text):
+    """모델이 지금까지 쓴 글 (내보낸 글 + 금지 문구의 앞부분일 수 있어 붙잡아 둔 글자). 이어쓰기는 여기서부터"""
+    return text + state.guard.pending if state.guard is not None else text
+
+def flush_guard(state):
+    """스트림이 완전히 끝났을 때 붙잡아 둔 글자"""
+    return state.guard.flush() if state.guard is not None else ''
+
+def join_continuation(text, chunk):
+    """이어쓴 조각 앞의 공백 정리 (앞 글이 공백으로 끝났으면 이어쓴 글의 시작 공백은 중복이므로 제거)"""
+    if text[-1:].isspace():
+        return chunk.lstrip()
+    return chunk
+
+def start_request(request, label):
+    """첫 요청 토큰 예산 계산"""
+    request, prompt_tokens = budget_request(request)
+    print(f"[이어쓰기] {label} 예상 프롬프트 {prompt_tokens:,}토큰, 호출당 출력 {request['max_tokens']:,}토큰 (전체 상한 {ARTICLE_OUTPUT_TOKEN_CAP:,})")
+    return request
+
+def create_with_continuation(client, request, label='글 생성'):
+    """messages.create + 잘리거나 금지 문구가 나오면 이어쓰기. (전체 텍스트, ContinuationState) 반환"""
+    state = ContinuationState(label, request)
+    request = start_request(request, label)
+    text = ''
+    while request is not None:
+        message = resilient_call('anthropic', client.messages.create, **request)
+        chunk = message.content[0].text if message.content else ''
+        if state.continuations:
+            chunk = join_continuation(written_text(state, text), chunk)
+        chunk, phrase = feed_guard(state, chunk)
+        text += chunk
+        if phrase is not None:
+            request = state.guardrail_request(text, phrase, message.usage.output_tokens)
+        else:
+            request = state.next_request(request, written_text(state, text), message)
+    return text + flush_guard(state), state
+
+def open_stream(client, request):
+    """스트림 연결 (첫 응답까지만 재시도 - 글자를 보내기 시작한 뒤에는 재시도하지 않음)"""
+    return resilient_call('anthropic', lambda: client.messages.stream(**request).__enter__())
+
+def stream_with_continuation(client, request, state=None, label='스트리밍 글 생성'):
+    """messages.stream + 잘리거나 금지 문구가 나오면 이어쓰기. 텍스트 조각을 차례대로 반환 (state에 진행 상황 기록)"""
+    state = state or ContinuationState(label, request)
+    request = start_request(request, state.label)
+    text = ''
+    while request is not None:
+        joining = state.continuations > 0
+        started_at = len(text)
+        phrase = None
+        stream = open_stream(client, request)
+        try:
+            for chunk in stream.text_stream:
+                if joining and chunk:
+                    chunk = join_continuation(written_text(state, text), chunk)
+                    joining = not chunk
+                # 금지 문구의 앞부분일 수 있는 글자는 guard가 잠시 붙잡아 둠 (이어쓰기 경계를 넘어서도 유지)
+                chunk, phrase = feed_guard(state, chunk)
+                if chunk:
+                    text += chunk
+                    yield chunk
+                if phrase is not None:
+                    break
+            else:
+                message = stream.get_final_message()
+        finally:
+            stream.close()
+        if phrase is not None:
+            request = state.guardrail_request(text, phrase, estimate_tokens(text[started_at:]))
+        else:
+            request = state.next_request(request, written_text(state, text), message)
+    held = flush_guard(state)
+    if held:
+        yield held
+
+async def stream_with_continuation_async(client, request, state=None, label='비동기 스트리밍 글 생성'):
+    """stream_with_continuation의 비동기 버전"""
+    state = state or ContinuationState(label, request)
+    request = start_request(request, state.label)
+    text = ''
+    while request is not None:
+        joining = state.continuations > 0
+        started_at = len(text)
+        phrase = None
+        stream = await resilient_call_async('anthropic', lambda: client.messages.stream(**request).__aenter__())
+        try:
+            async for chunk in stream.text_stream:
+                if joining and chunk:
+                    chunk = join_continuation(written_text(state, text), chunk)
+                    joining = not chunk
+                # 금지 문구의 앞부분일 수 있는 글자는 guard가 잠시 붙잡아 둠 (이어쓰기 경계를 넘어서도 유지)
+                chunk, phrase = feed_guard(state, chunk)
+                if chunk:
+                    text += chunk
+                    yield chunk
+                if phrase is not None:
+                    break
+            else:
+                message = await stream.get_final_message()
+        finally:
+            await stream.close()
+        if phrase is not None:
+            request = state.guardrail_request(text, phrase, estimate_tokens(text[started_at:]))
+        else:
+            request = state.next_request(request, written_text(state, text), message)
+    held = flush_guard(state)
+    if held:
+        yield held
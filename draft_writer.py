@@ -5,15 +5,18 @@ Claude API를 사용하여 고품질 콘텐츠를 생성합니다.
 실시간 스트리밍 기능 포함.
 """
 
-import anthropic
-import os
 from dotenv import load_dotenv
-import json
-import re
+from llm_clients import get_claude_client, get_async_claude_client
+from article_prompts import build_article_request, build_section_requests, build_section_rewrite_request, SECTION_REWRITE_START, SECTION_REWRITE_END
+from section_writer import split_content_plan, write_part, write_parts, part_states, stream_parts, stream_parts_async, section_executor, SECTION_PARALLEL_ENABLED
+from article_sections import parse_sections, find_sections, splice_sections
+from continuation import create_with_continuation, stream_with_continuation, stream_with_continuation_async, ContinuationState, summarize_states
+from article_metadata import ArticleMetadataTracker
+from keyword_extractor import extract_keywords, keyword_extractor
 
 # 환경 변수 로드
 load_dotenv()
-# Claude client는 함수 내부에서 각각 생성
+# Claude client는 llm_clients 레지스트리에서 공유
 
 def get_tone_writing_style(tone):
     """톤별 글쓰기 스타일 가이드 반환"""
@@ -51,30 +54,27 @@ def get_tone_writing_style(tone):
     }
     return tone_styles.get(tone, tone_styles['informative'])
 
+def format_source_content(content_plan):
+    """콘텐츠 기획 데이터를 프롬프트에 넣을 소스 정보 텍스트로 변환"""
+    if isinstance(content_plan, dict) and content_plan.get('type') == 'content_plan':
+        return content_plan.get('content', '')
+    if isinstance(content_plan, list):
+        # 기존 아웃라인 형식 처리
+        source_content = ""
+        for i, section in enumerate(content_plan, 1):
+            source_content += f"{i}. {section.get('title', '')}\n"
+            if section.get('subsections'):
+                for j, subsection in enumerate(section['subsections'], 1):
+                    source_content += f"  {i}.{j} {subsection}\n"
+        return source_content
+    return str(content_plan) if content_plan else ""
+
 def extract_related_keywords(content_plan, keyword):
-    """콘텐츠 기획에서 관련 키워드 추출"""
+    """콘텐츠 기획에서 관련 키워드 추출 (TF-IDF, 요청당 한 번만 계산해서 공유)"""
     try:
-        if not content_plan or not content_plan.get('content'):
-            return []
-        
-        content = content_plan['content']
-        # 간단한 키워드 추출 (실제로는 더 정교한 NLP 처리 가능)
-        keywords = []
-        
-        # 한글 단어 추출 (2-4글자)
-        words = re.findall(r'[가-힣]{2,4}', content)
-        word_freq = {}
-        
-        for word in words:
-            if word != keyword and len(word) >= 2:
-                word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # 빈도수 기준 상위 5개
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        keywords = [word for word, freq in sorted_words[:5] if freq >= 2]
-        
-        return keywords[:3]  # 최대 3개만
-    except:
+        return extract_keywords(format_source_content(content_plan), keyword)
+    except Exception as e:
+        print(f"[관련 키워드] 추출 실패: {e}")
         return []
 
 def generate_meta_description(title, keyword, content_preview):
@@ -86,187 +86,58 @@ def generate_meta_description(title, keyword, content_preview):
     except:
         return f"{keyword}에 대한 상세한 정보와 가이드를 제공합니다."
 
-def generate_full_article(keyword, title, content_plan, tone='informative', thumbnails=None):
-    """Claude API를 사용해서 전체 블로그 글을 생성"""
+def build_section_plan(keyword, title, content_plan, tone, related_keywords, parallel=None):
+    """섹션 병렬 생성 요청 목록 (병렬 모드가 아니거나 기획을 섹션으로 나눌 수 없으면 None)"""
+    if not (SECTION_PARALLEL_ENABLED if parallel is None else parallel):
+        return None
+    sections = split_content_plan(content_plan)
+    if not sections:
+        print("[섹션 병렬 생성] 기획을 섹션으로 나눌 수 없어 한 번에 생성")
+        return None
+    print(f"[섹션 병렬 생성] 섹션 {len(sections)}개: {[section['title'] for section in sections]}")
+    return build_section_requests(
+        keyword, title, tone, get_tone_writing_style(tone), sections, related_keywords
+    )
+
+def generate_full_article(keyword, title, content_plan, tone='informative', thumbnails=None, parallel=None):
+    """Claude API를 사용해서 전체 블로그 글을 생성 (parallel=True면 섹션별 동시 생성, None이면 기본 설정)"""
     try:
         print(f"[전체글 생성] Claude API로 키워드: '{keyword}', 제목: '{title}', 톤: '{tone}' 처리 시작")
         
-        # Claude API 키 확인
-        api_key = os.getenv('Claude_API_KEY')
-        if not api_key:
-            raise Exception("Claude API 키가 설정되지 않았습니다")
-        
-        print(f"[디버그] Claude API 키 확인: {'설정됨' if api_key else '없음'}")
         print(f"[디버그] Content Plan 타입: {type(content_plan)}")
         print(f"[디버그] Content Plan 내용: {str(content_plan)[:200]}...")
         
         tone_info = get_tone_writing_style(tone)
         
         # 콘텐츠 기획 데이터 처리
-        if isinstance(content_plan, dict) and content_plan.get('type') == 'content_plan':
-            source_content = content_plan.get('content', '')
-        elif isinstance(content_plan, list):
-            # 기존 아웃라인 형식 처리
-            source_content = ""
-            for i, section in enumerate(content_plan, 1):
-                source_content += f"{i}. {section.get('title', '')}\n"
-                if section.get('subsections'):
-                    for j, subsection in enumerate(section['subsections'], 1):
-                        source_content += f"  {i}.{j} {subsection}\n"
-        else:
-            source_content = str(content_plan) if content_plan else ""
+        source_content = format_source_content(content_plan)
         
         print(f"[디버그] 처리된 소스 콘텐츠 길이: {len(source_content)}")
         
         # 관련 키워드 추출
         related_keywords = extract_related_keywords(content_plan, keyword)
         
-        # Claude API 클라이언트 초기화 확인
+        # 공용 Claude 클라이언트 (API 키가 없으면 예외 발생)
         try:
-            claude_client = anthropic.Anthropic(api_key=api_key)
-            print("[디버그] Claude 클라이언트 초기화 성공")
+            claude_client = get_claude_client()
         except Exception as e:
             print(f"[디버그] Claude 클라이언트 초기화 실패: {e}")
             raise e
         
-        # 재시도 로직 추가
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                print(f"[디버그] Claude API 요청 시작 (시도 {attempt + 1}/{max_retries})")
-                response = claude_client.messages.create(
-                    model="claude-3-5-sonnet-20241022",
-                    max_tokens=8000,  # 토큰 수 증가
-                    messages=[
-                    {
-                        "role": "user",
-                        "content": f"""당신은 SEO 최적화와 사용자 친화적인 글쓰기 전문가입니다.
-
-**중요: 절대로 내용을 생략하지 말고 완전한 블로그 글을 작성해주세요. "[이하 생략]"이나 "[나머지 내용...]" 같은 표현은 절대 사용하지 마세요.**
-
-**절대 중단하지 마세요! 다음과 같은 표현들을 사용하지 마세요:**
-- "[계속해서 나머지 섹션들도 이어서 작성하시겠습니까?]"
-- "[이어서 작성할까요?]"
-- "[나머지 내용을 원하시면...]"
-- "[...더 자세한 내용이 필요하시면...]"
-- "[시간 관계상 여기서 마무리하겠습니다]"
-- "[다음 섹션으로 계속...]"
-- "[계속...]"
-- "[이어서...]"
-- "[...생략...]"
-- "[더 보기]"
-
-**반드시 완전한 글을 한 번에 끝까지 작성하세요. 중간에 멈추거나 확인을 요청하지 마세요.**
-
-**당신의 임무는 완전한 블로그 글을 작성하는 것입니다. 절대로 요약하거나 생략하지 말고, 모든 섹션을 완성된 형태로 작성하세요.**
-
-**이것은 요약이 아닌 완전한 블로그 글입니다. 각 주제를 깊이 있게 다루고, 독자가 완전히 이해할 수 있도록 자세히 설명해주세요.**
-
-**절대 요약하지 마세요! 다음과 같이 상세하게 작성해주세요:**
-- 각 H2 섹션은 반드시 800-1000자 분량으로 작성
-- 각 H3 하위 섹션도 300-400자 분량으로 상세 작성
-- 단순 나열이 아닌 완전한 문단으로 구성
-- 구체적인 예시, 경험담, 비교, 분석 포함
-- 독자의 궁금증을 완전히 해결하는 깊이 있는 설명
-- "입니다", "습니다" 같은 완전한 문장으로 작성
-
-**작성 조건:**
-- 키워드: "{keyword}"
-- 제목: "{title}"
-- 글의 톤/문체: {tone} ({tone_info['style']})
-- 독자 대상: {tone_info['reader']}
-
-**주어진 소스 정보:**
-{source_content}
-
-**글 작성 요구사항:**
-1. **완전한 글 작성**: 모든 내용을 빠짐없이 작성하고 생략하지 마세요
-2. **최소 5000자 이상**: 충분히 상세하고 깊이 있는 내용으로 작성
-3. **각 섹션 상세화**: 각 H2 섹션마다 최소 3-4개 문단으로 구성
-4. **구체적인 설명**: 단순 나열이 아닌 자세한 설명과 근거 제시
-5. **실전 경험**: 구체적인 사례, 경험담, 단계별 가이드 포함
-6. **SEO 최적화**: 키워드를 자연스럽게 본문에 5-8회 포함
-7. **가독성**: 쉽고 친근한 설명, 구체적 예시 사용
-8. **실용성**: 독자에게 실제로 도움이 되는 구체적인 정보 제공
-
-**구조 요구사항:**
-- H2(##), H3(###) 제목 구조 사용
-- 각 H2 섹션마다 충분한 설명 (최소 4-5문단, 400-600자)
-- 각 H3 하위 섹션도 2-3문단으로 상세 작성
-- 단순 나열이 아닌 스토리텔링과 구체적 설명
-- 실용적인 팁과 구체적인 정보 포함
-- 독자의 궁금증을 완전히 해결하는 깊이 있는 내용
-
-**반드시 포함할 내용:**
-- 소스에서 언급된 모든 주요 정보를 빠짐없이 상세히 설명
-- 각 항목별 구체적인 특징, 방법, 조건 등
-- 실용적인 팁과 주의사항
-
-**글쓰기 스타일:**
-- 각 문단은 최소 3-4문장으로 구성
-- 구체적인 수치, 데이터, 예시 포함
-- "왜 그런지", "어떻게 하는지" 상세한 설명
-- 독자의 궁금증을 해결하는 내용
-
-**글쓰기 스타일 가이드:**
-- 각 문단은 최소 3-4문장으로 구성
-- 구체적인 수치, 데이터, 예시 포함
-- "왜 그런지", "어떻게 하는지" 상세한 설명
-- 독자가 실제로 적용할 수 있는 구체적인 방법 제시
-- 비교, 분석, 경험담을 통한 깊이 있는 내용
-
-**글 끝 요소:**
-- 핵심 내용 요약
-- 행동 유도(CTA)
-- 관련 키워드: {', '.join(related_keywords) if related_keywords else keyword + ' 관련'}
-- 추천 태그 (#태그 형식 5-8개)
-
-**다시 강조: 절대로 "[이하 생략]", "[나머지 내용]", "..." 등으로 내용을 줄이지 말고, 모든 캠핑장과 정보를 완전히 작성해주세요.**
-
-{tone_info['approach']} 방식으로 완전한 글을 작성해주세요.
-
-**마지막 확인: 모든 섹션을 완성하고, 요약부터 태그까지 포함해서 완전한 블로그 글을 한 번에 끝까지 작성하세요. 절대로 중간에 멈추지 마세요.**
-
-**글 작성 완료 기준:**
-1. 모든 H2 섹션이 완성되어야 함
-2. 요약/결론 섹션 포함
-3. CTA(행동 유도) 포함  
-4. 관련 키워드 포함
-5. 추천 태그 포함
-6. 5000자 이상 분량 달성
-
-**이 모든 요소가 포함된 완전한 글을 지금 바로 작성하세요!**"""
-                    }
-                ]
-                )
-                print("[디버그] Claude API 응답 받음")
-                break  # 성공하면 루프 종료
-                
-            except anthropic.APIError as e:
-                print(f"[디버그] Claude API 오류 (시도 {attempt + 1}): {e}")
-                error_message = str(e)
-                
-                # Overloaded 오류인 경우 재시도
-                if "overloaded" in error_message.lower() and attempt < max_retries - 1:
-                    import time
-                    wait_time = (attempt + 1) * 2  # 2초, 4초, 6초 대기
-                    print(f"[디버그] 서버 과부하, {wait_time}초 후 재시도...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print(f"[디버그] 오류 타입: {type(e)}")
-                    print(f"[디버그] 오류 세부사항: {e.response.text if hasattr(e, 'response') else '응답 없음'}")
-                    raise e
-            except Exception as e:
-                print(f"[디버그] 일반 오류 (시도 {attempt + 1}): {e}")
-                if attempt == max_retries - 1:  # 마지막 시도에서도 실패
-                    raise e
-                else:
-                    import time
-                    time.sleep(2)  # 2초 대기 후 재시도
-                    continue
-        
-        article_content = response.content[0].text
+        section_requests = build_section_plan(keyword, title, content_plan, tone, related_keywords, parallel)
+        if section_requests:
+            # 서론/섹션/마무리를 동시에 생성해서 문서 순서대로 연결 (한 섹션이라도 잘렸으면 truncated)
+            article_content, states = write_parts(section_requests)
+        else:
+            # 고정 지시문(시스템 프롬프트) + 요청별 사용자 메시지
+            article_request = build_article_request('article', keyword, title, tone, tone_info, source_content, related_keywords)
+            
+            # 일시적 오류 재시도는 복원력 계층, max_tokens에서 끊기면 이어쓰기
+            print("[디버그] Claude API 요청 시작")
+            article_content, continuation = create_with_continuation(claude_client, article_request, '전체글 생성')
+            states = [continuation]
+            print(f"[디버그] Claude API 응답 받음 (이어쓰기 {continuation.continuations}회)")
+        continuation_stats = summarize_states(states)
         
         # 관련 키워드와 메타 디스크립션 생성
         content_preview = article_content[:200]
@@ -282,9 +153,14 @@ def generate_full_article(keyword, title, content_plan, tone='informative', thum
             'wordCount': len(article_content.replace(' ', '')),
             'relatedKeywords': related_keywords,
             'metaDescription': meta_description,
+            'truncated': continuation_stats['truncated'],
+            'continuation': continuation_stats,
             'source': 'claude'
         }
         
+        # 이후 키워드 추출의 문서 빈도 색인에 반영 (백그라운드)
+        keyword_extractor.index_document(article_content)
+        
         print(f"[전체글 생성] Claude API 완료 - 글자 수: {result['wordCount']:,}자")
         return result
         
@@ -304,246 +180,138 @@ def generate_full_article(keyword, title, content_plan, tone='informative', thum
             'source': 'claude_error'
         }
 
-def generate_article_stream(keyword, title, content_plan, tone='informative', thumbnails=None):
-    """Claude API를 사용해서 실시간 스트리밍으로 글 생성"""
+def build_stream_request(keyword, title, content_plan, tone, related_keywords):
+    """스트리밍 글 생성 요청 인자 (동기/비동기 스트리밍 공용)"""
+    tone_info = get_tone_writing_style(tone)
+    source_content = format_source_content(content_plan)
+    return build_article_request('article', keyword, title, tone, tone_info, source_content, related_keywords)
+
+def build_stream_metadata(keyword, title, content_plan, tone, thumbnails, related_keywords, tracker, continuations):
+    """스트림 마지막 metadata 이벤트 내용 (generate_full_article 결과에서 본문을 뺀 형식 + 누적 통계)"""
+    tracker.finish()
+    continuation_stats = summarize_states(continuations)
+    return {
+        'keyword': keyword,
+        'title': title,
+        'tone': tone,
+        'contentPlan': content_plan,
+        'thumbnails': thumbnails or [],
+        'relatedKeywords': related_keywords,
+        'metaDescription': generate_meta_description(title, keyword, tracker.preview),
+        'truncated': continuation_stats['truncated'],
+        'continuation': continuation_stats,
+        'source': 'claude',
+        **tracker.to_dict()
+    }
+
+def generate_article_stream(keyword, title, content_plan, tone='informative', thumbnails=None, parallel=None):
+    """Claude API를 사용해서 실시간 스트리밍으로 글 생성 (이벤트 데이터 dict를 차례대로 반환)"""
     try:
         print(f"[스트리밍 글 생성] Claude API로 키워드: '{keyword}', 제목: '{title}', 톤: '{tone}' 처리 시작")
         
-        # Claude API 키 확인
-        api_key = os.getenv('Claude_API_KEY')
-        if not api_key:
-            raise Exception("Claude API 키가 설정되지 않았습니다")
+        # 공용 Claude 클라이언트 (API 키가 없으면 예외 발생)
+        claude_client = get_claude_client()
         
-        claude_client = anthropic.Anthropic(api_key=api_key)
-        tone_info = get_tone_writing_style(tone)
+        # 글자 수/제목/키워드/태그는 조각이 지나갈 때 누적
+        related_keywords = extract_related_keywords(content_plan, keyword)
+        tracker = ArticleMetadataTracker(keyword, related_keywords)
         
-        # 콘텐츠 기획 데이터 처리 (generate_full_article과 동일)
-        if isinstance(content_plan, dict) and content_plan.get('type') == 'content_plan':
-            source_content = content_plan.get('content', '')
-        elif isinstance(content_plan, list):
-            source_content = ""
-            for i, section in enumerate(content_plan, 1):
-                source_content += f"{i}. {section.get('title', '')}\n"
-                if section.get('subsections'):
-                    for j, subsection in enumerate(section['subsections'], 1):
-                        source_content += f"  {i}.{j} {subsection}\n"
+        section_requests = build_section_plan(keyword, title, content_plan, tone, related_keywords, parallel)
+        if section_requests:
+            # 섹션을 동시에 생성하되 문서 순서대로 전달
+            continuations = part_states(section_requests)
+            chunks = stream_parts(section_requests, continuations)
         else:
-            source_content = str(content_plan) if content_plan else ""
+            # Claude API 스트리밍 요청 (고정 지시문은 프롬프트 캐시 재사용, max_tokens에서 끊기면 이어쓰기)
+            article_request = build_stream_request(keyword, title, content_plan, tone, related_keywords)
+            continuations = [ContinuationState('스트리밍 글 생성', article_request)]
+            chunks = stream_with_continuation(claude_client, article_request, continuations[0])
+        article_parts = []
+        for text in chunks:
+            tracker.feed(text)
+            article_parts.append(text)
+            # 이벤트 데이터 반환 (SSE 직렬화는 stream_buffer에서)
+            yield {'content': text, 'done': False}
+        keyword_extractor.index_document(''.join(article_parts))
+        
+        # 메타 정보 (전체 글을 다시 읽지 않고 누적값으로 생성) 후 완료 신호
+        metadata = build_stream_metadata(
+            keyword, title, content_plan, tone, thumbnails, related_keywords, tracker, continuations
+        )
+        yield {'content': '', 'done': False, 'metadata': metadata}
+        yield {'content': '', 'done': True}
+        print(f"[스트리밍 글 생성] Claude API 완료")
+        
+    except Exception as e:
+        print(f"[스트리밍 글 생성] Claude API 오류: {e}")
+        error_data = {
+            'content': f"\n\n⚠️ 글 생성 중 오류가 발생했습니다: {str(e)}",
+            'done': True,
+            'error': str(e)
+        }
+        yield error_data
+
+async def generate_article_stream_async(keyword, title, content_plan, tone='informative', thumbnails=None, parallel=None):
+    """generate_article_stream의 비동기 버전 (ASGI 모드에서 스레드 없이 스트리밍)"""
+    try:
+        print(f"[비동기 스트리밍 글 생성] 키워드: '{keyword}', 제목: '{title}', 톤: '{tone}' 처리 시작")
         
+        claude_client = get_async_claude_client()
         related_keywords = extract_related_keywords(content_plan, keyword)
+        tracker = ArticleMetadataTracker(keyword, related_keywords)
         
-        # Claude API 스트리밍 요청
-        with claude_client.messages.stream(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=8000,  # 토큰 수 증가
-            messages=[
-                {
-                    "role": "user", 
-                    "content": f"""당신은 SEO 최적화와 사용자 친화적인 글쓰기 전문가입니다.
-
-**중요: 절대로 내용을 생략하지 말고 완전한 블로그 글을 작성해주세요. "[이하 생략]"이나 "[나머지 내용...]" 같은 표현은 절대 사용하지 마세요.**
-
-**절대 중단하지 마세요! 다음과 같은 표현들을 사용하지 마세요:**
-- "[계속해서 나머지 섹션들도 이어서 작성하시겠습니까?]"
-- "[이어서 작성할까요?]"
-- "[나머지 내용을 원하시면...]"
-- "[...더 자세한 내용이 필요하시면...]"
-- "[시간 관계상 여기서 마무리하겠습니다]"
-- "[다음 섹션으로 계속...]"
-- "[계속...]"
-- "[이어서...]"
-- "[...생략...]"
-- "[더 보기]"
-
-**반드시 완전한 글을 한 번에 끝까지 작성하세요. 중간에 멈추거나 확인을 요청하지 마세요.**
-
-**당신의 임무는 완전한 블로그 글을 작성하는 것입니다. 절대로 요약하거나 생략하지 말고, 모든 섹션을 완성된 형태로 작성하세요.**
-
-**이것은 요약이 아닌 완전한 블로그 글입니다. 각 주제를 깊이 있게 다루고, 독자가 완전히 이해할 수 있도록 자세히 설명해주세요.**
-
-**절대 요약하지 마세요! 다음과 같이 상세하게 작성해주세요:**
-- 각 H2 섹션은 반드시 800-1000자 분량으로 작성
-- 각 H3 하위 섹션도 300-400자 분량으로 상세 작성
-- 단순 나열이 아닌 완전한 문단으로 구성
-- 구체적인 예시, 경험담, 비교, 분석 포함
-- 독자의 궁금증을 완전히 해결하는 깊이 있는 설명
-- "입니다", "습니다" 같은 완전한 문장으로 작성
-
-**작성 조건:**
-- 키워드: "{keyword}"
-- 제목: "{title}"
-- 글의 톤/문체: {tone} ({tone_info['style']})
-- 독자 대상: {tone_info['reader']}
-
-**주어진 소스 정보:**
-{source_content}
-
-**글 작성 요구사항:**
-1. **완전한 글 작성**: 모든 내용을 빠짐없이 작성하고 생략하지 마세요
-2. **최소 5000자 이상**: 충분히 상세하고 깊이 있는 내용으로 작성
-3. **각 섹션 상세화**: 각 H2 섹션마다 최소 3-4개 문단으로 구성
-4. **구체적인 설명**: 단순 나열이 아닌 자세한 설명과 근거 제시
-5. **실전 경험**: 구체적인 사례, 경험담, 단계별 가이드 포함
-6. **SEO 최적화**: 키워드 자연스럽게 포함, H2/H3 제목 구조
-7. **실용성**: 독자에게 실제로 도움이 되는 구체적인 정보 제공
-
-**반드시 포함할 내용:**
-- 소스에서 언급된 모든 주요 정보를 빠짐없이 상세히 설명
-- 각 항목별 구체적인 특징, 방법, 조건 등
-- 실용적인 팁과 주의사항
-
-**글쓰기 스타일:**
-- 각 문단은 최소 3-4문장으로 구성
-- 구체적인 수치, 데이터, 예시 포함
-- "왜 그런지", "어떻게 하는지" 상세한 설명
-
-**글 끝 요소:**
-- 요약, CTA, 관련키워드({', '.join(related_keywords) if related_keywords else keyword}), 추천태그 포함
-
-**다시 강조: 절대로 생략하지 말고 완전한 글을 작성해주세요.**
-
-{tone_info['approach']} 방식으로 작성해주세요.
-
-**마지막 확인: 모든 섹션을 완성하고, 요약부터 태그까지 포함해서 완전한 블로그 글을 한 번에 끝까지 작성하세요. 절대로 중간에 멈추지 마세요.**
-
-**글 작성 완료 기준:**
-1. 모든 H2 섹션이 완성되어야 함
-2. 요약/결론 섹션 포함
-3. CTA(행동 유도) 포함  
-4. 관련 키워드 포함
-5. 추천 태그 포함
-6. 5000자 이상 분량 달성
-
-**이 모든 요소가 포함된 완전한 글을 지금 바로 작성하세요!**"""
-                }
-            ]
-        ) as stream:
-            for text in stream.text_stream:
-                # JSON 형태로 스트리밍 데이터 반환
-                yield f"data: {json.dumps({'content': text, 'done': False})}\n\n"
-        
-        # 완료 신호
-        yield f"data: {json.dumps({'content': '', 'done': True})}\n\n"
-        print(f"[스트리밍 글 생성] Claude API 완료")
+        section_requests = build_section_plan(keyword, title, content_plan, tone, related_keywords, parallel)
+        if section_requests:
+            continuations = part_states(section_requests)
+            chunks = stream_parts_async(section_requests, continuations)
+        else:
+            article_request = build_stream_request(keyword, title, content_plan, tone, related_keywords)
+            continuations = [ContinuationState('비동기 스트리밍 글 생성', article_request)]
+            chunks = stream_with_continuation_async(claude_client, article_request, continuations[0])
+        article_parts = []
+        async for text in chunks:
+            tracker.feed(text)
+            article_parts.append(text)
+            yield {'content': text, 'done': False}
+        keyword_extractor.index_document(''.join(article_parts))
+        
+        # 메타 정보 후 완료 신호
+        metadata = build_stream_metadata(
+            keyword, title, content_plan, tone, thumbnails, related_keywords, tracker, continuations
+        )
+        yield {'content': '', 'done': False, 'metadata': metadata}
+        yield {'content': '', 'done': True}
+        print(f"[비동기 스트리밍 글 생성] Claude API 완료")
         
     except Exception as e:
-        print(f"[스트리밍 글 생성] Claude API 오류: {e}")
+        print(f"[비동기 스트리밍 글 생성] Claude API 오류: {e}")
         error_data = {
             'content': f"\n\n⚠️ 글 생성 중 오류가 발생했습니다: {str(e)}",
             'done': True,
             'error': str(e)
         }
-        yield f"data: {json.dumps(error_data)}\n\n"
+        yield error_data
 
 def regenerate_article(keyword, title, content_plan, tone='informative', thumbnails=None):
     """글을 다시 생성 (다른 접근 방식으로)"""
     try:
         print(f"[글 재생성] Claude API로 키워드: '{keyword}', 제목: '{title}' 처리")
         
-        # Claude API 키 확인
-        api_key = os.getenv('Claude_API_KEY')
-        if not api_key:
-            raise Exception("Claude API 키가 설정되지 않았습니다")
-        
-        claude_client = anthropic.Anthropic(api_key=api_key)
+        # 공용 Claude 클라이언트 (API 키가 없으면 예외 발생)
+        claude_client = get_claude_client()
         tone_info = get_tone_writing_style(tone)
         
         # 콘텐츠 기획 데이터 처리
-        if isinstance(content_plan, dict) and content_plan.get('type') == 'content_plan':
-            source_content = content_plan.get('content', '')
-        elif isinstance(content_plan, list):
-            source_content = ""
-            for i, section in enumerate(content_plan, 1):
-                source_content += f"{i}. {section.get('title', '')}\n"
-                if section.get('subsections'):
-                    for j, subsection in enumerate(section['subsections'], 1):
-                        source_content += f"  {i}.{j} {subsection}\n"
-        else:
-            source_content = str(content_plan) if content_plan else ""
+        source_content = format_source_content(content_plan)
         
         related_keywords = extract_related_keywords(content_plan, keyword)
         
-        response = claude_client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=8000,  # 토큰 수 증가
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"""당신은 SEO 최적화와 사용자 친화적인 글쓰기 전문가입니다. 이전과는 다른 새로운 접근 방식으로 글을 작성해주세요.
-
-**중요: 절대로 내용을 생략하지 말고 완전한 블로그 글을 작성해주세요. "[이하 생략]"이나 "[나머지 내용...]" 같은 표현은 절대 사용하지 마세요.**
-
-**절대 중단하지 마세요! 다음과 같은 표현들을 사용하지 마세요:**
-- "[계속해서 나머지 섹션들도 이어서 작성하시겠습니까?]"
-- "[이어서 작성할까요?]"
-- "[나머지 내용을 원하시면...]"
-- "[...더 자세한 내용이 필요하시면...]"
-- "[시간 관계상 여기서 마무리하겠습니다]"
-- "[다음 섹션으로 계속...]"
-- "[계속...]"
-- "[이어서...]"
-- "[...생략...]"
-- "[더 보기]"
-
-**반드시 완전한 글을 한 번에 끝까지 작성하세요. 중간에 멈추거나 확인을 요청하지 마세요.**
-
-**당신의 임무는 완전한 블로그 글을 작성하는 것입니다. 절대로 요약하거나 생략하지 말고, 모든 섹션을 완성된 형태로 작성하세요.**
-
-**이것은 요약이 아닌 완전한 블로그 글입니다. 각 주제를 깊이 있게 다루고, 독자가 완전히 이해할 수 있도록 자세히 설명해주세요.**
-
-**절대 요약하지 마세요! 다음과 같이 상세하게 작성해주세요:**
-- 각 H2 섹션은 반드시 800-1000자 분량으로 작성
-- 각 H3 하위 섹션도 300-400자 분량으로 상세 작성
-- 단순 나열이 아닌 완전한 문단으로 구성
-- 구체적인 예시, 경험담, 비교, 분석 포함
-- 독자의 궁금증을 완전히 해결하는 깊이 있는 설명
-- "입니다", "습니다" 같은 완전한 문장으로 작성
-
-**작성 조건:**
-- 키워드: "{keyword}"
-- 제목: "{title}"
-- 글의 톤/문체: {tone} ({tone_info['style']})
-- 독자 대상: {tone_info['reader']}
-
-**주어진 소스 정보:**
-{source_content}
-
-**재생성 요구사항:**
-1. **완전한 글 작성**: 모든 내용을 빠짐없이 작성하고 생략하지 마세요
-2. **새로운 구성**: 이전과 다른 관점이나 구조로 접근
-3. **창의적 표현**: 다른 예시, 비유, 설명 방식 사용  
-4. **차별화된 내용**: 같은 정보라도 완전히 다른 방식으로 풀어내기
-5. **최소 5000자 이상**: 충분히 상세하고 깊이 있는 내용으로 작성
-6. **각 섹션 상세화**: 각 H2 섹션마다 최소 3-4개 문단으로 구성
-7. **구체적인 설명**: 단순 나열이 아닌 자세한 설명과 근거 제시
-
-**반드시 포함할 내용:**
-- 소스에서 언급된 모든 주요 정보를 빠짐없이 상세히 설명
-- 각 항목별 구체적인 특징, 방법, 조건 등
-
-**글 끝 요소**: 요약, CTA, 관련키워드({', '.join(related_keywords) if related_keywords else keyword}), 추천태그
-
-**다시 강조: 절대로 생략하지 말고 완전한 새로운 글을 작성해주세요.**
-
-{tone_info['approach']} 방식으로 이전과는 완전히 다른 새로운 글을 작성해주세요.
-
-**마지막 확인: 모든 섹션을 완성하고, 요약부터 태그까지 포함해서 완전한 블로그 글을 한 번에 끝까지 작성하세요. 절대로 중간에 멈추지 마세요.**
-
-**글 작성 완료 기준:**
-1. 모든 H2 섹션이 완성되어야 함
-2. 요약/결론 섹션 포함
-3. CTA(행동 유도) 포함  
-4. 관련 키워드 포함
-5. 추천 태그 포함
-6. 5000자 이상 분량 달성
-
-**이 모든 요소가 포함된 완전한 글을 지금 바로 작성하세요!**"""
-                }
-            ]
+        article_content, continuation = create_with_continuation(
+            claude_client,
+            build_article_request('regenerate', keyword, title, tone, tone_info, source_content, related_keywords),
+            '글 재생성'
         )
         
-        article_content = response.content[0].text
-        
         # 메타 정보 생성
         content_preview = article_content[:200]
         meta_description = generate_meta_description(title, keyword, content_preview)
@@ -558,9 +326,13 @@ def regenerate_article(keyword, title, content_plan, tone='informative', thumbna
             'wordCount': len(article_content.replace(' ', '')),
             'relatedKeywords': related_keywords,
             'metaDescription': meta_description,
+            'truncated': continuation.truncated,
+            'continuation': continuation.to_dict(),
             'source': 'claude_regenerated'
         }
         
+        keyword_extractor.index_document(article_content)
+        
         print(f"[글 재생성] Claude API 완료 - 글자 수: {result['wordCount']:,}자")
         return result
         
@@ -579,3 +351,64 @@ def regenerate_article(keyword, title, content_plan, tone='informative', thumbna
             'error': str(e),
             'source': 'claude_regenerated_error'
         }
+
+def normalize_rewritten_section(section, content):
+    """재작성된 섹션에서 표시 문자열을 지우고, 제목 줄이 없으면 원래 제목을 붙임"""
+    content = content.replace(SECTION_REWRITE_START, '').replace(SECTION_REWRITE_END, '').strip()
+    heading_line = f"{'#' * section['level']} {section['heading']}"
+    if not content.startswith('#' * section['level'] + ' '):
+        content = f"{heading_line}\n\n{content}"
+    return content
+
+def regenerate_sections(keyword, title, article, sections, tone='informative', instructions=None):
+    """기존 글에서 선택한 H2/H3 섹션(앵커 목록)만 동시에 다시 쓰고 원래 위치에 끼워 넣음
+
+    나머지 글은 그대로 두고 문맥으로만 사용하며, 결과의 changes에 바뀐 UTF-8 바이트 범위를 담습니다.
+    """
+    try:
+        print(f"[섹션 재생성] 키워드: '{keyword}', 제목: '{title}', 섹션: {sections}")
+        
+        selected, missing = find_sections(parse_sections(article), sections)
+        if missing:
+            raise ValueError(f"글에 없는 섹션: {', '.join(map(str, missing))}")
+        
+        tone_info = get_tone_writing_style(tone)
+        futures = [
+            section_executor.submit(
+                write_part, build_section_rewrite_request(keyword, title, tone, tone_info, article, section, instructions)
+            )
+            for section in selected
+        ]
+        parts = [future.result() for future in futures]
+        replacements = [(section, normalize_rewritten_section(section, text)) for section, (text, _) in zip(selected, parts)]
+        content, changes = splice_sections(article, replacements)
+        
+        result = {
+            'keyword': keyword,
+            'title': title,
+            'tone': tone,
+            'content': content,
+            'regeneratedSections': [section['anchor'] for section in selected],
+            'changes': changes,
+            'wordCount': len(content.replace(' ', '')),
+            'truncated': any(state.truncated for _, state in parts),
+            'continuation': summarize_states([state for _, state in parts]),
+            'source': 'claude_section_regenerated'
+        }
+        
+        print(f"[섹션 재생성] Claude API 완료 - 섹션 {len(selected)}개, 글자 수: {result['wordCount']:,}자")
+        return result
+        
+    except Exception as e:
+        print(f"[섹션 재생성] 오류: {e}")
+        return {
+            'keyword': keyword,
+            'title': title,
+            'tone': tone,
+            'content': article,
+            'regeneratedSections': [],
+            'changes': [],
+            'wordCount': len(article.replace(' ', '')),
+            'error': str(e),
+            'source': 'claude_section_regenerated_error'
+        }
@@ -0,0 +1,125 @@
+"""
+스트리밍 금지 문구 감지 모듈
+글 생성 프롬프트에서 금지한 "[이하 생략]", "[계속...]", "[이어서 작성할까요?]" 같은 중단 문구를
+Aho–Corasick 오토마톤으로 출력 스트림에서 바로 찾아냅니다.
+조각마다 새로 들어온 글자만 한 번씩 보므로 추가 비용은 글자 수에 비례하고 매우 작습니다.
+아직 금지 문구의 앞부분일 수 있는 글자만 잠시 붙잡아 두어서, 문구가 나오면
+사용자에게 보내기 전에 그 지점에서 잘라낼 수 있습니다.
+"""
+
+import os
+from collections import deque
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+GUARDRAIL_ENABLED = os.getenv('GUARDRAIL_ENABLED', 'true').lower() == 'true'
+GUARDRAIL_MAX_RETRIES = int(os.getenv('GUARDRAIL_MAX_RETRIES', 2))  # 금지 문구 감지 후 이어쓰기 최대 횟수
+
+# 감지할 문구 (article_prompts의 금지 표현 목록에서 변형까지 잡도록 앞부분만 사용)
+FORBIDDEN_PHRASES = [
+    "[이하 생략",
+    "[생략",
+    "[...생략",
+    "[나머지 내용",
+    "[나머지 섹션",
+    "[계속",
+    "[이어서",
+    "[...더 자세한 내용",
+    "[더 자세한 내용이 필요하시면",
+    "[시간 관계상",
+    "[다음 섹션으로",
+    "[더 보기",
+    "이어서 작성할까요?",
+    "이어서 작성하시겠습니까?",
+    "계속 작성할까요?",
+    "계속 작성하시겠습니까?"
+]
+
+class PhraseMatcher:
+    """Aho–Corasick 오토마톤 (상태 0이 루트, 상태마다 전이/실패 링크/깊이/일치 문구)"""
+
+    def __init__(self, phrases):
+        self._goto = [{}]
+        self._fail = [0]
+        self._depth = [0]
+        self._outputs = [()]  # 이 상태에서 끝나는 문구들 (자기 문구 먼저, 실패 링크로 이어진 상태의 문구 포함)
+
+        for phrase in phrases:
+            state = 0
+            for char in phrase:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._depth.append(self._depth[state] + 1)
+                    self._outputs.append(())
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._outputs[state] = (phrase,)
+
+        # 너비 우선으로 실패 링크 계산 (루트 바로 아래 상태는 루트로)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                if state:
+                    self._fail[next_state] = self.step(self._fail[state], char)
+                self._outputs[next_state] += self._outputs[self._fail[next_state]]
+
+    def step(self, state, char):
+        while state and char not in self._goto[state]:
+            state = self._fail[state]
+        return self._goto[state].get(char, 0)
+
+    def output(self, state):
+        """이 상태에서 끝나는 가장 긴 문구 (없으면 None)"""
+        outputs = self._outputs[state]
+        return outputs[0] if outputs else None
+
+    def outputs(self, state):
+        return self._outputs[state]
+
+    def depth(self, state):
+        return self._depth[state]
+
+phrase_matcher = PhraseMatcher(FORBIDDEN_PHRASES)
+
+class StreamGuard:
+    """출력 스트림 하나의 금지 문구 감시 상태"""
+
+    def __init__(self, matcher=phrase_matcher):
+        self.matcher = matcher
+        self._state = 0
+        self._held = ''  # 금지 문구의 앞부분일 수 있어 아직 내보내지 않은 글자
+
+    def feed(self, chunk):
+        """새 조각을 검사해서 (지금 내보내도 되는 텍스트, 감지된 문구 또는 None) 반환
+
+        문구가 감지되면 문구 앞까지만 반환하고, 이후 텍스트는 버립니다.
+        """
+        text = self._held + chunk
+        offset = len(self._held)
+        for i, char in enumerate(chunk):
+            self._state = self.matcher.step(self._state, char)
+            phrase = self.matcher.output(self._state)
+            if phrase is not None:
+                self._held = ''
+                self._state = 0
+                return text[:offset + i + 1 - len(phrase)], phrase
+
+        # 현재 상태의 깊이 = 금지 문구의 앞부분과 일치하는 끝부분 길이
+        keep = self.matcher.depth(self._state)
+        self._held = text[len(text) - keep:] if keep else ''
+        return text[:len(text) - keep], None
+
+    @property
+    def pending(self):
+        """붙잡아 두고 아직 내보내지 않은 글자"""
+        return self._held
+
+    def flush(self):
+        """스트림이 끝났을 때 붙잡아 둔 글자 반환"""
+        held, self._held, self._state = self._held, '', 0
+        return held
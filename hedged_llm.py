@@ -0,0 +1,201 @@
+"""
+짧은 LLM 호출 헤징 모듈
+제목/썸네일/롱테일 키워드처럼 짧고 지연에 민감한 OpenAI 호출에 사용합니다.
+- 헤징: 첫 요청이 시작된 뒤 최근 응답 시간의 백분위(기본 p95) 안에 끝나지 않으면
+  같은 요청을 한 번 더 보내고 먼저 끝난 응답을 사용
+- 헤지는 전체 호출의 일부(기본 5%)만 예산으로 허용하고, 작업 스레드가 모두 바쁘거나
+  OpenAI 서킷이 닫혀 있지 않으면 보내지 않음 (과부하를 키우지 않도록)
+- 대체 공급자: OpenAI가 실패하면(서킷 열림 포함) 설정된 공급자(기본 Claude)로 한 번 더 요청
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dotenv import load_dotenv
+from llm_clients import get_openai_client, get_claude_client
+from resilience import resilience, resilient_call, RetryBudget, CIRCUIT_CLOSED
+
+# 환경 변수 로드
+load_dotenv()
+
+LLM_HEDGE_ENABLED = os.getenv('LLM_HEDGE_ENABLED', 'true').lower() == 'true'
+LLM_HEDGE_PERCENTILE = float(os.getenv('LLM_HEDGE_PERCENTILE', 95))  # 이 백분위 응답 시간이 지나면 두 번째 요청
+LLM_HEDGE_MIN_DELAY = float(os.getenv('LLM_HEDGE_MIN_DELAY', 0.3))  # 헤지 대기 시간 하한 (초)
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv('LLM_HEDGE_DEFAULT_DELAY', 2))  # 표본이 모이기 전 헤지 대기 시간 (초)
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv('LLM_HEDGE_MIN_SAMPLES', 20))
+LLM_HEDGE_WINDOW = int(os.getenv('LLM_HEDGE_WINDOW', 200))  # 백분위 계산에 쓰는 최근 응답 수
+LLM_HEDGE_MAX_WORKERS = int(os.getenv('LLM_HEDGE_MAX_WORKERS', 16))
+# 헤지 예산 - 호출 1건마다 LLM_HEDGE_BUDGET_RATIO만큼 적립, 헤지 1회에 1 사용
+LLM_HEDGE_BUDGET_RATIO = float(os.getenv('LLM_HEDGE_BUDGET_RATIO', 0.05))
+LLM_HEDGE_BUDGET_MAX = float(os.getenv('LLM_HEDGE_BUDGET_MAX', 3))
+
+# 대체 공급자 ('' 이면 사용 안 함)
+LLM_FALLBACK_PROVIDER = os.getenv('LLM_FALLBACK_PROVIDER', 'anthropic')
+LLM_FALLBACK_MODEL = os.getenv('LLM_FALLBACK_MODEL', 'claude-3-5-haiku-20241022')
+
+class LatencyTracker:
+    """모델별 최근 응답 시간으로 헤지 대기 시간 계산"""
+
+    def __init__(self, window=LLM_HEDGE_WINDOW):
+        self.window = window
+        self._samples = {}  # 모델 -> 최근 응답 시간(초)
+        self._lock = threading.Lock()
+
+    def record(self, model, seconds):
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def hedge_delay(self, model):
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if len(samples) < LLM_HEDGE_MIN_SAMPLES:
+            return LLM_HEDGE_DEFAULT_DELAY
+        index = min(len(samples) - 1, int(len(samples) * LLM_HEDGE_PERCENTILE / 100))
+        return max(LLM_HEDGE_MIN_DELAY, samples[index])
+
+    def stats(self):
+        with self._lock:
+            models = list(self._samples)
+        result = {}
+        for model in models:
+            with self._lock:
+                samples = sorted(self._samples[model])
+            result[model] = {
+                'samples': len(samples),
+                'p50': round(samples[len(samples) // 2], 3),
+                'hedgeDelay': round(self.hedge_delay(model), 3)
+            }
+        return result
+
+class HedgedLLM:
+    """헤징과 대체 공급자를 적용한 짧은 OpenAI 채팅 호출"""
+
+    def __init__(self, max_workers=LLM_HEDGE_MAX_WORKERS):
+        self.latency = LatencyTracker()
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='llm-hedge')
+        self._budget = RetryBudget(ratio=LLM_HEDGE_BUDGET_RATIO, min_per_sec=0, max_tokens=LLM_HEDGE_BUDGET_MAX)
+        self._lock = threading.Lock()
+        self._in_flight = 0  # 제출했지만 끝나지 않은 요청 수 (대기 중 포함)
+        self._stats = {'calls': 0, 'hedged': 0, 'hedgeWins': 0, 'hedgeSkipped': 0, 'fallbacks': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _submit(self, *attempt):
+        with self._lock:
+            self._in_flight += 1
+        future = self._executor.submit(*attempt)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _can_hedge(self):
+        """헤지를 보내도 되는지 (남는 작업 스레드, 닫힌 OpenAI 서킷, 남은 헤지 예산)"""
+        with self._lock:
+            saturated = self._in_flight >= self.max_workers
+        if saturated or resilience.circuit_state('openai') != CIRCUIT_CLOSED:
+            return False
+        return self._budget.withdraw()
+
+    def _openai_attempt(self, model, messages, temperature, max_tokens, started=None):
+        started_at = time.monotonic()
+        if started is not None:
+            started.set()
+        try:
+            response = resilient_call(
+                'openai', get_openai_client().chat.completions.create,
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        except Exception as e:
+            # 응답을 기다리다 끝난 타임아웃만 기록 (서킷 열림/4xx처럼 바로 끝난 실패는 백분위를 낮춤)
+            if 'Timeout' in type(e).__name__:
+                self.latency.record(model, time.monotonic() - started_at)
+            raise
+        # 헤지에 진 요청도 끝까지 받은 응답이면 기록
+        self.latency.record(model, time.monotonic() - started_at)
+        return response.choices[0].message.content
+
+    def _hedged_openai(self, name, model, messages, temperature, max_tokens):
+        """첫 요청이 시작된 뒤 헤지 대기 시간 안에 끝나지 않으면 두 번째 요청을 보내고 먼저 성공한 응답 반환"""
+        self._budget.deposit()
+        started = threading.Event()
+        primary = self._submit(self._openai_attempt, model, messages, temperature, max_tokens, started)
+        if not LLM_HEDGE_ENABLED:
+            return primary.result()
+
+        # 대기 시간은 작업 스레드에서 실제로 요청을 시작한 때부터 계산 (큐에서 기다린 시간 제외)
+        started.wait()
+        delay = self.latency.hedge_delay(model)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        if not self._can_hedge():
+            self._count('hedgeSkipped')
+            return primary.result()
+
+        print(f"[LLM 헤징] {name} {delay:.2f}초 안에 응답 없음, 두 번째 요청 시작")
+        self._count('hedged')
+        hedge = self._submit(self._openai_attempt, model, messages, temperature, max_tokens)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    content = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if future is hedge:
+                    self._count('hedgeWins')
+                return content
+        raise error
+
+    def _fallback(self, model, messages, temperature, max_tokens):
+        """대체 공급자로 같은 메시지 요청"""
+        if LLM_FALLBACK_PROVIDER != 'anthropic':
+            raise ValueError(f"지원하지 않는 대체 공급자: {LLM_FALLBACK_PROVIDER}")
+        system = '\n\n'.join(m['content'] for m in messages if m['role'] == 'system')
+        response = resilient_call(
+            'anthropic', get_claude_client().messages.create,
+            model=LLM_FALLBACK_MODEL,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system,
+            messages=[m for m in messages if m['role'] != 'system']
+        )
+        return response.content[0].text
+
+    def complete(self, name, model, messages, temperature, max_tokens):
+        """OpenAI 채팅 응답 텍스트 반환 (헤징 → 실패 시 대체 공급자, 둘 다 실패하면 예외)"""
+        self._count('calls')
+        try:
+            return self._hedged_openai(name, model, messages, temperature, max_tokens)
+        except Exception as e:
+            if not LLM_FALLBACK_PROVIDER:
+                raise
+            print(f"[LLM 헤징] {name} OpenAI 실패 ({e}), {LLM_FALLBACK_PROVIDER}로 대체")
+            self._count('fallbacks')
+            return self._fallback(model, messages, temperature, max_tokens)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        return {**stats, 'enabled': LLM_HEDGE_ENABLED, 'fallbackProvider': LLM_FALLBACK_PROVIDER or None,
+                'hedgeBudget': self._budget.stats(), 'latency': self.latency.stats()}
+
+# 프로세스 전체에서 공유하는 헤징 호출기
+hedged_llm = HedgedLLM()
+
+def hedged_chat_completion(name, model, messages, temperature, max_tokens):
+    return hedged_llm.complete(name, model, messages, temperature, max_tokens)
@@ -0,0 +1,80 @@
+"""
+공용 HTTP 클라이언트 모듈
+네이버 OpenAPI, 네이버 검색광고 API, Perplexity API 호출에 사용하는
+호스트별 keep-alive 커넥션 풀과 기본 타임아웃을 제공합니다.
+"""
+
+import os
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+# 타임아웃 설정 (초) - 연결 / 응답 읽기
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 10))
+
+# 호스트별 커넥션 풀 크기 (동시에 유지할 keep-alive 연결 수)
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 20))
+
+# 서버 시작 시 미리 연결해 둘 업스트림 호스트
+PREWARM_HOSTS = [
+    'https://openapi.naver.com',
+    'https://api.searchad.naver.com',
+    'https://api.perplexity.ai'
+]
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def _create_session():
+    """keep-alive 커넥션 풀을 가진 세션 생성"""
+    session = requests.Session()
+    # 재시도는 호출하는 쪽에서 결정하므로 어댑터 레벨 재시도는 끔
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def get_session(url):
+    """URL의 호스트에 해당하는 공용 세션 반환 (없으면 생성)"""
+    parts = urlsplit(url)
+    host_key = f"{parts.scheme}://{parts.netloc}"
+
+    session = _sessions.get(host_key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(host_key)
+            if session is None:
+                session = _create_session()
+                _sessions[host_key] = session
+    return session
+
+def request(method, url, timeout=None, **kwargs):
+    """공용 세션으로 요청 전송 (타임아웃 미지정 시 기본값 적용)"""
+    if timeout is None:
+        timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+    return get_session(url).request(method, url, timeout=timeout, **kwargs)
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+def prewarm_connections(hosts=None):
+    """업스트림 호스트에 미리 연결해서 첫 요청의 TCP/TLS 핸드셰이크 비용을 없앰"""
+    def warm(host):
+        try:
+            # 응답 내용은 필요 없고 연결만 맺어 풀에 넣어 둠
+            request('HEAD', host, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_CONNECT_TIMEOUT))
+            print(f"[HTTP 클라이언트] 연결 준비 완료: {host}")
+        except Exception as e:
+            print(f"[HTTP 클라이언트] 연결 준비 실패: {host}, {e}")
+
+    for host in hosts or PREWARM_HOSTS:
+        threading.Thread(target=warm, args=(host,), daemon=True).start()
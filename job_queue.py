@@ -0,0 +1,248 @@
+"""
+글 생성 작업 큐 모듈
+오래 걸리는 비스트리밍 글 생성(전체글/재생성)을 HTTP 요청과 분리해서
+제한된 작업자 풀에서 실행합니다. 요청은 작업 ID만 받아 바로 돌아가고,
+클라이언트는 작업 상태를 조회(폴링/롱폴링)하거나 SSE로 구독합니다.
+작업 상태와 결과는 SQLite에 저장해서 재시작 후에도 완료된 글을 잃지 않고,
+끝나지 않은 작업은 다시 실행합니다.
+"""
+
+import os
+import time
+import uuid
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from cache_backend import serialize_value, deserialize_value
+
+# 환경 변수 로드
+load_dotenv()
+
+JOB_MAX_WORKERS = int(os.getenv('JOB_MAX_WORKERS', 4))  # 동시에 실행하는 작업 수
+JOB_QUEUE_MAX = int(os.getenv('JOB_QUEUE_MAX', 100))  # 대기 + 실행 중 작업 최대 수
+JOB_RESULT_TTL = int(os.getenv('JOB_RESULT_TTL', 24 * 60 * 60))  # 끝난 작업 보관 시간 (초)
+JOB_DB_PATH = os.getenv('JOB_DB_PATH', os.path.join('data', 'jobs.sqlite3'))
+
+# 작업 상태
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+JOB_FINISHED_STATES = {JOB_SUCCEEDED, JOB_FAILED}
+
+class QueueFull(Exception):
+    """대기 중인 작업이 너무 많아 새 작업을 받을 수 없음"""
+
+class JobStore:
+    """작업 상태/결과 SQLite 저장소 (초기화 실패 시 메모리에서만 유지)"""
+
+    def __init__(self, path=JOB_DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = None
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    params BLOB NOT NULL,
+                    result BLOB,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            self._conn.commit()
+        except Exception as e:
+            print(f"[작업 큐] 작업 저장소 초기화 실패, 메모리에서만 유지: {e}")
+            self._conn = None
+
+    def save(self, job):
+        if self._conn is None:
+            return
+        result = job['result']
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO jobs (id, kind, status, params, result, error, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (job['id'], job['kind'], job['status'], sqlite3.Binary(serialize_value(job['params'])),
+                     sqlite3.Binary(serialize_value(result)) if result is not None else None,
+                     job['error'], job['createdAt'], job['updatedAt'])
+                )
+                self._conn.commit()
+        except Exception as e:
+            print(f"[작업 큐] 작업 {job['id']} 저장 실패: {e}")
+
+    def load(self, job_id):
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id, kind, status, params, result, error, created_at, updated_at FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def unfinished(self):
+        """이전 프로세스에서 끝나지 않은 작업 목록 (생성 순)"""
+        if self._conn is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id, kind, status, params, result, error, created_at, updated_at FROM jobs WHERE status IN (?, ?) ORDER BY created_at',
+                (JOB_QUEUED, JOB_RUNNING)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def purge(self, before):
+        """before 이전에 끝난 작업 삭제"""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                'DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?', (JOB_SUCCEEDED, JOB_FAILED, before)
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _row_to_job(row):
+        job_id, kind, status, params, result, error, created_at, updated_at = row
+        return {
+            'id': job_id,
+            'kind': kind,
+            'status': status,
+            'params': deserialize_value(params),
+            'result': deserialize_value(result) if result is not None else None,
+            'error': error,
+            'createdAt': created_at,
+            'updatedAt': updated_at
+        }
+
+class JobQueue:
+    """종류별 작업 함수를 제한된 스레드 풀에서 실행하는 작업 큐"""
+
+    def __init__(self, store, max_workers=JOB_MAX_WORKERS, max_pending=JOB_QUEUE_MAX, ttl=JOB_RESULT_TTL):
+        self.store = store
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._handlers = {}  # 작업 종류 -> 함수(**params)
+        self._jobs = {}  # 이 프로세스에서 다룬 작업 (id -> 작업)
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+
+    def register(self, kind, handler):
+        self._handlers[kind] = handler
+
+    def submit(self, kind, params):
+        """작업 등록 후 작업 정보 반환. 대기 작업이 너무 많으면 QueueFull"""
+        if kind not in self._handlers:
+            raise ValueError(f"등록되지 않은 작업 종류: {kind}")
+
+        with self._cond:
+            if self._pending >= self.max_pending:
+                raise QueueFull(f"대기 중인 작업이 너무 많습니다 ({self.max_pending}개)")
+            self._pending += 1
+            now = time.time()
+            job = {
+                'id': uuid.uuid4().hex,
+                'kind': kind,
+                'status': JOB_QUEUED,
+                'params': params,
+                'result': None,
+                'error': None,
+                'createdAt': now,
+                'updatedAt': now
+            }
+            self._jobs[job['id']] = job
+            self._purge(now)
+
+        snapshot = dict(job)
+        self.store.save(snapshot)
+        self._executor.submit(self._run, job)
+        print(f"[작업 큐] {kind} 작업 {job['id']} 등록")
+        return snapshot
+
+    def _update(self, job, **fields):
+        with self._cond:
+            job.update(fields, updatedAt=time.time())
+            if job['status'] in JOB_FINISHED_STATES:
+                self._pending -= 1
+            self._cond.notify_all()
+        self.store.save(job)
+
+    def _run(self, job):
+        self._update(job, status=JOB_RUNNING)
+        started_at = time.monotonic()
+        try:
+            result = self._handlers[job['kind']](**job['params'])
+            # 작업 함수가 오류 정보를 담은 결과를 돌려주면 실패로 기록 (결과도 함께 보관)
+            error = result.get('error') if isinstance(result, dict) else None
+            self._update(job, status=JOB_FAILED if error else JOB_SUCCEEDED, result=result, error=error)
+        except Exception as e:
+            self._update(job, status=JOB_FAILED, error=str(e))
+        print(f"[작업 큐] {job['kind']} 작업 {job['id']} {job['status']} ({time.monotonic() - started_at:.1f}초)")
+
+    def _purge(self, now):
+        """보관 시간이 지난 끝난 작업을 메모리에서 제거 (저장소는 resume_pending에서 정리)"""
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['status'] in JOB_FINISHED_STATES and now - job['updatedAt'] > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id, wait=0):
+        """작업 정보 반환 (없으면 None). wait초 동안 작업이 끝나기를 기다릴 수 있음"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                if wait > 0:
+                    self._cond.wait_for(lambda: job['status'] in JOB_FINISHED_STATES, wait)
+                return dict(job)
+
+        # 이전 프로세스에서 끝난 작업은 저장소에서 조회
+        job = self.store.load(job_id)
+        if job is not None and time.time() - job['updatedAt'] > self.ttl:
+            return None
+        return job
+
+    def wait_for_change(self, job_id, status, timeout):
+        """작업 상태가 status에서 바뀌거나 timeout이 지날 때까지 대기 후 작업 정보 반환"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._cond.wait_for(lambda: job['status'] != status, timeout)
+                return dict(job)
+        return self.get(job_id)
+
+    def resume_pending(self):
+        """이전 프로세스에서 끝나지 않은 작업을 다시 실행하고 오래된 작업 정리"""
+        self.store.purge(time.time() - self.ttl)
+        resumed = 0
+        for job in self.store.unfinished():
+            if job['kind'] not in self._handlers:
+                continue
+            with self._cond:
+                if job['id'] in self._jobs:
+                    continue
+                job['status'] = JOB_QUEUED
+                self._jobs[job['id']] = job
+                self._pending += 1
+            self._executor.submit(self._run, job)
+            resumed += 1
+        if resumed:
+            print(f"[작업 큐] 끝나지 않은 작업 {resumed}개 다시 실행")
+
+    def stats(self):
+        with self._cond:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return {'pending': self._pending, 'maxPending': self.max_pending, 'jobs': counts}
+
+# 프로세스 전체에서 공유하는 글 생성 작업 큐
+article_jobs = JobQueue(JobStore())
@@ -0,0 +1,243 @@
+"""
+관련 키워드 추출 모듈
+콘텐츠 기획/글에서 한글·영문 단어와 두 단어 묶음(바이그램)을 후보로 뽑고,
+조사/어미/불용어를 걸러낸 뒤 TF-IDF 점수로 관련 키워드를 고릅니다.
+IDF는 지금까지 생성한 기획과 글로 점진적으로 갱신하는 문서 빈도 색인을 사용하며,
+색인은 SQLite에 저장해서 재시작 후에도 유지합니다.
+"""
+
+import os
+import re
+import atexit
+import math
+import sqlite3
+import hashlib
+import threading
+from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+KEYWORD_INDEX_PATH = os.getenv('KEYWORD_INDEX_PATH', os.path.join('data', 'keywords.sqlite3'))
+KEYWORD_INDEX_MAX_TERMS = int(os.getenv('KEYWORD_INDEX_MAX_TERMS', 100000))  # 넘으면 한 문서에만 나온 단어부터 정리
+KEYWORD_INDEX_FLUSH_EVERY = int(os.getenv('KEYWORD_INDEX_FLUSH_EVERY', 5))  # 이 문서 수마다 색인 저장
+RELATED_KEYWORD_LIMIT = int(os.getenv('RELATED_KEYWORD_LIMIT', 3))
+RELATED_KEYWORD_MIN_COUNT = 2  # 문서 안에서 이보다 적게 나온 후보는 제외
+
+TOKEN_PATTERN = re.compile(r'[가-힣]{2,}|[A-Za-z][A-Za-z0-9]+')
+# 단어와 구분자(문장부호/줄바꿈)를 한 번에 찾음 - 바이그램은 구분자 없이 이어진 두 단어만
+SCAN_PATTERN = re.compile(r'[가-힣]{2,}|[A-Za-z][A-Za-z0-9]+|[^\s가-힣A-Za-z0-9]+|\n')
+
+# 조사 (긴 것부터 확인). 두 글자 이상은 항상 떼고, 한 글자는 문서에 어간이 따로 있을 때만 뗌
+MULTI_CHAR_PARTICLES = (
+    '에서는', '에서도', '에게서', '으로는', '으로도', '이라는', '이라고',
+    '까지', '부터', '에서', '으로', '에게', '한테', '보다', '처럼', '만큼', '이나', '이란',
+    '라는', '라고', '과의', '와의', '에는', '에도', '로는', '로도', '들은', '들이', '들을', '들의', '들도'
+)
+SINGLE_CHAR_PARTICLES = frozenset('은는이가을를의에도로와과만나')
+# 두 글자 이상 조사를 한 번에 찾는 패턴 (어간은 두 글자 이상, 가장 짧은 어간 = 가장 긴 조사 우선)
+PARTICLE_PATTERN = re.compile(r'^(.{2,}?)(?:' + '|'.join(MULTI_CHAR_PARTICLES) + r')$')
+
+# 서술어/활용형 어미 - 이 끝말로 끝나는 단어는 키워드 후보가 아님
+PREDICATE_ENDING_PATTERN = re.compile(
+    r'(?:습니다|니다|세요|해요|어요|아요|에요|예요|했다|한다|된다|있다|없다|하다|이다|지만|면서|으며|하며|하여|해서|하게|하기|하는|되는|있는|없는|했던|하면|으면|려면|니까|는데|도록|거나|이고|이며)$'
+)
+
+STOPWORDS = frozenset("""
+그리고 하지만 그러나 또한 그래서 따라서 그런데 그러면 게다가 특히 물론 만약 결국 바로 먼저 다음 이후 이전
+이러한 이런 그런 저런 이것 그것 저것 여기 거기 저기 우리 여러분 자신 모든 각각 다양한 여러 많은 가장 매우 정말
+아주 너무 조금 보다 위해 위한 대한 대해 통해 통한 관련 경우 때문 정도 부분 이상 이하 사이 가지 하나 모두 함께
+이제 지금 오늘 항상 자주 종종 다시 계속 그냥 역시 혹시 내용 정보 사용 활용 확인 소개 설명 생각 필요 중요 가능
+the and for with that this from are was you your our can will not but have has
+""".split())
+
+def strip_particle(token):
+    """두 글자 이상 조사를 떼어 낸 어간 (조사가 없으면 None)"""
+    match = PARTICLE_PATTERN.match(token)
+    return match.group(1) if match else None
+
+def candidate_term(word):
+    """키워드 후보면 색인/점수에 쓰는 형태(영문은 소문자), 아니면 None"""
+    if word in STOPWORDS or PREDICATE_ENDING_PATTERN.search(word):
+        return None
+    return word.lower() if word.isascii() else word
+
+@lru_cache(maxsize=65536)
+def classify_token(token):
+    """문서와 무관한 단어 분석 (프로세스 전체에서 캐시)
+
+    (후보 단어 또는 None, 한 글자 조사를 뗄 수 있으면 (어간, 어간의 후보 단어) 아니면 None)
+    구분자(문장부호/줄바꿈)는 (None, None)입니다.
+    """
+    if not TOKEN_PATTERN.fullmatch(token):
+        return None, None
+    stem = strip_particle(token)
+    if stem is not None:
+        return candidate_term(stem), None
+    if len(token) >= 3 and token[-1] in SINGLE_CHAR_PARTICLES:
+        return candidate_term(token), (token[:-1], candidate_term(token[:-1]))
+    return candidate_term(token), None
+
+def count_terms(text, min_count=1):
+    """문서의 단어/바이그램 등장 횟수 (Counter)
+
+    min_count가 2 이상이면 그보다 적게 나온 단어가 들어간 바이그램은 세지 않습니다
+    (그런 바이그램은 어차피 min_count번 나올 수 없으므로 추출에는 필요 없음).
+    """
+    tokens = SCAN_PATTERN.findall(text)
+    raw_tokens = set(tokens)
+
+    # 같은 단어는 문서 안에서 한 번만 정규화 (한 글자 조사는 같은 문서에 어간이 따로 있을 때만 뗌)
+    terms = {}
+    for token in raw_tokens:
+        term, single = classify_token(token)
+        if single is not None and single[0] in raw_tokens:
+            term = single[1]
+        terms[token] = term
+
+    sequence = [terms[token] for token in tokens]
+    counts = Counter(sequence)
+    counts.pop(None, None)
+    if min_count > 1:
+        sequence = [term if term is not None and counts[term] >= min_count else None for term in sequence]
+    counts.update([first + ' ' + second for first, second in zip(sequence, sequence[1:]) if first and second])
+    return counts
+
+def document_id(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+class DocumentFrequencyIndex:
+    """단어별 등장 문서 수 색인 (메모리 + SQLite, 초기화 실패 시 메모리에서만 유지)"""
+
+    def __init__(self, path=KEYWORD_INDEX_PATH, max_terms=KEYWORD_INDEX_MAX_TERMS):
+        self.max_terms = max_terms
+        self._lock = threading.Lock()
+        self._df = {}
+        self._documents = set()
+        self._pending_terms = Counter()
+        self._pending_documents = []
+        self._conn = None
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS df (term TEXT PRIMARY KEY, count INTEGER NOT NULL) WITHOUT ROWID')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS documents (id TEXT PRIMARY KEY) WITHOUT ROWID')
+            self._conn.commit()
+            self._df = dict(self._conn.execute('SELECT term, count FROM df'))
+            self._documents = {row[0] for row in self._conn.execute('SELECT id FROM documents')}
+            print(f"[키워드 색인] 문서 {len(self._documents)}개, 단어 {len(self._df)}개 로드")
+        except Exception as e:
+            print(f"[키워드 색인] 색인 저장소 초기화 실패, 메모리에서만 유지: {e}")
+            self._conn = None
+
+    def idfs(self, terms):
+        """단어별 역문서 빈도 log((문서 수 + 1) / (df + 1)) + 1 목록 (색인이 비어 있으면 모든 단어 1)"""
+        documents = math.log(len(self._documents) + 1) + 1
+        df = self._df
+        return [documents - math.log(df.get(term, 0) + 1) for term in terms]
+
+    def add_document(self, doc_id, terms):
+        """문서 한 건의 단어 집합을 색인에 반영 (같은 문서는 한 번만)"""
+        with self._lock:
+            if doc_id in self._documents:
+                return False
+            self._documents.add(doc_id)
+            for term in terms:
+                self._df[term] = self._df.get(term, 0) + 1
+            self._pending_terms.update(terms)
+            self._pending_documents.append(doc_id)
+            if len(self._pending_documents) >= KEYWORD_INDEX_FLUSH_EVERY:
+                self._flush()
+            return True
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._conn is None or not self._pending_documents:
+            return
+        try:
+            self._conn.executemany(
+                'INSERT INTO df (term, count) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET count = count + excluded.count',
+                self._pending_terms.items()
+            )
+            self._conn.executemany('INSERT OR IGNORE INTO documents (id) VALUES (?)', [(d,) for d in self._pending_documents])
+            if len(self._df) > self.max_terms:
+                # 한 문서에만 나온 단어 정리
+                self._conn.execute('DELETE FROM df WHERE count <= 1')
+                self._df = {term: count for term, count in self._df.items() if count > 1}
+            self._conn.commit()
+        except Exception as e:
+            print(f"[키워드 색인] 저장 실패: {e}")
+        self._pending_terms = Counter()
+        self._pending_documents = []
+
+    def stats(self):
+        with self._lock:
+            return {'documents': len(self._documents), 'terms': len(self._df), 'pending': len(self._pending_documents)}
+
+class KeywordExtractor:
+    """TF-IDF 관련 키워드 추출기"""
+
+    def __init__(self, index):
+        self.index = index
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='keyword-index')
+        # 종료 시 아직 저장하지 않은 문서 빈도 저장
+        atexit.register(self.index.flush)
+
+    def extract(self, text, keyword, limit=RELATED_KEYWORD_LIMIT, counts=None):
+        """text에서 keyword와 관련된 키워드를 점수 순으로 최대 limit개 반환"""
+        counts = counts if counts is not None else count_terms(text, RELATED_KEYWORD_MIN_COUNT)
+        keyword = (keyword or '').lower()
+        excluded = {keyword, *keyword.split()}
+
+        candidates = [
+            (term, count) for term, count in counts.items()
+            if count >= RELATED_KEYWORD_MIN_COUNT and term not in excluded
+            and not (' ' in term and all(word in excluded for word in term.split(' ')))
+        ]
+        idfs = self.index.idfs(term for term, _ in candidates)
+        scored = sorted(
+            (((1 + math.log(count)) * idf * (1.2 if ' ' in term else 1), term) for (term, count), idf in zip(candidates, idfs)),
+            reverse=True
+        )
+
+        # 이미 고른 바이그램에 포함된 단어(또는 그 반대)는 중복이므로 건너뜀
+        keywords = []
+        for _, term in scored:
+            if any(term in chosen.split(' ') or chosen in term.split(' ') for chosen in keywords):
+                continue
+            keywords.append(term)
+            if len(keywords) >= limit:
+                break
+        return keywords
+
+    def index_document(self, text, counts=None):
+        """생성한 기획/글을 문서 빈도 색인에 추가 (요청 처리와 분리된 작업 스레드에서 실행)"""
+        if not text:
+            return
+        self._executor.submit(self._index_document, text, counts)
+
+    def _index_document(self, text, counts):
+        try:
+            terms = set(counts if counts is not None else count_terms(text))
+            self.index.add_document(document_id(text), terms)
+        except Exception as e:
+            print(f"[키워드 색인] 문서 추가 실패: {e}")
+
+# 프로세스 전체에서 공유하는 키워드 추출기
+keyword_extractor = KeywordExtractor(DocumentFrequencyIndex())
+
+def extract_keywords(text, keyword, limit=RELATED_KEYWORD_LIMIT, index=True):
+    """관련 키워드 추출 (index=True면 이 문서를 이후 추출을 위한 색인에도 추가 - 색인용 전체 집계는 작업 스레드에서)"""
+    keywords = keyword_extractor.extract(text, keyword, limit)
+    if index:
+        keyword_extractor.index_document(text)
+    return keywords
@@ -0,0 +1,64 @@
+"""
+LLM 응답 캐시 모듈
+(공급자, 모델, 프롬프트 메시지, temperature, max_tokens)의 해시를 키로
+모델 응답 원문을 저장합니다. 같은 요청이면 같은 키가 되므로 키워드/톤이
+같은 반복 요청은 모델을 다시 호출하지 않습니다.
+함수별 TTL을 두고, 메모리/영구 캐시 모두 용량 기준으로 오래된 항목부터 제거됩니다.
+"""
+
+import os
+import json
+import hashlib
+from dotenv import load_dotenv
+from result_cache import TTLCache, keyword_cache
+
+# 환경 변수 로드
+load_dotenv()
+
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+
+# 함수별 TTL (초)
+LLM_CACHE_TTLS = {
+    'generate_titles': int(os.getenv('LLM_CACHE_TTL_TITLES', 6 * 60 * 60)),
+    'generate_thumbnail_prompts': int(os.getenv('LLM_CACHE_TTL_THUMBNAILS', 6 * 60 * 60)),
+    'generate_content_plan': int(os.getenv('LLM_CACHE_TTL_CONTENT_PLAN', 24 * 60 * 60)),
+    'generate_longtail_keywords': int(os.getenv('LLM_CACHE_TTL_LONGTAIL_KEYWORDS', 24 * 60 * 60))
+}
+
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 2000))
+LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+# 키워드 결과 캐시와 같은 영구 캐시 백엔드를 함수 이름 네임스페이스로 공유
+llm_response_cache = TTLCache(
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    max_bytes=LLM_CACHE_MAX_BYTES,
+    backend=keyword_cache.backend,
+    persistent_sources=set(LLM_CACHE_TTLS)
+)
+
+def llm_cache_key(provider, model, messages, temperature, max_tokens):
+    """요청 내용으로 만든 캐시 키 (같은 요청이면 항상 같은 키)"""
+    payload = json.dumps({
+        'provider': provider,
+        'model': model,
+        'messages': messages,
+        'temperature': temperature,
+        'max_tokens': max_tokens
+    }, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def get_cached_response(function_name, cache_key):
+    """캐시된 모델 응답 원문 반환 (없거나 캐시 비활성화 시 None)"""
+    if not LLM_CACHE_ENABLED:
+        return None
+    return llm_response_cache.get(function_name, cache_key)
+
+def store_response(function_name, cache_key, text):
+    """정상적으로 처리된 모델 응답 원문 저장"""
+    if not LLM_CACHE_ENABLED or not text:
+        return
+    llm_response_cache.set(function_name, cache_key, text, ttl=LLM_CACHE_TTLS.get(function_name))
+
+def cached_response_expires_at(function_name, cache_key):
+    """캐시된 응답의 만료 시각 (없으면 None)"""
+    return llm_response_cache.expires_at(function_name, cache_key)
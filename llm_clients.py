@@ -0,0 +1,107 @@
+"""
+LLM 클라이언트 모듈
+OpenAI, Claude(Anthropic) 클라이언트를 프로세스 전체에서 하나씩만 만들어 공유합니다.
+처음 사용할 때 생성하며, 커넥션 풀/타임아웃/재시도 설정은 시작 시 한 번만 읽습니다.
+ASGI 모드에서는 같은 설정의 비동기 클라이언트(AsyncAnthropic 등)를 함께 제공합니다.
+"""
+
+import os
+import threading
+import httpx
+import anthropic
+from openai import OpenAI, AsyncOpenAI
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+# 공급자별 클라이언트 설정
+LLM_PROVIDER_CONFIG = {
+    'openai': {
+        'api_key_env': 'OPENAI_API_KEY',
+        'connect_timeout': float(os.getenv('OPENAI_CONNECT_TIMEOUT', 5)),
+        'read_timeout': float(os.getenv('OPENAI_READ_TIMEOUT', 30)),
+        'max_retries': int(os.getenv('OPENAI_MAX_RETRIES', 0)),  # 재시도는 resilience 계층에서 처리
+        'max_connections': int(os.getenv('OPENAI_MAX_CONNECTIONS', 50)),
+        'max_keepalive_connections': int(os.getenv('OPENAI_MAX_KEEPALIVE', 20))
+    },
+    'anthropic': {
+        'api_key_env': 'Claude_API_KEY',
+        'connect_timeout': float(os.getenv('CLAUDE_CONNECT_TIMEOUT', 5)),
+        'read_timeout': float(os.getenv('CLAUDE_READ_TIMEOUT', 600)),  # 긴 글 생성/스트리밍
+        'max_retries': int(os.getenv('CLAUDE_MAX_RETRIES', 0)),  # 재시도는 resilience 계층에서 처리
+        'max_connections': int(os.getenv('CLAUDE_MAX_CONNECTIONS', 50)),
+        'max_keepalive_connections': int(os.getenv('CLAUDE_MAX_KEEPALIVE', 20))
+    }
+}
+
+KEEPALIVE_EXPIRY = float(os.getenv('LLM_KEEPALIVE_EXPIRY', 60))
+
+class LLMClientRegistry:
+    """공급자별 LLM 클라이언트를 지연 생성해서 공유하는 스레드 안전 레지스트리"""
+
+    def __init__(self, config=LLM_PROVIDER_CONFIG):
+        self.config = config
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def _build_http_client(self, settings, use_async=False):
+        """keep-alive 커넥션 풀과 타임아웃이 설정된 httpx 클라이언트 생성"""
+        http_client_class = httpx.AsyncClient if use_async else httpx.Client
+        return http_client_class(
+            timeout=httpx.Timeout(settings['read_timeout'], connect=settings['connect_timeout']),
+            limits=httpx.Limits(
+                max_connections=settings['max_connections'],
+                max_keepalive_connections=settings['max_keepalive_connections'],
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            )
+        )
+
+    def _create(self, provider, use_async):
+        settings = self.config[provider]
+        api_key = os.getenv(settings['api_key_env'])
+
+        if provider == 'anthropic':
+            if not api_key:
+                raise Exception("Claude API 키가 설정되지 않았습니다")
+            client_class = anthropic.AsyncAnthropic if use_async else anthropic.Anthropic
+        else:
+            client_class = AsyncOpenAI if use_async else OpenAI
+
+        client = client_class(
+            api_key=api_key,
+            max_retries=settings['max_retries'],
+            http_client=self._build_http_client(settings, use_async)
+        )
+        print(f"[LLM 클라이언트] {provider} {'비동기 ' if use_async else ''}클라이언트 생성")
+        return client
+
+    def get(self, provider, use_async=False):
+        """공급자 클라이언트 반환 (처음 호출 시 생성, 생성 실패는 캐시하지 않음)
+
+        비동기 클라이언트는 ASGI 서버의 이벤트 루프 하나에서만 사용합니다.
+        """
+        key = (provider, use_async)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._create(provider, use_async)
+                    self._clients[key] = client
+        return client
+
+# 프로세스 전체에서 공유하는 LLM 클라이언트 레지스트리
+llm_clients = LLMClientRegistry()
+
+def get_openai_client():
+    return llm_clients.get('openai')
+
+def get_claude_client():
+    return llm_clients.get('anthropic')
+
+def get_async_openai_client():
+    return llm_clients.get('openai', use_async=True)
+
+def get_async_claude_client():
+    return llm_clients.get('anthropic', use_async=True)
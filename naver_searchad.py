@@ -0,0 +1,184 @@
+"""
+네이버 검색광고 API 모듈
+/keywordstool 응답(keywordList)을 키워드별로 한 번만 조회해서
+검색량 조회와 연관 키워드 조회가 같은 결과를 나눠 쓰도록 합니다.
+동시에 들어온 같은 키워드 요청은 하나의 API 호출로 합칩니다.
+"""
+
+import os
+import time
+import threading
+import http_client
+from dotenv import load_dotenv
+from signaturehelper import Signature
+from result_cache import keyword_cache
+from rate_limiter import rate_limiter, raise_for_rate_limit, BackpressureError
+from resilience import resilient_call, ProviderUnavailable
+
+# 환경 변수 로드
+load_dotenv()
+
+KEYWORDSTOOL_URL = 'https://api.searchad.naver.com/keywordstool'
+HINT_KEYWORDS_MAX = 5  # /keywordstool 한 번에 보낼 수 있는 hintKeywords 수
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 하나로 합쳐 결과를 공유"""
+
+    class _Call:
+        def __init__(self):
+            self.event = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._Call()
+                self._calls[key] = call
+
+        if not leader:
+            # 이미 진행 중인 호출의 결과를 기다림
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+_keywordstool_flight = SingleFlight()
+
+def normalize_keyword(keyword):
+    """네이버 API용 키워드 전처리 (띄어쓰기 제거)"""
+    return keyword.replace(' ', '').strip()
+
+def get_searchad_credentials():
+    """검색광고 API 인증 정보 반환 (하나라도 없으면 None)"""
+    api_key = os.getenv('NAVER_AD_API_KEY')
+    secret_key = os.getenv('NAVER_AD_SECRET_KEY')
+    customer_id = os.getenv('NAVER_AD_CUSTOMER_ID')
+
+    if not all([api_key, secret_key, customer_id]):
+        return None
+    return api_key, secret_key, customer_id
+
+def build_searchad_headers(method, uri, credentials):
+    """시그니처가 포함된 검색광고 API 요청 헤더 생성"""
+    api_key, secret_key, customer_id = credentials
+    timestamp = str(int(time.time() * 1000))
+    signature = Signature.generate(timestamp, method, uri, secret_key)
+
+    return {
+        'X-Timestamp': timestamp,
+        'X-API-KEY': api_key,
+        'X-Customer': customer_id,
+        'X-Signature': signature,
+        'Content-Type': 'application/json'
+    }
+
+def _request_keyword_list(api_keyword, credentials):
+    """/keywordstool 실제 호출"""
+    headers = build_searchad_headers('GET', '/keywordstool', credentials)
+    params = {
+        'hintKeywords': api_keyword,
+        'showDetail': '1'
+    }
+
+    def attempt():
+        rate_limiter.acquire('searchad', credentials[2])
+        return http_client.get(KEYWORDSTOOL_URL, headers=headers, params=params)
+
+    response = resilient_call('searchad', attempt)
+    print(f"[검색광고 API] '{api_keyword}' 응답: {response.status_code}")
+    raise_for_rate_limit(response, 'searchad')
+
+    if response.status_code != 200:
+        print(f"[검색광고 API] 오류: {response.status_code}, {response.text}")
+        return None
+
+    result = response.json()
+    keyword_list = result.get('keywordList') or []
+    print(f"[검색광고 API] '{api_keyword}' 키워드 {len(keyword_list)}개 수신")
+    return keyword_list
+
+def _load_keyword_list(api_keyword, credentials):
+    """API 호출 후 성공한 결과를 캐시에 저장"""
+    keyword_list = _request_keyword_list(api_keyword, credentials)
+    keyword_cache.set('keywordList', api_keyword, keyword_list)
+    return keyword_list
+
+def fetch_keyword_list(keyword, refresh=False):
+    """키워드의 keywordList 조회 (캐시 우선, 같은 키워드 동시 요청은 한 번만 호출, refresh=True면 캐시 건너뜀)"""
+    api_keyword = normalize_keyword(keyword)
+
+    credentials = get_searchad_credentials()
+    if not credentials:
+        print("[검색광고 API] 검색광고 API 키가 설정되지 않음")
+        return None
+
+    cached = None if refresh else keyword_cache.get('keywordList', api_keyword)
+    if cached is not None:
+        print(f"[검색광고 API] 캐시 사용: '{api_keyword}'")
+        return cached
+
+    try:
+        return _keywordstool_flight.do(api_keyword, _load_keyword_list, api_keyword, credentials)
+    except (BackpressureError, ProviderUnavailable):
+        raise
+    except Exception as e:
+        print(f"[검색광고 API] 호출 오류: {str(e)}")
+        return None
+
+def fetch_main_keyword_data_batch(keywords):
+    """여러 키워드를 hintKeywords로 묶어서(최대 5개씩) 키워드별 검색량 항목 조회 (api_keyword → 항목 또는 None)"""
+    api_keywords = []
+    for keyword in keywords:
+        api_keyword = normalize_keyword(keyword)
+        if api_keyword and api_keyword not in api_keywords:
+            api_keywords.append(api_keyword)
+
+    credentials = get_searchad_credentials()
+    if not credentials:
+        print("[검색광고 일괄 API] 검색광고 API 키가 설정되지 않음")
+        return {api_keyword: None for api_keyword in api_keywords}
+
+    results = {}
+    missing = []
+    for api_keyword in api_keywords:
+        # 단건 조회로 이미 캐시된 keywordList가 있으면 그대로 사용
+        cached = keyword_cache.get('keywordList', api_keyword)
+        if cached is not None:
+            results[api_keyword] = cached[0] if cached else None
+        else:
+            missing.append(api_keyword)
+
+    for i in range(0, len(missing), HINT_KEYWORDS_MAX):
+        chunk = missing[i:i + HINT_KEYWORDS_MAX]
+        try:
+            # 여러 힌트 키워드의 연관 키워드가 섞인 목록이므로 keywordList 캐시에는 저장하지 않음
+            keyword_list = _request_keyword_list(','.join(chunk), credentials) or []
+        except (BackpressureError, ProviderUnavailable):
+            raise
+        except Exception as e:
+            print(f"[검색광고 일괄 API] 호출 오류: {str(e)}")
+            keyword_list = []
+
+        by_name = {item.get('relKeyword', '').lower(): item for item in keyword_list}
+        for api_keyword in chunk:
+            results[api_keyword] = by_name.get(api_keyword.lower())
+
+    return results
@@ -0,0 +1,137 @@
+"""
+인기 키워드 캐시 미리 갱신 모듈
+키워드별 요청 빈도를 시간 감쇠 점수로 집계하고, 가장 많이 찾는 키워드의
+캐시 항목을 TTL이 끝나기 전에 백그라운드에서 미리 갱신합니다.
+한 주기마다 사용할 수 있는 업스트림 호출 수(예산)는 설정으로 제한합니다.
+"""
+
+import os
+import math
+import time
+import threading
+from dotenv import load_dotenv
+from rate_limiter import priority_scope, BackpressureError, PRIORITY_BACKGROUND
+from resilience import ProviderUnavailable
+
+# 환경 변수 로드
+load_dotenv()
+
+PREWARM_ENABLED = os.getenv('PREWARM_ENABLED', 'true').lower() == 'true'
+PREWARM_INTERVAL = int(os.getenv('PREWARM_INTERVAL', 5 * 60))  # 갱신 주기 (초)
+PREWARM_TOP_K = int(os.getenv('PREWARM_TOP_K', 20))  # 주기마다 확인할 인기 키워드 수
+PREWARM_BUDGET_PER_CYCLE = int(os.getenv('PREWARM_BUDGET_PER_CYCLE', 30))  # 주기당 최대 업스트림 호출 수
+PREWARM_HALF_LIFE = float(os.getenv('PREWARM_HALF_LIFE', 6 * 60 * 60))  # 인기 점수 반감기 (초)
+PREWARM_TRACK_MAX = int(os.getenv('PREWARM_TRACK_MAX', 2000))  # 점수를 유지할 최대 키워드 수
+
+class PopularityTracker:
+    """요청 종류/키워드별 시간 감쇠 요청 빈도 집계"""
+
+    def __init__(self, half_life=PREWARM_HALF_LIFE, max_tracked=PREWARM_TRACK_MAX):
+        self.decay_rate = math.log(2) / half_life
+        self.max_tracked = max_tracked
+        self._scores = {}  # (kind, keyword) -> (점수, 마지막 갱신 시각)
+        self._lock = threading.Lock()
+
+    def _decayed(self, score, updated_at, now):
+        return score * math.exp(-self.decay_rate * (now - updated_at))
+
+    def record(self, kind, keyword):
+        """요청 1회 반영"""
+        keyword = (keyword or '').strip()
+        if not keyword:
+            return
+
+        now = time.time()
+        key = (kind, keyword)
+        with self._lock:
+            score, updated_at = self._scores.get(key, (0.0, now))
+            self._scores[key] = (self._decayed(score, updated_at, now) + 1, now)
+
+            # 너무 많아지면 점수가 낮은 절반을 버림
+            if len(self._scores) > self.max_tracked:
+                ranked = sorted(self._scores.items(), key=lambda item: self._decayed(*item[1], now))
+                for stale_key, _ in ranked[:len(ranked) // 2]:
+                    del self._scores[stale_key]
+
+    def top(self, k):
+        """현재 점수가 높은 순서로 (종류, 키워드, 점수) 목록 반환"""
+        now = time.time()
+        with self._lock:
+            ranked = [(kind, keyword, self._decayed(score, updated_at, now)) for (kind, keyword), (score, updated_at) in self._scores.items()]
+        ranked.sort(key=lambda item: item[2], reverse=True)
+        return ranked[:k]
+
+class CachePrewarmer:
+    """인기 키워드의 캐시 항목을 만료 전에 미리 갱신하는 백그라운드 스케줄러"""
+
+    def __init__(self, tracker, interval=PREWARM_INTERVAL, top_k=PREWARM_TOP_K, budget=PREWARM_BUDGET_PER_CYCLE):
+        self.tracker = tracker
+        self.interval = interval
+        self.top_k = top_k
+        self.budget = budget
+        self._sources = {}  # 요청 종류 -> [(캐시 소스, 만료 시각 함수, 갱신 함수)]
+        self._thread = None
+        self._stats = {'cycles': 0, 'refreshed': 0, 'failed': 0}
+
+    def register(self, kind, source, expires_fn, refresh_fn):
+        """요청 종류별로 미리 갱신할 캐시 소스 등록 (expires_fn(keyword)는 캐시 만료 시각 또는 None)"""
+        self._sources.setdefault(kind, []).append((source, expires_fn, refresh_fn))
+
+    def run_cycle(self):
+        """인기 키워드 중 곧 만료될 캐시 항목을 예산 안에서 갱신"""
+        self._stats['cycles'] += 1
+        now = time.time()
+        # 다음 주기 전에 만료될 항목까지 미리 갱신
+        horizon = now + self.interval * 1.5
+        budget = self.budget
+
+        for kind, keyword, score in self.tracker.top(self.top_k):
+            for source, expires_fn, refresh_fn in self._sources.get(kind, []):
+                if budget <= 0:
+                    print(f"[캐시 미리 갱신] 주기 예산 소진 ({self.budget}회)")
+                    return
+
+                expires_at = expires_fn(keyword)
+                if expires_at is not None and expires_at > horizon:
+                    continue
+
+                budget -= 1
+                try:
+                    with priority_scope(PRIORITY_BACKGROUND):
+                        refresh_fn(keyword)
+                    self._stats['refreshed'] += 1
+                    print(f"[캐시 미리 갱신] {source} '{keyword}' 갱신 (점수 {score:.1f})")
+                except (BackpressureError, ProviderUnavailable) as e:
+                    # 호출량 제한/업스트림 장애면 대화형 요청에 양보하고 이번 주기 종료
+                    self._stats['failed'] += 1
+                    print(f"[캐시 미리 갱신] 호출량 제한/업스트림 장애로 중단: {e}")
+                    return
+                except Exception as e:
+                    self._stats['failed'] += 1
+                    print(f"[캐시 미리 갱신] {source} '{keyword}' 갱신 실패: {e}")
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.run_cycle()
+            except Exception as e:
+                print(f"[캐시 미리 갱신] 주기 실행 오류: {e}")
+
+    def start(self):
+        """백그라운드 스레드 시작 (한 번만)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name='cache-prewarmer', daemon=True)
+        self._thread.start()
+        print(f"[캐시 미리 갱신] 시작 - 주기 {self.interval}초, 상위 {self.top_k}개, 예산 {self.budget}회")
+
+    def stats(self):
+        return {
+            **self._stats,
+            'top': [{'kind': kind, 'keyword': keyword, 'score': round(score, 2)} for kind, keyword, score in self.tracker.top(self.top_k)]
+        }
+
+# 프로세스 전체에서 공유하는 인기도 집계기와 미리 갱신 스케줄러
+popularity_tracker = PopularityTracker()
+cache_prewarmer = CachePrewarmer(popularity_tracker)
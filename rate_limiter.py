@@ -0,0 +1,279 @@
+"""
+네이버 API 호출량 제한 모듈
+인증 정보(credential)와 API 계열별 토큰 버킷으로 초당 호출 수를 제한하고,
+일일 쿼터 사용량을 재시작 후에도 유지합니다. 토큰을 기다리는 호출은
+우선순위(대화형 > 일괄 > 백그라운드) 순서로 처리합니다.
+한도를 넘으면 0건 같은 가짜 결과 대신 BackpressureError를 발생시킵니다.
+"""
+
+import os
+import time
+import heapq
+import atexit
+import hashlib
+import sqlite3
+import threading
+import itertools
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+# 요청 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+PRIORITY_BACKGROUND = 2
+
+# 우선순위별 토큰 대기 최대 시간 (초)
+PRIORITY_WAIT_TIMEOUTS = {
+    PRIORITY_INTERACTIVE: float(os.getenv('RATE_LIMIT_WAIT_INTERACTIVE', 2)),
+    PRIORITY_BULK: float(os.getenv('RATE_LIMIT_WAIT_BULK', 30)),
+    PRIORITY_BACKGROUND: float(os.getenv('RATE_LIMIT_WAIT_BACKGROUND', 60))
+}
+
+# API 계열별 초당 호출 수와 일일 쿼터 (0이면 쿼터 제한 없음)
+API_FAMILY_LIMITS = {
+    'naver_search': {  # 블로그/카페 검색
+        'per_second': float(os.getenv('RATE_LIMIT_NAVER_SEARCH_PER_SEC', 10)),
+        'daily_quota': int(os.getenv('QUOTA_NAVER_SEARCH_DAILY', 25000))
+    },
+    'naver_datalab': {  # 데이터랩 검색 트렌드
+        'per_second': float(os.getenv('RATE_LIMIT_NAVER_DATALAB_PER_SEC', 5)),
+        'daily_quota': int(os.getenv('QUOTA_NAVER_DATALAB_DAILY', 1000))
+    },
+    'searchad': {  # 검색광고 keywordstool
+        'per_second': float(os.getenv('RATE_LIMIT_SEARCHAD_PER_SEC', 5)),
+        'daily_quota': int(os.getenv('QUOTA_SEARCHAD_DAILY', 0))
+    }
+}
+
+QUOTA_DB_PATH = os.getenv('QUOTA_DB_PATH', os.path.join('data', 'quota.sqlite3'))
+QUOTA_FLUSH_INTERVAL = 5  # 일일 사용량을 디스크에 기록하는 주기 (초)
+
+# 네이버 쿼터는 한국 시간 자정에 초기화됨
+KST = timezone(timedelta(hours=9))
+
+_request_priority = contextvars.ContextVar('request_priority', default=PRIORITY_INTERACTIVE)
+
+class BackpressureError(Exception):
+    """호출량 제한으로 지금은 요청을 처리할 수 없음 (retry_after초 후 재시도)"""
+
+    def __init__(self, family, retry_after, message):
+        super().__init__(message)
+        self.family = family
+        self.retry_after = max(int(retry_after + 0.999), 1)
+
+class RateLimitExceeded(BackpressureError):
+    """초당 호출 한도 초과 또는 업스트림 429 응답"""
+
+class QuotaExceeded(BackpressureError):
+    """일일 쿼터 소진"""
+
+@contextmanager
+def priority_scope(priority):
+    """블록 안에서 발생하는 업스트림 호출의 우선순위 지정"""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+def submit_with_priority(executor, priority, fn, *args, **kwargs):
+    """지정한 우선순위로 실행되도록 스레드 풀에 작업 제출"""
+    def run():
+        with priority_scope(priority):
+            return fn(*args, **kwargs)
+    return executor.submit(run)
+
+class PriorityTokenBucket:
+    """대기 중인 호출을 우선순위 순서로 처리하는 토큰 버킷"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters = []  # (우선순위, 순번) 힙
+        self._seq = itertools.count()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, priority, timeout):
+        """토큰 1개 획득. timeout 안에 얻지 못하면 (False, 예상 대기 시간) 반환"""
+        if self.rate <= 0:
+            return True, 0
+
+        deadline = time.monotonic() + timeout
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    self._refill()
+                    # 가장 우선순위가 높은 대기자만 토큰을 가져갈 수 있음
+                    if self._waiters[0] == ticket and self._tokens >= 1:
+                        self._tokens -= 1
+                        return True, 0
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        ahead = sum(1 for waiter in self._waiters if waiter < ticket)
+                        return False, (ahead + 1) / self.rate
+
+                    wait = remaining
+                    if self._waiters[0] == ticket:
+                        wait = min(wait, (1 - self._tokens) / self.rate)
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+class DailyQuota:
+    """인증 정보/API 계열별 일일 사용량 (SQLite에 주기적으로 기록)"""
+
+    def __init__(self, path=QUOTA_DB_PATH):
+        self._lock = threading.Lock()
+        self._counts = {}  # (credential, family, day) -> count
+        self._dirty = set()
+        self._flushed_at = time.monotonic()
+        self._conn = None
+
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS quota_usage (
+                    credential TEXT NOT NULL,
+                    family TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (credential, family, day)
+                )
+            ''')
+            # 오늘 사용량만 불러옴
+            today = self.today()
+            for credential, family, count in self._conn.execute(
+                'SELECT credential, family, count FROM quota_usage WHERE day = ?', (today,)
+            ):
+                self._counts[(credential, family, today)] = count
+            self._conn.execute('DELETE FROM quota_usage WHERE day < ?', (today,))
+            self._conn.commit()
+        except Exception as e:
+            print(f"[호출량 제한] 쿼터 저장소 초기화 실패, 메모리에서만 집계: {e}")
+            self._conn = None
+
+    @staticmethod
+    def today():
+        return datetime.now(KST).strftime('%Y-%m-%d')
+
+    @staticmethod
+    def seconds_until_reset():
+        now = datetime.now(KST)
+        tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (tomorrow - now).total_seconds()
+
+    def consume(self, credential, family, limit):
+        """사용량 1 증가. 쿼터를 넘으면 False"""
+        key = (credential, family, self.today())
+        with self._lock:
+            count = self._counts.get(key, 0)
+            if limit and count >= limit:
+                return False
+            self._counts[key] = count + 1
+            self._dirty.add(key)
+
+            if time.monotonic() - self._flushed_at >= QUOTA_FLUSH_INTERVAL:
+                self._flush()
+        return True
+
+    def usage(self):
+        today = self.today()
+        with self._lock:
+            return {
+                f"{family}:{credential}": count
+                for (credential, family, day), count in self._counts.items() if day == today
+            }
+
+    def _flush(self):
+        self._flushed_at = time.monotonic()
+        if self._conn is None or not self._dirty:
+            return
+        try:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO quota_usage (credential, family, day, count) VALUES (?, ?, ?, ?)',
+                [(credential, family, day, self._counts[(credential, family, day)]) for credential, family, day in self._dirty]
+            )
+            self._conn.commit()
+            self._dirty.clear()
+        except Exception as e:
+            print(f"[호출량 제한] 쿼터 사용량 기록 실패: {e}")
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+class RateLimiter:
+    """인증 정보/API 계열별 토큰 버킷과 일일 쿼터를 함께 관리"""
+
+    def __init__(self, limits=API_FAMILY_LIMITS):
+        self.limits = limits
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.quota = DailyQuota()
+        atexit.register(self.quota.flush)
+
+    @staticmethod
+    def credential_id(credential):
+        """인증 정보 원문 대신 짧은 해시로 구분"""
+        return hashlib.sha1((credential or 'anonymous').encode('utf-8')).hexdigest()[:12]
+
+    def _bucket(self, credential, family):
+        key = (credential, family)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = PriorityTokenBucket(self.limits[family]['per_second'])
+                self._buckets[key] = bucket
+            return bucket
+
+    def acquire(self, family, credential):
+        """업스트림 호출 1회 허가. 한도 초과 시 RateLimitExceeded/QuotaExceeded 발생"""
+        credential = self.credential_id(credential)
+        priority = _request_priority.get()
+        timeout = PRIORITY_WAIT_TIMEOUTS.get(priority, PRIORITY_WAIT_TIMEOUTS[PRIORITY_INTERACTIVE])
+
+        acquired, retry_after = self._bucket(credential, family).acquire(priority, timeout)
+        if not acquired:
+            raise RateLimitExceeded(family, retry_after, f"{family} 초당 호출 한도 초과")
+
+        if not self.quota.consume(credential, family, self.limits[family]['daily_quota']):
+            raise QuotaExceeded(family, DailyQuota.seconds_until_reset(), f"{family} 일일 쿼터 소진")
+
+    def stats(self):
+        return {
+            'limits': self.limits,
+            'usage': self.quota.usage()
+        }
+
+def raise_for_rate_limit(response, family):
+    """업스트림이 429로 응답하면 Retry-After를 담은 RateLimitExceeded 발생"""
+    if response.status_code != 429:
+        return
+    try:
+        retry_after = float(response.headers.get('Retry-After', 1))
+    except (TypeError, ValueError):
+        retry_after = 1
+    raise RateLimitExceeded(family, retry_after, f"{family} 업스트림 호출 한도 초과 (429)")
+
+# 프로세스 전체에서 공유하는 호출량 제한기
+rate_limiter = RateLimiter()
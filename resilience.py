@@ -0,0 +1,330 @@
+"""
+업스트림 호출 복원력 모듈
+네이버/Perplexity/OpenAI/Claude 등 모든 외부 호출을 같은 규칙으로 감쌉니다.
+- 일시적 오류(5xx, 529, 429, 네트워크/타임아웃)는 지수 백오프 + 지터로 재시도
+- 응답의 Retry-After를 존중하고, 재시도 마감 시간을 넘기는 대기는 하지 않음
+- 공급자별 재시도 예산으로 장애 시 재시도 폭주를 막음
+- 공급자별 서킷 브레이커가 연속 실패 시 일정 시간 바로 실패 처리(ProviderUnavailable)
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from dotenv import load_dotenv
+from rate_limiter import BackpressureError
+
+# 환경 변수 로드
+load_dotenv()
+
+# 재시도할 HTTP 상태 코드 (529: Claude 과부하)
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504, 529}
+
+# 공급자별 재시도 정책
+# attempts: 최대 시도 횟수, base_delay/max_delay: 백오프 범위(초), deadline: 첫 시도 후 재시도를 시작할 수 있는 시간(초)
+PROVIDER_RETRY_POLICIES = {
+    'naver_search': {'attempts': 3, 'base_delay': 0.2, 'max_delay': 2, 'deadline': 5},
+    'naver_datalab': {'attempts': 3, 'base_delay': 0.2, 'max_delay': 2, 'deadline': 5},
+    'searchad': {'attempts': 3, 'base_delay': 0.2, 'max_delay': 2, 'deadline': 5},
+    'perplexity': {'attempts': 2, 'base_delay': 0.5, 'max_delay': 4, 'deadline': 40},
+    'openai': {'attempts': 3, 'base_delay': 0.3, 'max_delay': 3, 'deadline': 15},
+    'anthropic': {'attempts': 3, 'base_delay': 1, 'max_delay': 8, 'deadline': 60}
+}
+DEFAULT_RETRY_POLICY = {'attempts': 2, 'base_delay': 0.5, 'max_delay': 4, 'deadline': 10}
+
+# 재시도 예산 - 요청 1건마다 RETRY_BUDGET_RATIO만큼 적립, 재시도 1회에 1 사용 (초당 최소 RETRY_BUDGET_MIN_PER_SEC 보장)
+RETRY_BUDGET_RATIO = float(os.getenv('RETRY_BUDGET_RATIO', 0.2))
+RETRY_BUDGET_MIN_PER_SEC = float(os.getenv('RETRY_BUDGET_MIN_PER_SEC', 1))
+RETRY_BUDGET_MAX = float(os.getenv('RETRY_BUDGET_MAX', 10))
+
+# 서킷 브레이커 - 연속 실패 횟수와 열린 상태 유지 시간(초)
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30))
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+class ProviderUnavailable(Exception):
+    """서킷 브레이커가 열려 있어 호출하지 않고 바로 실패"""
+
+    def __init__(self, provider, retry_after):
+        super().__init__(f"{provider} 일시적으로 사용 불가 (서킷 열림, {retry_after:.0f}초 후 재시도)")
+        self.provider = provider
+        self.retry_after = max(int(retry_after + 0.999), 1)  # Retry-After 헤더용 정수 초
+
+class RetryableStatus(Exception):
+    """재시도 가능한 상태 코드 응답 (재시도를 모두 써도 실패하면 마지막 응답을 그대로 반환)"""
+
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+class CircuitBreaker:
+    """연속 실패가 임계치를 넘으면 열리고, 일정 시간 뒤 한 번 시험 호출을 허용"""
+
+    def __init__(self, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opened_at = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """호출 가능 여부와 (불가 시) 남은 대기 시간"""
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return True, 0
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == CIRCUIT_OPEN and remaining <= 0:
+                self.state = CIRCUIT_HALF_OPEN
+            if self.state == CIRCUIT_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True, 0
+            return False, max(remaining, 1)
+
+    def record_success(self):
+        with self._lock:
+            self.state = CIRCUIT_CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """업스트림에 닿지 않고 끝난 시험 호출의 자리만 반납 (상태는 그대로)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == CIRCUIT_HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != CIRCUIT_OPEN:
+                    print(f"[복원력] 서킷 열림 (연속 실패 {self._failures}회)")
+                self.state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            return {'state': self.state, 'failures': self._failures}
+
+class RetryBudget:
+    """요청 수에 비례해서 재시도 횟수를 제한하는 예산"""
+
+    def __init__(self, ratio=RETRY_BUDGET_RATIO, min_per_sec=RETRY_BUDGET_MIN_PER_SEC, max_tokens=RETRY_BUDGET_MAX):
+        self.ratio = ratio
+        self.min_per_sec = min_per_sec
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated_at) * self.min_per_sec)
+        self._updated_at = now
+
+    def deposit(self):
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def stats(self):
+        with self._lock:
+            self._refill()
+            return round(self._tokens, 2)
+
+def error_status(error):
+    """예외에서 HTTP 상태 코드 추출 (OpenAI/Anthropic SDK 예외, RetryableStatus)"""
+    if isinstance(error, RetryableStatus):
+        return error.response.status_code
+    return getattr(error, 'status_code', None)
+
+def is_retryable(error):
+    """재시도할 만한 일시적 오류인지"""
+    status = error_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    # 상태 코드가 없는 연결/타임아웃 오류 (requests, httpx, SDK 연결 오류)
+    name = type(error).__name__
+    return any(marker in name for marker in ('Timeout', 'ConnectionError', 'ConnectError', 'APIConnectionError', 'TransportError', 'ReadError', 'RemoteProtocolError'))
+
+def counts_as_failure(error):
+    """서킷 브레이커 실패로 셀 오류인지 (429/4xx는 업스트림이 살아 있으므로 제외)"""
+    status = error_status(error)
+    if status is not None:
+        return status >= 500
+    return is_retryable(error)
+
+def retry_after_seconds(error):
+    """응답의 Retry-After 헤더 값(초). 없으면 None"""
+    response = error.response if isinstance(error, RetryableStatus) else getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    value = headers.get('retry-after') or headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except Exception:
+        return None
+
+class ResilienceLayer:
+    """공급자별 재시도 정책, 재시도 예산, 서킷 브레이커 관리"""
+
+    def __init__(self, policies=PROVIDER_RETRY_POLICIES):
+        self.policies = policies
+        self._breakers = {}
+        self._budgets = {}
+        self._lock = threading.Lock()
+        self._stats = {}  # provider -> {'calls', 'retries', 'failures', 'rejected'}
+
+    def _state(self, provider):
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker()
+                self._budgets[provider] = RetryBudget()
+                self._stats[provider] = {'calls': 0, 'retries': 0, 'failures': 0, 'rejected': 0}
+            return self._breakers[provider], self._budgets[provider], self._stats[provider]
+
+    def _count(self, stats, name):
+        # 여러 요청 스레드가 같은 공급자 통계를 갱신하므로 잠금 안에서 증가
+        with self._lock:
+            stats[name] += 1
+
+    def _next_delay(self, provider, policy, attempt, error, started_at):
+        """다음 재시도까지 대기 시간. 재시도하지 않아야 하면 None"""
+        if attempt >= policy['attempts'] or not is_retryable(error):
+            return None
+
+        # 지수 백오프 + full jitter, 서버가 Retry-After를 주면 그보다 일찍 재시도하지 않음
+        delay = random.uniform(0, min(policy['max_delay'], policy['base_delay'] * (2 ** (attempt - 1))))
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            if retry_after > policy['max_delay']:
+                return None
+            delay = max(delay, retry_after)
+
+        if time.monotonic() - started_at + delay > policy['deadline']:
+            return None
+
+        _, budget, stats = self._state(provider)
+        if not budget.withdraw():
+            print(f"[복원력] {provider} 재시도 예산 소진, 재시도 생략")
+            return None
+        self._count(stats, 'retries')
+        return delay
+
+    def _before_call(self, provider):
+        breaker, budget, stats = self._state(provider)
+        allowed, retry_after = breaker.allow()
+        if not allowed:
+            self._count(stats, 'rejected')
+            raise ProviderUnavailable(provider, retry_after)
+        self._count(stats, 'calls')
+        budget.deposit()
+        return breaker, stats
+
+    def _after_error(self, breaker, stats, error):
+        if counts_as_failure(error):
+            self._count(stats, 'failures')
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def call(self, provider, fn, *args, **kwargs):
+        """fn 호출을 재시도/서킷 브레이커로 감싸서 실행
+
+        fn이 status_code가 있는 응답(requests.Response)을 반환하면 재시도 대상 상태 코드도 재시도하고,
+        재시도를 모두 써도 실패하면 마지막 응답을 그대로 반환합니다.
+        """
+        policy = self.policies.get(provider, DEFAULT_RETRY_POLICY)
+        started_at = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker, stats = self._before_call(provider)
+            try:
+                result = fn(*args, **kwargs)
+                if getattr(result, 'status_code', None) in RETRYABLE_STATUS_CODES:
+                    raise RetryableStatus(result)
+                breaker.record_success()
+                return result
+            except BackpressureError:
+                # 로컬 호출량 제한은 업스트림에 닿지 않았으므로 서킷 상태는 두고 재시도하지 않음
+                breaker.release_trial()
+                raise
+            except Exception as e:
+                self._after_error(breaker, stats, e)
+                delay = self._next_delay(provider, policy, attempt, e, started_at)
+                if delay is None:
+                    if isinstance(e, RetryableStatus):
+                        return e.response
+                    raise
+                print(f"[복원력] {provider} 오류 ({e}), {delay:.2f}초 후 재시도 ({attempt + 1}/{policy['attempts']})")
+                time.sleep(delay)
+
+    async def call_async(self, provider, fn, *args, **kwargs):
+        """call의 비동기 버전 (fn은 코루틴 함수)"""
+        policy = self.policies.get(provider, DEFAULT_RETRY_POLICY)
+        started_at = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker, stats = self._before_call(provider)
+            try:
+                result = await fn(*args, **kwargs)
+                breaker.record_success()
+                return result
+            except BackpressureError:
+                # 로컬 호출량 제한은 업스트림에 닿지 않았으므로 서킷 상태는 두고 재시도하지 않음
+                breaker.release_trial()
+                raise
+            except Exception as e:
+                self._after_error(breaker, stats, e)
+                delay = self._next_delay(provider, policy, attempt, e, started_at)
+                if delay is None:
+                    raise
+                print(f"[복원력] {provider} 오류 ({e}), {delay:.2f}초 후 재시도 ({attempt + 1}/{policy['attempts']})")
+                await asyncio.sleep(delay)
+
+    def circuit_state(self, provider):
+        breaker, _, _ = self._state(provider)
+        return breaker.stats()['state']
+
+    def stats(self):
+        with self._lock:
+            providers = list(self._breakers)
+        result = {}
+        for provider in providers:
+            breaker, budget, stats = self._state(provider)
+            with self._lock:
+                counts = dict(stats)
+            result[provider] = {**breaker.stats(), **counts, 'retryBudget': budget.stats()}
+        return result
+
+# 프로세스 전체에서 공유하는 복원력 계층
+resilience = ResilienceLayer()
+
+def resilient_call(provider, fn, *args, **kwargs):
+    return resilience.call(provider, fn, *args, **kwargs)
+
+async def resilient_call_async(provider, fn, *args, **kwargs):
+    return await resilience.call_async(provider, fn, *args, **kwargs)
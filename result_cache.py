@@ -0,0 +1,159 @@
+"""
+업스트림 결과 캐시 모듈
+키워드(띄어쓰기 제거된 api_keyword) 단위로 네이버 API 결과를
+메모리에 보관합니다. 소스별 TTL과 항목 수/용량 기준 LRU 제거를 지원하며,
+일부 소스는 영구 캐시 백엔드(cache_backend)에도 함께 저장합니다.
+"""
+
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+from cache_backend import create_cache_backend
+
+# 환경 변수 로드
+load_dotenv()
+
+# 소스별 TTL (초) - 월간 데이터는 몇 시간, 블로그/카페 목록은 몇 분
+SOURCE_TTLS = {
+    'searchTrend': int(os.getenv('CACHE_TTL_SEARCH_TREND', 6 * 60 * 60)),
+    'keywordList': int(os.getenv('CACHE_TTL_KEYWORD_LIST', 6 * 60 * 60)),
+    'blog': int(os.getenv('CACHE_TTL_BLOG', 10 * 60)),
+    'cafe': int(os.getenv('CACHE_TTL_CAFE', 10 * 60))
+}
+DEFAULT_TTL = 10 * 60
+
+# 재시작 후에도 유지할 소스 (영구 캐시 백엔드에 함께 저장)
+PERSISTENT_SOURCES = {'searchTrend', 'keywordList'}
+
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 5000))
+CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+def estimate_size(value):
+    """캐시 값의 대략적인 크기 (JSON 직렬화 기준 바이트 수)"""
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+    except Exception:
+        return len(str(value).encode('utf-8'))
+
+class TTLCache:
+    """TTL 만료와 LRU 제거를 지원하는 스레드 안전 메모리 캐시"""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES, backend=None, persistent_sources=()):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self.persistent_sources = set(persistent_sources)
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {}  # source -> {'hits': n, 'misses': n, 'diskHits': n}
+
+    def _count(self, source, field):
+        stats = self._stats.setdefault(source, {'hits': 0, 'misses': 0, 'diskHits': 0})
+        stats[field] += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def get(self, source, key):
+        """캐시된 값 반환 (없거나 만료되었으면 None)"""
+        cache_key = (source, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                expires_at, _, value = entry
+                if expires_at > time.time():
+                    # 최근 사용 항목으로 이동
+                    self._entries.move_to_end(cache_key)
+                    self._count(source, 'hits')
+                    return value
+                self._remove(cache_key)
+
+        # 메모리에 없으면 영구 캐시 확인 후 메모리로 올림
+        if self._is_persistent(source):
+            try:
+                stored = self.backend.get(source, key)
+            except Exception as e:
+                print(f"[결과 캐시] 영구 캐시 조회 오류: {e}")
+                stored = None
+            if stored is not None:
+                value, expires_at = stored
+                self._store(cache_key, value, expires_at)
+                with self._lock:
+                    self._count(source, 'diskHits')
+                return value
+
+        with self._lock:
+            self._count(source, 'misses')
+        return None
+
+    def expires_at(self, source, key):
+        """캐시 항목의 만료 시각 (없으면 None, 적중/실패 횟수에는 반영하지 않음)"""
+        with self._lock:
+            entry = self._entries.get((source, key))
+            if entry is not None and entry[0] > time.time():
+                return entry[0]
+
+        if self._is_persistent(source):
+            try:
+                stored = self.backend.get(source, key)
+            except Exception:
+                stored = None
+            if stored is not None:
+                return stored[1]
+        return None
+
+    def _is_persistent(self, source):
+        return self.backend is not None and source in self.persistent_sources
+
+    def set(self, source, key, value, ttl=None):
+        """값 저장 (None은 저장하지 않음)"""
+        if value is None:
+            return
+        if ttl is None:
+            ttl = SOURCE_TTLS.get(source, DEFAULT_TTL)
+
+        self._store((source, key), value, time.time() + ttl)
+
+        if self._is_persistent(source):
+            try:
+                self.backend.set(source, key, value, ttl)
+            except Exception as e:
+                print(f"[결과 캐시] 영구 캐시 저장 오류: {e}")
+
+    def _store(self, cache_key, value, expires_at):
+        """메모리에 저장하고 한도를 넘으면 LRU 제거"""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if cache_key in self._entries:
+                self._remove(cache_key)
+            self._entries[cache_key] = (expires_at, size, value)
+            self._total_bytes += size
+
+            # 항목 수 또는 용량 초과 시 가장 오래 사용하지 않은 항목부터 제거
+            while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+
+    def stats(self):
+        """소스별 적중/실패 횟수와 현재 사용량 반환"""
+        with self._lock:
+            stats = {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'maxEntries': self.max_entries,
+                'maxBytes': self.max_bytes,
+                'sources': {source: dict(counts) for source, counts in self._stats.items()}
+            }
+        stats['persistent'] = self.backend.stats() if self.backend is not None else None
+        return stats
+
+# 프로세스 전체에서 공유하는 키워드 결과 캐시 (메모리 + 영구 캐시)
+keyword_cache = TTLCache(backend=create_cache_backend(), persistent_sources=PERSISTENT_SOURCES)
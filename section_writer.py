@@ -0,0 +1,162 @@
+"""
+섹션 병렬 글 생성 모듈
+콘텐츠 기획(아웃라인 목록 또는 Perplexity 기획의 H2 구조)을 섹션으로 나누고,
+서론/섹션들/마무리를 동시에 생성해서 문서 순서대로 이어 붙입니다.
+전체 생성 시간이 글 길이가 아니라 가장 긴 섹션 하나의 생성 시간에 가까워집니다.
+스트리밍은 앞 부분이 끝날 때까지 뒷 부분을 버퍼에 모아 두었다가 순서대로 내보냅니다.
+"""
+
+import os
+import re
+import queue
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from llm_clients import get_claude_client, get_async_claude_client
+from continuation import create_with_continuation, stream_with_continuation, stream_with_continuation_async, ContinuationState
+
+# 환경 변수 로드
+load_dotenv()
+
+SECTION_PARALLEL_ENABLED = os.getenv('SECTION_PARALLEL_ENABLED', 'false').lower() == 'true'  # 요청에 지정이 없을 때 기본 모드
+SECTION_MIN_COUNT = int(os.getenv('SECTION_MIN_COUNT', 2))  # 이보다 섹션이 적으면 한 번에 생성
+SECTION_MAX_COUNT = int(os.getenv('SECTION_MAX_COUNT', 8))
+SECTION_CONCURRENT_ARTICLES = int(os.getenv('SECTION_CONCURRENT_ARTICLES', 4))  # 서로 기다리지 않고 동시에 생성할 글 수
+# 글 하나가 서론 + 섹션 + 마무리만큼 스레드를 쓰므로 동시 글 수에 맞춰 풀 크기를 정함
+SECTION_MAX_WORKERS = int(os.getenv('SECTION_MAX_WORKERS', (SECTION_MAX_COUNT + 2) * SECTION_CONCURRENT_ARTICLES))
+
+PART_SEPARATOR = "\n\n"
+
+section_executor = ThreadPoolExecutor(max_workers=SECTION_MAX_WORKERS, thread_name_prefix='section')
+
+H2_PATTERN = re.compile(r'^##\s+(.+?)\s*#*\s*$', re.MULTILINE)
+NUMBERED_PATTERN = re.compile(r'^(?:\*\*)?\d+[.)]\s+(.+?)(?:\*\*)?\s*$', re.MULTILINE)
+
+def split_plan_text(content):
+    """기획 텍스트를 H2(없으면 번호 목록) 제목 기준으로 섹션 분리"""
+    matches = list(H2_PATTERN.finditer(content))
+    if len(matches) < SECTION_MIN_COUNT:
+        matches = list(NUMBERED_PATTERN.finditer(content))
+
+    sections = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        title = match.group(1).strip().strip('*').strip()
+        if title:
+            sections.append({'title': title, 'notes': content[match.end():end].strip()})
+    return sections
+
+def split_content_plan(content_plan):
+    """콘텐츠 기획을 섹션 목록으로 분리 ({'title', 'subsections'?, 'notes'?}). 나눌 수 없으면 빈 목록"""
+    if isinstance(content_plan, list):
+        sections = [
+            {'title': section.get('title', ''), 'subsections': section.get('subsections') or []}
+            for section in content_plan if isinstance(section, dict) and section.get('title')
+        ]
+    elif isinstance(content_plan, dict) and content_plan.get('content'):
+        sections = split_plan_text(content_plan['content'])
+    else:
+        sections = []
+
+    if len(sections) < SECTION_MIN_COUNT:
+        return []
+    return sections[:SECTION_MAX_COUNT]
+
+def write_part(request):
+    """한 부분 생성. (텍스트, ContinuationState) 반환"""
+    text, state = create_with_continuation(get_claude_client(), request, '섹션 생성')
+    return text.strip(), state
+
+def write_parts(requests):
+    """모든 부분을 동시에 생성해서 (문서 순서대로 이어 붙인 글, 부분별 ContinuationState 목록) 반환 (한 부분이라도 실패하면 예외)"""
+    futures = [section_executor.submit(write_part, request) for request in requests]
+    try:
+        parts = [future.result() for future in futures]
+    except Exception:
+        # 아직 시작하지 않은 부분은 생성하지 않음
+        for future in futures:
+            future.cancel()
+        raise
+    return PART_SEPARATOR.join(text for text, _ in parts), [state for _, state in parts]
+
+def part_states(requests, label='섹션 스트리밍'):
+    """부분별 이어쓰기 상태 (스트리밍이 끝난 뒤 잘린 부분이 있는지 확인용)"""
+    return [ContinuationState(label, request) for request in requests]
+
+def stream_part(request, chunks, state, cancelled):
+    """한 부분을 스트리밍으로 생성해서 chunks 큐에 넣음 (끝나면 None, 실패하면 예외 객체, cancelled가 설정되면 중단)"""
+    if cancelled.is_set():
+        return
+    stream = stream_with_continuation(get_claude_client(), request, state)
+    try:
+        for text in stream:
+            if cancelled.is_set():
+                break
+            chunks.put(text)
+        chunks.put(None)
+    except Exception as e:
+        chunks.put(e)
+    finally:
+        stream.close()
+
+def stream_parts(requests, states=None):
+    """모든 부분을 동시에 스트리밍 생성하고 텍스트 조각을 문서 순서대로 반환 (states에 부분별 진행 상황 기록)"""
+    states = states or part_states(requests)
+    cancelled = threading.Event()
+    part_chunks = [queue.Queue() for _ in requests]
+    futures = [
+        section_executor.submit(stream_part, request, chunks, state, cancelled)
+        for request, chunks, state in zip(requests, part_chunks, states)
+    ]
+    finished = False
+    try:
+        for i, chunks in enumerate(part_chunks):
+            if i > 0:
+                yield PART_SEPARATOR
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finished = True
+    finally:
+        # 한 부분이 실패하거나 소비자가 중간에 멈추면 나머지 부분 생성도 중단
+        cancelled.set()
+        for future in futures:
+            future.cancel()
+        if not finished:
+            print("[섹션 병렬 생성] 글 스트림 중단, 남은 섹션 생성 취소")
+
+async def stream_part_async(request, chunks, state):
+    try:
+        async for text in stream_with_continuation_async(get_async_claude_client(), request, state):
+            await chunks.put(text)
+        await chunks.put(None)
+    except Exception as e:
+        await chunks.put(e)
+
+async def stream_parts_async(requests, states=None):
+    """stream_parts의 비동기 버전"""
+    states = states or part_states(requests)
+    part_chunks = [asyncio.Queue() for _ in requests]
+    tasks = [
+        asyncio.ensure_future(stream_part_async(request, chunks, state))
+        for request, chunks, state in zip(requests, part_chunks, states)
+    ]
+    try:
+        for i, chunks in enumerate(part_chunks):
+            if i > 0:
+                yield PART_SEPARATOR
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+    finally:
+        for task in tasks:
+            task.cancel()
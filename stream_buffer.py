@@ -0,0 +1,318 @@
+"""
+재개 가능한 글 스트림 모듈
+글 생성 스트림마다 ID를 붙이고, 업스트림(Claude)에서 받은 이벤트를 순번과 함께
+서버 버퍼에 기록합니다. 생성은 클라이언트 연결과 무관하게 끝까지 진행되며,
+연결이 끊긴 클라이언트는 Last-Event-ID로 받은 지점 이후부터 이어서 받을 수 있습니다.
+끝난 스트림은 잠시(TTL) 동안 다시 재생할 수 있도록 보관합니다.
+몇 글자짜리 텍스트 조각은 시간/크기 기준으로 모아서 한 이벤트로 기록하고,
+오래 조용한 연결에는 프록시가 끊지 않도록 하트비트 주석을 보냅니다.
+"""
+
+import os
+import json
+import time
+import uuid
+import zlib
+import asyncio
+import threading
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+STREAM_BUFFER_MAX_BYTES = int(os.getenv('STREAM_BUFFER_MAX_BYTES', 1024 * 1024))  # 스트림당 보관할 최대 이벤트 크기
+STREAM_REPLAY_TTL = int(os.getenv('STREAM_REPLAY_TTL', 10 * 60))  # 끝난 스트림 보관 시간 (초)
+STREAM_MAX_ACTIVE = int(os.getenv('STREAM_MAX_ACTIVE', 500))  # 동시에 보관하는 최대 스트림 수
+STREAM_MAX_RUNNING = int(os.getenv('STREAM_MAX_RUNNING', 32))  # 동시에 생성 중일 수 있는 최대 스트림 수
+STREAM_RETRY_AFTER = int(os.getenv('STREAM_RETRY_AFTER', 30))  # 생성 중인 스트림이 가득 찼을 때 재시도 권장 시간 (초)
+STREAM_HEARTBEAT_INTERVAL = float(os.getenv('STREAM_HEARTBEAT_INTERVAL', 15))  # 이벤트가 없을 때 하트비트 주기 (초)
+
+# 텍스트 조각 묶음 기준 - 시간(ms) 또는 글자 수 중 먼저 도달하는 쪽에서 내보냄 (0이면 묶지 않음)
+STREAM_FLUSH_INTERVAL_MS = int(os.getenv('STREAM_FLUSH_INTERVAL_MS', 50))
+STREAM_FLUSH_MAX_CHARS = int(os.getenv('STREAM_FLUSH_MAX_CHARS', 512))
+
+# 클라이언트가 지원하면 이벤트 스트림을 gzip으로 압축
+STREAM_GZIP_ENABLED = os.getenv('STREAM_GZIP_ENABLED', 'true').lower() == 'true'
+
+HEARTBEAT_EVENT = ': heartbeat\n\n'
+
+def format_sse_event(data, event_id=None):
+    """SSE 이벤트 한 건을 문자열로 직렬화"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data)}")
+    return '\n'.join(lines) + '\n\n'
+
+def accepts_gzip(accept_encoding):
+    """Accept-Encoding 헤더 기준으로 gzip 스트림을 보낼지 결정"""
+    return STREAM_GZIP_ENABLED and 'gzip' in (accept_encoding or '').lower()
+
+def gzip_stream(chunks):
+    """SSE 문자열을 gzip으로 압축 (조각마다 sync flush해서 바로 전달되게 함)"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        yield compressor.compress(chunk.encode('utf-8')) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+async def gzip_stream_async(chunks):
+    """gzip_stream의 비동기 버전"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        yield compressor.compress(chunk.encode('utf-8')) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+def is_text_delta(data):
+    """묶어서 보내도 되는 일반 텍스트 조각 이벤트인지"""
+    return data.keys() == {'content', 'done'} and not data['done']
+
+def parse_last_event_id(value):
+    """Last-Event-ID 헤더 값을 순번으로 변환 (없거나 잘못된 값이면 0)"""
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return 0
+
+class TooManyStreams(Exception):
+    """생성 중인 스트림이 너무 많아 새 스트림을 시작할 수 없음"""
+
+class StreamExpired(Exception):
+    """요청한 지점의 이벤트가 이미 버퍼에서 제거됨"""
+
+class ArticleStream:
+    """스트림 하나의 이벤트 버퍼 (순번은 1부터 시작)"""
+
+    def __init__(self, stream_id, max_bytes=STREAM_BUFFER_MAX_BYTES,
+                 flush_interval=STREAM_FLUSH_INTERVAL_MS / 1000, flush_max_chars=STREAM_FLUSH_MAX_CHARS):
+        self.id = stream_id
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.flush_max_chars = flush_max_chars
+        self._pending = []  # 아직 내보내지 않은 텍스트 조각
+        self._pending_chars = 0
+        self._pending_since = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._events = []  # [(순번, 이벤트 데이터, 크기)]
+        self._bytes = 0
+        self._next_seq = 1
+        self._cond = threading.Condition()
+        self._async_waiters = []  # [(이벤트 루프, future)]
+        self.task = None  # ASGI 모드의 생성 작업 (참조 유지용)
+
+    @property
+    def done(self):
+        return self.finished_at is not None
+
+    def append(self, data):
+        """이벤트 기록 (텍스트 조각은 묶음 기준에 도달할 때까지 모아 둠)"""
+        with self._cond:
+            if self.flush_interval > 0 and is_text_delta(data):
+                if not self._pending:
+                    # 구독자가 묶음 시간에 맞춰 다시 깨어나도록 알림
+                    self._pending_since = time.monotonic()
+                    self._notify()
+                self._pending.append(data['content'])
+                self._pending_chars += len(data['content'])
+                if self._pending_chars >= self.flush_max_chars or self._pending_stale():
+                    self._flush_pending()
+                return
+
+            self._flush_pending()
+            self._record(data)
+
+    def _pending_stale(self):
+        return bool(self._pending) and time.monotonic() - self._pending_since >= self.flush_interval
+
+    def _flush_pending(self):
+        if self._pending:
+            content = ''.join(self._pending)
+            self._pending = []
+            self._pending_chars = 0
+            self._record({'content': content, 'done': False})
+
+    def _record(self, data):
+        """순번을 붙여 버퍼에 기록한 뒤 대기 중인 구독자 깨우기"""
+        size = len(json.dumps(data))
+        self._events.append((self._next_seq, data, size))
+        self._next_seq += 1
+        self._bytes += size
+        # 한도를 넘으면 오래된 이벤트부터 버림 (그 이전 지점으로는 재개 불가)
+        while self._bytes > self.max_bytes and len(self._events) > 1:
+            self._bytes -= self._events.pop(0)[2]
+        self._notify()
+
+    def flush_stale(self):
+        """묶음 시간이 지난 텍스트 조각을 내보냄 (새 조각이 한동안 오지 않을 때 구독자가 호출)"""
+        with self._cond:
+            if self._pending_stale():
+                self._flush_pending()
+
+    def finish(self):
+        with self._cond:
+            self._flush_pending()
+            if self.finished_at is None:
+                self.finished_at = time.time()
+            self._notify()
+
+    def _poll_interval(self):
+        """모아 둔 조각이 있으면 묶음 시간만큼만 대기"""
+        with self._cond:
+            if self._pending:
+                return max(self.flush_interval - (time.monotonic() - self._pending_since), 0.001)
+        return STREAM_HEARTBEAT_INTERVAL
+
+    def _notify(self):
+        self._cond.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+
+    def events_after(self, last_seq):
+        """last_seq 이후 이벤트 목록과 스트림 종료 여부"""
+        with self._cond:
+            if self._events and last_seq + 1 < self._events[0][0]:
+                raise StreamExpired(f"스트림 {self.id}의 {last_seq}번 이후 이벤트가 버퍼에서 제거됨")
+            return [(seq, data) for seq, data, _ in self._events if seq > last_seq], self.done
+
+    def wait(self, last_seq, timeout):
+        """last_seq 이후 이벤트가 생기거나, 스트림이 끝나거나, 상태가 바뀔 때까지 대기"""
+        with self._cond:
+            if not (self.done or self._next_seq - 1 > last_seq):
+                self._cond.wait(timeout)
+
+    async def wait_async(self, last_seq, timeout):
+        """wait의 비동기 버전 (이벤트 루프 스레드를 막지 않음)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._cond:
+            if self.done or self._next_seq - 1 > last_seq:
+                return
+            self._async_waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def subscribe(self, last_seq=0):
+        """last_seq 이후 이벤트를 SSE 문자열로 차례대로 반환 (스트림이 끝나면 종료)"""
+        last_write = time.monotonic()
+        while True:
+            self.flush_stale()
+            events, done = self.events_after(last_seq)
+            if events:
+                # 밀린 이벤트는 한 번에 써서 쓰기 횟수를 줄임
+                last_seq = events[-1][0]
+                last_write = time.monotonic()
+                yield ''.join(format_sse_event(data, seq) for seq, data in events)
+            elif done:
+                return
+            elif time.monotonic() - last_write >= STREAM_HEARTBEAT_INTERVAL:
+                last_write = time.monotonic()
+                yield HEARTBEAT_EVENT
+            else:
+                self.wait(last_seq, self._poll_interval())
+
+    async def subscribe_async(self, last_seq=0):
+        """subscribe의 비동기 버전"""
+        last_write = time.monotonic()
+        while True:
+            self.flush_stale()
+            events, done = self.events_after(last_seq)
+            if events:
+                last_seq = events[-1][0]
+                last_write = time.monotonic()
+                yield ''.join(format_sse_event(data, seq) for seq, data in events)
+            elif done:
+                return
+            elif time.monotonic() - last_write >= STREAM_HEARTBEAT_INTERVAL:
+                last_write = time.monotonic()
+                yield HEARTBEAT_EVENT
+            else:
+                await self.wait_async(last_seq, self._poll_interval())
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+class StreamRegistry:
+    """진행 중이거나 최근 끝난 글 스트림 보관소"""
+
+    def __init__(self, ttl=STREAM_REPLAY_TTL, max_streams=STREAM_MAX_ACTIVE, max_running=STREAM_MAX_RUNNING):
+        self.ttl = ttl
+        self.max_streams = max_streams
+        self.max_running = max_running
+        self._streams = {}
+        self._lock = threading.Lock()
+
+    def _purge(self):
+        """TTL이 지난 끝난 스트림 제거, 그래도 많으면 끝난 스트림 중 오래된 것부터 제거"""
+        now = time.time()
+        for stream_id, stream in list(self._streams.items()):
+            if stream.done and now - stream.finished_at > self.ttl:
+                del self._streams[stream_id]
+
+        if len(self._streams) >= self.max_streams:
+            finished = sorted((s for s in self._streams.values() if s.done), key=lambda s: s.finished_at)
+            for stream in finished[:len(self._streams) - self.max_streams + 1]:
+                del self._streams[stream.id]
+
+    def create(self):
+        """새 스트림 등록 (생성 중인 스트림이 max_running개 이상이면 TooManyStreams)"""
+        with self._lock:
+            self._purge()
+            running = sum(1 for stream in self._streams.values() if not stream.done)
+            if running >= self.max_running:
+                raise TooManyStreams(f"생성 중인 글 스트림이 너무 많습니다 ({self.max_running}개)")
+            stream = ArticleStream(uuid.uuid4().hex)
+            self._streams[stream.id] = stream
+            return stream
+
+    def get(self, stream_id):
+        with self._lock:
+            self._purge()
+            return self._streams.get(stream_id)
+
+    def start(self, events):
+        """동기 이벤트 제너레이터를 백그라운드 스레드에서 끝까지 실행하며 버퍼에 기록"""
+        stream = self.create()
+
+        def produce():
+            try:
+                for data in events:
+                    stream.append(data)
+            except Exception as e:
+                print(f"[스트림 버퍼] {stream.id} 생성 오류: {e}")
+                stream.append({'content': f'오류: {str(e)}', 'error': True, 'done': True})
+            finally:
+                stream.finish()
+
+        threading.Thread(target=produce, name=f'article-stream-{stream.id[:8]}', daemon=True).start()
+        return stream
+
+    def start_async(self, events):
+        """비동기 이벤트 제너레이터를 이벤트 루프 작업으로 끝까지 실행하며 버퍼에 기록"""
+        stream = self.create()
+
+        async def produce():
+            try:
+                async for data in events:
+                    stream.append(data)
+            except Exception as e:
+                print(f"[스트림 버퍼] {stream.id} 생성 오류: {e}")
+                stream.append({'content': f'오류: {str(e)}', 'error': True, 'done': True})
+            finally:
+                stream.finish()
+
+        stream.task = asyncio.ensure_future(produce())
+        return stream
+
+    def stats(self):
+        with self._lock:
+            return {
+                'streams': len(self._streams),
+                'active': sum(1 for stream in self._streams.values() if not stream.done)
+            }
+
+# 프로세스 전체에서 공유하는 글 스트림 보관소
+article_streams = StreamRegistry()
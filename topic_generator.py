@@ -4,17 +4,32 @@
 OpenAI API를 사용하여 동적으로 생성합니다.
 """
 
-from openai import OpenAI
 import os
 from dotenv import load_dotenv
 import json
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import http_client
+from llm_cache import llm_cache_key, get_cached_response, store_response
+from resilience import resilient_call
+from hedged_llm import hedged_chat_completion  # 짧은 OpenAI 호출 헤징/대체 공급자
 
 # 환경 변수 로드
 load_dotenv()
 
 # Perplexity API 설정
 PERPLEXITY_API_KEY = os.getenv('Perplexity_API_KEY')
+PERPLEXITY_READ_TIMEOUT = float(os.getenv('PERPLEXITY_READ_TIMEOUT', 30))
+
+# 글감 요소별 모델
+TITLE_MODEL = "gpt-4.1-nano"
+THUMBNAIL_MODEL = "gpt-4.1-nano"
+CONTENT_PLAN_MODEL = "llama-3.1-sonar-small-128k-online"
+
+# 글감 요소(제목/콘텐츠 기획/썸네일) 병렬 생성 설정
+TOPIC_MAX_WORKERS = int(os.getenv('TOPIC_MAX_WORKERS', 12))
+TOPIC_DEADLINE = float(os.getenv('TOPIC_DEADLINE', 20))  # 전체 응답 마감 시간 (초)
+topic_executor = ThreadPoolExecutor(max_workers=TOPIC_MAX_WORKERS, thread_name_prefix='topic')
 
 def get_tone_prompt(tone):
     """톤별 시스템 프롬프트 반환"""
@@ -40,23 +55,18 @@ def get_tone_description(tone):
     }
     return tone_descriptions.get(tone, tone_descriptions['informative'])
 
-def generate_titles(keyword, tone='informative'):
-    """키워드와 톤 기반으로 제목 5개 생성"""
-    try:
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        tone_prompt = get_tone_prompt(tone)
-        tone_desc = get_tone_description(tone)
-        
-        response = client.chat.completions.create(
-            model="gpt-4.1-nano",  # GPT-4.1 Nano 모델로 변경
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"{tone_prompt} SEO 최적화된 블로그 제목을 만들어주세요. 선택된 톤: {tone_desc}"
-                },
-                {
-                    "role": "user",
-                    "content": f"""키워드: "{keyword}"
+def build_title_messages(keyword, tone='informative'):
+    """제목 생성 프롬프트 메시지"""
+    tone_prompt = get_tone_prompt(tone)
+    tone_desc = get_tone_description(tone)
+    return [
+        {
+            "role": "system",
+            "content": f"{tone_prompt} SEO 최적화된 블로그 제목을 만들어주세요. 선택된 톤: {tone_desc}"
+        },
+        {
+            "role": "user",
+            "content": f"""키워드: "{keyword}"
 톤/문체: {tone_desc}
 
 다음 조건에 맞는 블로그 제목 5개를 생성해주세요:
@@ -70,63 +80,61 @@ def generate_titles(keyword, tone='informative'):
 
 JSON 형식으로 응답해주세요:
 {{"titles": ["제목1", "제목2", "제목3", "제목4", "제목5"]}}"""
-                }
-            ],
-            temperature=0.7,
-            max_tokens=500
-        )
+        }
+    ]
+
+def generate_titles(keyword, tone='informative', refresh=False):
+    """키워드와 톤 기반으로 제목 5개 생성 (refresh=True면 캐시를 건너뛰고 새로 생성)"""
+    try:
+        messages = build_title_messages(keyword, tone)
+        cache_key = llm_cache_key('openai', TITLE_MODEL, messages, 0.7, 500)
+        content = None if refresh else get_cached_response('generate_titles', cache_key)
+        from_cache = content is not None
+
+        if not from_cache:
+            content = hedged_chat_completion('generate_titles', TITLE_MODEL, messages, 0.7, 500)
         
-        result = json.loads(response.choices[0].message.content)
+        result = json.loads(content)
         titles = result.get('titles', [])
-        
-        print(f"[글감 생성] OpenAI로 제목 {len(titles)}개 생성 완료")
+
+        if from_cache:
+            print(f"[글감 생성] 캐시된 제목 {len(titles)}개 사용")
+        else:
+            if titles:
+                store_response('generate_titles', cache_key, content)
+            print(f"[글감 생성] OpenAI로 제목 {len(titles)}개 생성 완료")
         return titles
         
     except Exception as e:
         print(f"[generate_titles] OpenAI API 오류: {e}")
-        # fallback 제목들
-        return [
-            f"{keyword} 완벽 가이드 - 2025년 최신 정보 총정리",
-            f"초보자를 위한 {keyword} 추천 TOP 5 (실제 사용 후기)",
-            f"{keyword}, 이것만 알면 충분! 전문가가 알려주는 핵심 포인트",
-            f"2025년 {keyword} 트렌드와 선택 기준 완벽 분석",
-            f"하루 만에 마스터하는 {keyword} 활용법 (단계별 가이드)"
-        ]
-
-def generate_content_plan(keyword, tone='informative'):
-    """Perplexity API를 사용해서 키워드 관련 최신 정보를 수집하고 콘텐츠 기획"""
-    try:
-        print(f"[콘텐츠 기획] Perplexity API로 '{keyword}' 정보 수집 시작")
-        
-        if not PERPLEXITY_API_KEY:
-            print("[콘텐츠 기획] Perplexity API 키가 없어서 기본 아웃라인으로 대체")
-            return generate_fallback_outline(keyword)
-        
-        # Perplexity API 호출
-        headers = {
-            "Authorization": f"Bearer {PERPLEXITY_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        # 검색 쿼리 생성 - 최신 정보에 중점
-        search_query = f"{keyword} 최신 정보 현황 동향 방법 가이드 2025"
-        
-        payload = {
-            "model": "llama-3.1-sonar-small-128k-online",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": """당신은 전문적인 콘텐츠 기획자입니다. 키워드에 대한 정보를 수집하고 체계적으로 정리해주세요.
+        return get_fallback_titles(keyword)
+
+def get_fallback_titles(keyword):
+    """제목 생성 실패 시 사용할 기본 제목들"""
+    return [
+        f"{keyword} 완벽 가이드 - 2025년 최신 정보 총정리",
+        f"초보자를 위한 {keyword} 추천 TOP 5 (실제 사용 후기)",
+        f"{keyword}, 이것만 알면 충분! 전문가가 알려주는 핵심 포인트",
+        f"2025년 {keyword} 트렌드와 선택 기준 완벽 분석",
+        f"하루 만에 마스터하는 {keyword} 활용법 (단계별 가이드)"
+    ]
+
+def build_content_plan_messages(keyword):
+    """콘텐츠 기획 프롬프트 메시지 (톤과 무관)"""
+    return [
+        {
+            "role": "system",
+            "content": """당신은 전문적인 콘텐츠 기획자입니다. 키워드에 대한 정보를 수집하고 체계적으로 정리해주세요.
 
 원칙:
 - 해당 주제에 가장 적합한 구조로 정리
 - 실용적이고 구체적인 내용 위주  
 - 마크다운 형식으로 깔끔하게 정리
 - 중복 없이 간결하면서도 충분한 정보 제공"""
-                },
-                {
-                    "role": "user", 
-                    "content": f"""'{keyword}'에 대한 정보를 조사해서 콘텐츠 기획 자료로 정리해주세요.
+        },
+        {
+            "role": "user", 
+            "content": f"""'{keyword}'에 대한 정보를 조사해서 콘텐츠 기획 자료로 정리해주세요.
 
 이 주제에 가장 적합한 구조로 정리하되, 다음 중에서 필요한 요소들을 포함해주세요:
 - 기본 개념과 정의 (필요한 경우)
@@ -138,17 +146,55 @@ def generate_content_plan(keyword, tone='informative'):
 - 최신 동향이나 변화 (시의성이 중요한 경우)
 
 해당 주제의 특성에 맞는 구조로 자유롭게 구성하고, 실제 블로그 글 작성에 도움이 되는 구체적이고 정확한 정보를 제공해주세요."""
-                }
-            ],
+        }
+    ]
+
+def content_plan_cache_key(keyword):
+    """콘텐츠 기획 응답의 캐시 키"""
+    return llm_cache_key('perplexity', CONTENT_PLAN_MODEL, build_content_plan_messages(keyword), 0.3, 1500)
+
+def generate_content_plan(keyword, tone='informative', refresh=False):
+    """Perplexity API를 사용해서 키워드 관련 최신 정보를 수집하고 콘텐츠 기획 (refresh=True면 캐시를 건너뜀)"""
+    try:
+        print(f"[콘텐츠 기획] Perplexity API로 '{keyword}' 정보 수집 시작")
+        
+        if not PERPLEXITY_API_KEY:
+            print("[콘텐츠 기획] Perplexity API 키가 없어서 기본 아웃라인으로 대체")
+            return generate_fallback_outline(keyword)
+
+        # 같은 프롬프트의 기획 자료는 캐시 재사용 (톤은 프롬프트에 영향 없음)
+        messages = build_content_plan_messages(keyword)
+        cache_key = content_plan_cache_key(keyword)
+        content_plan = None if refresh else get_cached_response('generate_content_plan', cache_key)
+        if content_plan is not None:
+            print(f"[콘텐츠 기획] 캐시 사용: '{keyword}'")
+            return {
+                "type": "content_plan",
+                "content": content_plan,
+                "keyword": keyword,
+                "tone": tone,
+                "source": "perplexity"
+            }
+        
+        # Perplexity API 호출
+        headers = {
+            "Authorization": f"Bearer {PERPLEXITY_API_KEY}",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "model": CONTENT_PLAN_MODEL,
+            "messages": messages,
             "max_tokens": 1500,
             "temperature": 0.3
         }
         
-        response = requests.post(
+        response = resilient_call(
+            'perplexity', http_client.post,
             "https://api.perplexity.ai/chat/completions",
             headers=headers,
             json=payload,
-            timeout=30
+            timeout=(http_client.HTTP_CONNECT_TIMEOUT, PERPLEXITY_READ_TIMEOUT)
         )
         
         if response.status_code == 200:
@@ -156,6 +202,7 @@ def generate_content_plan(keyword, tone='informative'):
             content_plan = result['choices'][0]['message']['content']
             
             print(f"[콘텐츠 기획] Perplexity API 성공 - {len(content_plan)}자 수집")
+            store_response('generate_content_plan', cache_key, content_plan)
             
             return {
                 "type": "content_plan",
@@ -218,22 +265,17 @@ def generate_fallback_outline(keyword):
         }
     ]
 
-def generate_thumbnail_prompts(keyword, tone='informative'):
-    """키워드와 톤 기반으로 썸네일 프롬프트 3개 생성"""
-    try:
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        tone_desc = get_tone_description(tone)
-        
-        response = client.chat.completions.create(
-            model="gpt-4.1-nano",  # GPT-4.1 Nano 모델로 변경
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"당신은 블로그 썸네일용 이미지 프롬프트를 만드는 전문가입니다. 선택된 톤({tone_desc})에 맞는 시각적 스타일을 고려해주세요."
-                },
-                {
-                    "role": "user",
-                    "content": f"""키워드: "{keyword}"
+def build_thumbnail_messages(keyword, tone='informative'):
+    """썸네일 프롬프트 생성 메시지"""
+    tone_desc = get_tone_description(tone)
+    return [
+        {
+            "role": "system",
+            "content": f"당신은 블로그 썸네일용 이미지 프롬프트를 만드는 전문가입니다. 선택된 톤({tone_desc})에 맞는 시각적 스타일을 고려해주세요."
+        },
+        {
+            "role": "user",
+            "content": f"""키워드: "{keyword}"
 톤/문체: {tone_desc}
 
 이 키워드의 블로그 썸네일로 사용할 이미지 프롬프트 3개를 만들어주세요:
@@ -250,18 +292,27 @@ def generate_thumbnail_prompts(keyword, tone='informative'):
 
 JSON 형식으로 응답해주세요:
 {{"thumbnails": ["프롬프트1", "프롬프트2", "프롬프트3"]}}"""
-                }
-            ],
-            temperature=0.8,
-            max_tokens=400
-        )
+        }
+    ]
+
+def generate_thumbnail_prompts(keyword, tone='informative', refresh=False):
+    """키워드와 톤 기반으로 썸네일 프롬프트 3개 생성 (refresh=True면 캐시를 건너뛰고 새로 생성)"""
+    try:
+        messages = build_thumbnail_messages(keyword, tone)
+        cache_key = llm_cache_key('openai', THUMBNAIL_MODEL, messages, 0.8, 400)
+        content = None if refresh else get_cached_response('generate_thumbnail_prompts', cache_key)
+        from_cache = content is not None
+
+        if not from_cache:
+            content = hedged_chat_completion('generate_thumbnail_prompts', THUMBNAIL_MODEL, messages, 0.8, 400)
         
         try:
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
             thumbnails = result.get('thumbnails', [])
+            if thumbnails and not from_cache:
+                store_response('generate_thumbnail_prompts', cache_key, content)
         except json.JSONDecodeError:
             # JSON 파싱 실패 시 응답을 그대로 사용
-            content = response.choices[0].message.content
             print(f"[generate_thumbnail_prompts] JSON 파싱 실패, 원본 응답: {content}")
             # 간단한 텍스트 파싱 시도
             thumbnails = [content] if content else []
@@ -269,33 +320,56 @@ JSON 형식으로 응답해주세요:
         # 빈 배열이거나 문제가 있으면 fallback 사용
         if not thumbnails or len(thumbnails) == 0:
             print(f"[generate_thumbnail_prompts] 결과가 비어있음, fallback 사용")
-            thumbnails = [
-                f"깔끔한 책상 위에 {keyword}가 놓여있고, 따뜻한 조명이 비치는 모습. 미니멀하고 전문적인 느낌의 상품 사진 스타일",
-                f"{keyword}를 사용하는 사람의 모습을 측면에서 촬영한 라이프스타일 사진. 자연광이 들어오는 밝은 실내 배경",
-                f"여러 개의 {keyword}를 깔끔하게 정렬해서 위에서 내려다본 플랫레이 구도. 흰색 배경에 그림자가 살짝 보이는 스튜디오 촬영 스타일"
-            ]
+            thumbnails = get_fallback_thumbnails(keyword)
         
-        print(f"[글감 생성] OpenAI로 썸네일 프롬프트 {len(thumbnails)}개 생성 완료")
+        if from_cache:
+            print(f"[글감 생성] 캐시된 썸네일 프롬프트 {len(thumbnails)}개 사용")
+        else:
+            print(f"[글감 생성] OpenAI로 썸네일 프롬프트 {len(thumbnails)}개 생성 완료")
         return thumbnails
         
     except Exception as e:
         print(f"[generate_thumbnail_prompts] OpenAI API 오류: {e}")
-        # fallback 썸네일 프롬프트
-        return [
-            f"깔끔한 책상 위에 {keyword}가 놓여있고, 따뜻한 조명이 비치는 모습. 미니멀하고 전문적인 느낌의 상품 사진 스타일",
-            f"{keyword}를 사용하는 사람의 모습을 측면에서 촬영한 라이프스타일 사진. 자연광이 들어오는 밝은 실내 배경",
-            f"여러 개의 {keyword}를 깔끔하게 정렬해서 위에서 내려다본 플랫레이 구도. 흰색 배경에 그림자가 살짝 보이는 스튜디오 촬영 스타일"
-        ]
-
-def generate_all_topics(keyword, tone='informative'):
-    """모든 글감 요소를 한 번에 생성 (톤 포함)"""
+        return get_fallback_thumbnails(keyword)
+
+def get_fallback_thumbnails(keyword):
+    """썸네일 프롬프트 생성 실패 시 사용할 기본 프롬프트들"""
+    return [
+        f"깔끔한 책상 위에 {keyword}가 놓여있고, 따뜻한 조명이 비치는 모습. 미니멀하고 전문적인 느낌의 상품 사진 스타일",
+        f"{keyword}를 사용하는 사람의 모습을 측면에서 촬영한 라이프스타일 사진. 자연광이 들어오는 밝은 실내 배경",
+        f"여러 개의 {keyword}를 깔끔하게 정렬해서 위에서 내려다본 플랫레이 구도. 흰색 배경에 그림자가 살짝 보이는 스튜디오 촬영 스타일"
+    ]
+
+def wait_for_topic_part(future, name, started_at, fallback):
+    """전체 마감 시간까지 결과를 기다리고, 초과하거나 실패하면 기본값 반환"""
+    remaining = max(TOPIC_DEADLINE - (time.monotonic() - started_at), 0)
+    try:
+        return future.result(timeout=remaining)
+    except FutureTimeoutError:
+        # 이미 실행 중인 호출은 계속 진행되어 성공하면 캐시에 남음
+        print(f"[글감 생성] {name} 마감 시간 초과 ({TOPIC_DEADLINE}초), 기본값 사용")
+        return fallback()
+    except Exception as e:
+        print(f"[글감 생성] {name} 생성 오류: {e}, 기본값 사용")
+        return fallback()
+
+def generate_all_topics(keyword, tone='informative', refresh=False):
+    """모든 글감 요소를 한 번에 생성 (톤 포함, refresh=True면 캐시 없이 새 결과 생성)"""
     try:
         print(f"[글감 생성] 키워드 '{keyword}', 톤 '{tone}' 처리 시작")
         
-        # 각 요소별 생성
-        titles = generate_titles(keyword, tone)  # OpenAI 사용
-        content_plan = generate_content_plan(keyword, tone)  # Perplexity 사용
-        thumbnails = generate_thumbnail_prompts(keyword, tone)  # OpenAI 사용
+        # 서로 독립적인 세 요소를 동시에 생성
+        started_at = time.monotonic()
+        futures = {
+            'titles': topic_executor.submit(generate_titles, keyword, tone, refresh),  # OpenAI 사용
+            'contentPlan': topic_executor.submit(generate_content_plan, keyword, tone, refresh),  # Perplexity 사용
+            'thumbnails': topic_executor.submit(generate_thumbnail_prompts, keyword, tone, refresh)  # OpenAI 사용
+        }
+
+        # 마감 시간을 넘기거나 실패한 요소만 각자의 기본값으로 대체
+        titles = wait_for_topic_part(futures['titles'], 'titles', started_at, lambda: get_fallback_titles(keyword))
+        content_plan = wait_for_topic_part(futures['contentPlan'], 'contentPlan', started_at, lambda: generate_fallback_outline(keyword))
+        thumbnails = wait_for_topic_part(futures['thumbnails'], 'thumbnails', started_at, lambda: get_fallback_thumbnails(keyword))
         
         result = {
             'keyword': keyword,